@@ -0,0 +1,130 @@
+"""
+Boucle asyncio persistante de l'interface graphique.
+
+Tkinter doit rester seul maître du thread principal : toutes les coroutines
+de l'application (connexion, commandes, superviseur, traitement vocal)
+s'exécutent dans une unique boucle, lancée une fois dans un thread dédié.
+L'interface y soumet ses coroutines et reçoit un concurrent.futures.Future ;
+les résultats sont ramenés dans le thread Tk avec root.after.
+
+Une seule boucle pour toute la session : pas de création/fermeture de boucle
+à chaque action, et les tâches de fond (superviseur, flux capteurs) restent
+rattachées à une boucle qui ne disparaît pas sous elles.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Coroutine, Optional
+
+
+class AsyncRuntime:
+    """Boucle asyncio unique exécutée dans un thread d'arrière-plan."""
+
+    def __init__(self, name: str = "voxthymio-async"):
+        """
+        Args:
+            name (str): Nom du thread de la boucle
+        """
+        self.name = name
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    @property
+    def is_running(self) -> bool:
+        """Indique si la boucle tourne."""
+        return self.loop is not None and self.loop.is_running()
+
+    def start(self):
+        """Démarre le thread de la boucle (sans effet s'il tourne déjà)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self.loop = loop
+        self._ready.set()
+
+        try:
+            loop.run_forever()
+        finally:
+            # Annuler proprement les tâches restantes (superviseur, pompes...)
+            pending = [task for task in asyncio.all_tasks(loop) if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+            self.loop = None
+
+    def submit(self, coro: Coroutine, callback: Optional[Callable[[Future], Any]] = None) -> Future:
+        """
+        Planifie une coroutine dans la boucle, depuis n'importe quel thread.
+
+        Args:
+            coro (Coroutine): Coroutine à exécuter
+            callback (Optional[Callable[[Future], Any]]): Appelé avec le
+                Future une fois la coroutine terminée (dans le thread de la
+                boucle : utiliser root.after pour toucher à l'interface)
+
+        Returns:
+            Future: Résultat de la coroutine
+        """
+        if self.loop is None:
+            coro.close()
+            raise RuntimeError("La boucle asyncio n'est pas démarrée")
+
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        future.add_done_callback(self._report_error)
+        if callback is not None:
+            future.add_done_callback(callback)
+        return future
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Exécute une coroutine et attend son résultat (bloquant).
+
+        Ne jamais appeler depuis le thread de la boucle.
+
+        Args:
+            coro (Coroutine): Coroutine à exécuter
+            timeout (Optional[float]): Délai maximal en secondes
+
+        Returns:
+            Any: Résultat de la coroutine
+        """
+        return self.submit(coro).result(timeout)
+
+    @staticmethod
+    def _report_error(future: Future):
+        """Signale les erreurs qui ne seraient sinon jamais lues."""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            print(f"❌ Erreur dans une tâche asynchrone: {error}")
+
+    def stop(self, timeout: float = 2.0):
+        """
+        Arrête la boucle et attend la fin de son thread.
+
+        Args:
+            timeout (float): Délai maximal d'attente en secondes
+        """
+        loop = self.loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(loop.stop)
+            except RuntimeError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
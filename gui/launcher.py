@@ -7,6 +7,7 @@ Ce script lance l'interface graphique VoxThymio avec la gestion appropriée des
 
 import sys
 import os
+import importlib.util
 from pathlib import Path
 
 # Ajouter les répertoires nécessaires au PATH
@@ -18,10 +19,16 @@ src_dir = project_root / "src"
 sys.path.insert(0, str(src_dir))
 sys.path.insert(0, str(current_dir))
 
-def main():
-    """Lance l'application VoxThymio GUI."""
+def main(on_ready=None):
+    """
+    Lance l'application VoxThymio GUI.
+    
+    Args:
+        on_ready: Appelé une fois la fenêtre affichée (profil de démarrage)
+    """
     try:
-        # Vérifier que les modules nécessaires sont disponibles
+        # Vérifier que les modules nécessaires sont présents (sans les
+        # importer : ils le seront une seule fois, par l'interface)
         required_modules = [
             "smart_voice_controller",
             "controller.thymio_controller",
@@ -33,7 +40,8 @@ def main():
         missing_modules = []
         for module in required_modules:
             try:
-                __import__(module)
+                if importlib.util.find_spec(module) is None:
+                    missing_modules.append(module)
             except ImportError:
                 missing_modules.append(module)
         
@@ -53,6 +61,8 @@ def main():
         print("=" * 50)
         
         app = VoxThymioGUI()
+        if on_ready is not None:
+            app.root.after_idle(on_ready)
         app.run()
         
     except ImportError as e:
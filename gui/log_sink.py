@@ -0,0 +1,168 @@
+"""
+Journal de l'interface graphique.
+
+Les messages peuvent être émis depuis n'importe quel thread (boucle asyncio,
+écoute vocale, initialisation des modèles). Ils sont mis en file puis
+affichés par lots à intervalle régulier depuis le thread Tk : une seule
+insertion par lot, sans update_idletasks. Le widget est limité à max_lines
+lignes ; l'historique complet est écrit dans un fichier à rotation.
+"""
+
+import logging
+import queue
+from collections import deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+LEVEL_SYMBOLS = {
+    "INFO": "ℹ",
+    "WARNING": "⚠",
+    "ERROR": "❌",
+    "SUCCESS": "✅",
+    "SYSTEM": "⚡"
+}
+
+# Niveaux de l'interface -> niveaux du module logging
+LOGGING_LEVELS = {
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+}
+
+
+class LogSink:
+    """File de messages rendue par lots dans un widget Text borné."""
+
+    def __init__(self, root, max_lines: int = 1000, flush_interval_ms: int = 100,
+                 log_file: Optional[Union[str, Path]] = None,
+                 max_bytes: int = 1_000_000, backup_count: int = 3):
+        """
+        Args:
+            root: Fenêtre Tk (planification des rendus)
+            max_lines (int): Nombre maximal de lignes affichées
+            flush_interval_ms (int): Intervalle entre deux rendus
+            log_file (Optional[Union[str, Path]]): Fichier de l'historique
+                complet (None = pas de fichier)
+            max_bytes (int): Taille d'un fichier avant rotation
+            backup_count (int): Nombre de fichiers archivés conservés
+        """
+        self.root = root
+        self.max_lines = max_lines
+        self.flush_interval_ms = flush_interval_ms
+        self.widget = None
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._after_id = None
+
+        self.stats = {'emitted': 0, 'rendered': 0, 'flushes': 0, 'skipped': 0}
+
+        self._logger = None
+        if log_file is not None:
+            try:
+                path = Path(log_file)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                handler = RotatingFileHandler(path, maxBytes=max_bytes,
+                                              backupCount=backup_count, encoding='utf-8')
+                handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+                self._logger = logging.getLogger(f"voxthymio.gui.{id(self)}")
+                self._logger.setLevel(logging.INFO)
+                self._logger.propagate = False
+                self._logger.addHandler(handler)
+            except OSError as e:
+                print(f"⚠️ Journal fichier indisponible ({log_file}): {e}")
+
+    def attach(self, widget, level_colors: Optional[Dict[str, str]] = None):
+        """
+        Associe le widget d'affichage et démarre les rendus périodiques.
+
+        Args:
+            widget: Widget Text (ou ScrolledText) en lecture seule
+            level_colors (Optional[Dict[str, str]]): Couleur par niveau
+        """
+        self.widget = widget
+        for level, color in (level_colors or {}).items():
+            widget.tag_configure(level, foreground=color)
+        self._schedule()
+
+    def emit(self, message: str, level: str = "INFO"):
+        """Ajoute un message au journal (depuis n'importe quel thread)."""
+        timestamp = datetime.now()
+        self._queue.put((timestamp, level, message))
+        self.stats['emitted'] += 1
+
+        if self._logger is not None:
+            self._logger.log(LOGGING_LEVELS.get(level, logging.INFO), "%-7s %s", level, message)
+
+    def _schedule(self):
+        self._after_id = self.root.after(self.flush_interval_ms, self._flush)
+
+    def _flush(self):
+        """Affiche les messages en attente en un seul lot."""
+        # Seules les max_lines dernières lignes resteraient visibles
+        batch = deque(maxlen=self.max_lines)
+        received = 0
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+                received += 1
+            except queue.Empty:
+                break
+
+        if batch and self.widget is not None:
+            self._render(batch)
+            self.stats['flushes'] += 1
+            self.stats['rendered'] += len(batch)
+            self.stats['skipped'] += received - len(batch)
+
+        self._schedule()
+
+    def _render(self, batch):
+        widget = self.widget
+        # Ne suivre la fin du journal que si l'utilisateur y est déjà
+        at_bottom = widget.yview()[1] >= 0.999
+
+        widget.config(state="normal")
+
+        # Regrouper les lignes consécutives de même niveau : une insertion par groupe
+        chunks = []
+        for timestamp, level, message in batch:
+            line = f"[{timestamp:%H:%M:%S}] {LEVEL_SYMBOLS.get(level, '•')} {message}\n"
+            if chunks and chunks[-1][1] == level:
+                chunks[-1][0].append(line)
+            else:
+                chunks.append(([line], level))
+        for lines, level in chunks:
+            widget.insert("end", "".join(lines), level)
+
+        line_count = int(widget.index("end-1c").split(".")[0]) - 1
+        if line_count > self.max_lines:
+            widget.delete("1.0", f"{line_count - self.max_lines + 1}.0")
+
+        widget.config(state="disabled")
+        if at_bottom:
+            widget.see("end")
+
+    def clear(self):
+        """Efface l'affichage (l'historique fichier est conservé)."""
+        if self.widget is None:
+            return
+        self.widget.config(state="normal")
+        self.widget.delete("1.0", "end")
+        self.widget.config(state="disabled")
+
+    def close(self):
+        """Arrête les rendus et ferme le fichier de journal."""
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        if self._logger is not None:
+            for handler in list(self._logger.handlers):
+                handler.close()
+                self._logger.removeHandler(handler)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Retourne les compteurs du journal."""
+        return dict(self.stats)
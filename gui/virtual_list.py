@@ -0,0 +1,209 @@
+"""
+Liste virtualisée des commandes personnalisées.
+
+Seules les lignes visibles existent sous forme de widgets : un petit nombre
+de lignes (bouton d'exécution + bouton de suppression) est créé une fois
+puis réaffecté aux commandes lors du défilement. Le catalogue reste en
+mémoire ; la recherche filtre au fil de la frappe en réutilisant le
+résultat précédent quand la requête s'allonge.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+import unicodedata
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+def normalize(text: str) -> str:
+    """Minuscules sans accents, pour une recherche tolérante."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+class VirtualCommandList:
+    """Liste défilante et filtrable de commandes (nom, description)."""
+
+    def __init__(self, parent, colors: Dict[str, str],
+                 on_execute: Callable[[str], None],
+                 on_delete: Callable[[str, str], None],
+                 visible_rows: int = 6):
+        """
+        Args:
+            parent: Widget parent
+            colors (Dict[str, str]): Couleurs de l'interface
+            on_execute (Callable[[str], None]): Appelé avec la description
+            on_delete (Callable[[str, str], None]): Appelé avec (nom, description)
+            visible_rows (int): Nombre de lignes affichées
+        """
+        self.on_execute = on_execute
+        self.on_delete = on_delete
+        self.visible_rows = visible_rows
+
+        # Catalogue : description -> (nom, description, clé de recherche)
+        self._items: Dict[str, Tuple[str, str, str]] = {}
+        self._order: List[str] = []
+        self._filtered: List[str] = []
+        self._query = ""
+        self._offset = 0
+
+        self.frame = tk.Frame(parent, bg=colors['panel'])
+
+        # Recherche
+        search_frame = tk.Frame(self.frame, bg=colors['panel'])
+        search_frame.pack(fill="x", pady=(0, 4))
+
+        tk.Label(search_frame, text="🔍", bg=colors['panel'], fg=colors['accent'],
+                 font=("Consolas", 10)).pack(side="left")
+
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *args: self.filter(self.search_var.get()))
+        tk.Entry(search_frame, textvariable=self.search_var,
+                 bg=colors['background'], fg=colors['text_normal'],
+                 font=("Consolas", 10), relief="solid", bd=1,
+                 insertbackground=colors['primary']).pack(side="left", fill="x", expand=True, padx=4)
+
+        self.count_label = tk.Label(search_frame, text="0", bg=colors['panel'],
+                                    fg=colors['text_secondary'], font=("Consolas", 9))
+        self.count_label.pack(side="right")
+
+        # Lignes réutilisées + barre de défilement
+        body = tk.Frame(self.frame, bg=colors['panel'])
+        body.pack(fill="x")
+
+        self.scrollbar = ttk.Scrollbar(body, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        rows_frame = tk.Frame(body, bg=colors['panel'])
+        rows_frame.pack(side="left", fill="x", expand=True)
+
+        self._rows = []
+        for index in range(visible_rows):
+            row = tk.Frame(rows_frame, bg=colors['panel'])
+            execute_btn = ttk.Button(row, style="Cyber.Custom.TButton",
+                                     command=lambda i=index: self._execute_row(i))
+            execute_btn.pack(side="left", fill="x", expand=True, padx=(0, 5), ipadx=10, ipady=5)
+            delete_btn = ttk.Button(row, text="🗑", style="Cyber.Danger.TButton",
+                                    command=lambda i=index: self._delete_row(i))
+            delete_btn.pack(side="right", ipadx=5, ipady=5)
+
+            for widget in (row, execute_btn, delete_btn):
+                widget.bind("<MouseWheel>", self._on_mousewheel)
+                widget.bind("<Button-4>", lambda event: self.scroll(-1))
+                widget.bind("<Button-5>", lambda event: self.scroll(1))
+            self._rows.append((row, execute_btn))
+
+        self._refresh()
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    # Catalogue
+
+    def set_items(self, items: List[Tuple[str, str]]):
+        """Remplace le catalogue par une liste de (nom, description)."""
+        self._items = {}
+        self._order = []
+        for name, description in items:
+            self._store(name, description)
+        self._apply_filter(full=True)
+
+    def add_item(self, name: str, description: str):
+        """Ajoute (ou remplace) une commande."""
+        self._store(name, description)
+        self._apply_filter(full=True)
+
+    def remove_item(self, description: str):
+        """Retire une commande du catalogue."""
+        if self._items.pop(description, None) is not None:
+            self._order.remove(description)
+            self._apply_filter(full=True)
+
+    def _store(self, name: str, description: str):
+        if description not in self._items:
+            self._order.append(description)
+        self._items[description] = (name, description, normalize(f"{name} {description}"))
+
+    # Filtrage
+
+    def filter(self, query: str):
+        """Filtre les commandes dont le nom ou la description contient la requête."""
+        previous = self._query
+        self._query = normalize(query.strip())
+        # Requête allongée : le résultat est un sous-ensemble du précédent
+        self._apply_filter(full=not self._query.startswith(previous))
+
+    def _apply_filter(self, full: bool):
+        candidates = self._order if full else self._filtered
+        if self._query:
+            self._filtered = [description for description in candidates
+                              if self._query in self._items[description][2]]
+        else:
+            self._filtered = list(self._order)
+        self._offset = 0
+        self._refresh()
+
+    # Défilement et rendu
+
+    def scroll(self, rows: int):
+        """Décale l'affichage de rows lignes."""
+        self._set_offset(self._offset + rows)
+
+    def _set_offset(self, offset: int):
+        maximum = max(0, len(self._filtered) - self.visible_rows)
+        offset = min(max(0, offset), maximum)
+        if offset != self._offset:
+            self._offset = offset
+            self._refresh()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self._set_offset(round(float(value) * len(self._filtered)))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll(int(value) * step)
+
+    def _on_mousewheel(self, event):
+        self.scroll(-1 if event.delta > 0 else 1)
+
+    def _refresh(self):
+        """Réaffecte les lignes visibles aux commandes de la fenêtre courante."""
+        visible = self._filtered[self._offset:self._offset + self.visible_rows]
+
+        for index, (row, execute_btn) in enumerate(self._rows):
+            if index < len(visible):
+                execute_btn.config(text=f"🔧 {self._items[visible[index]][0]}")
+                if not row.winfo_manager():
+                    row.pack(fill="x", pady=2)
+            elif row.winfo_manager():
+                row.pack_forget()
+
+        total = len(self._filtered)
+        if total:
+            self.scrollbar.set(self._offset / total,
+                               min(1.0, (self._offset + self.visible_rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+        if self._query:
+            self.count_label.config(text=f"{total}/{len(self._order)}")
+        else:
+            self.count_label.config(text=str(total))
+
+    def _item_at(self, row_index: int) -> Optional[Tuple[str, str, str]]:
+        position = self._offset + row_index
+        if position < len(self._filtered):
+            return self._items[self._filtered[position]]
+        return None
+
+    def _execute_row(self, row_index: int):
+        item = self._item_at(row_index)
+        if item is not None:
+            self.on_execute(item[1])
+
+    def _delete_row(self, row_index: int):
+        item = self._item_at(row_index)
+        if item is not None:
+            self.on_delete(item[0], item[1])
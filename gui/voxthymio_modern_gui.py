@@ -8,10 +8,10 @@ cadre du projet TechEduc porté par AI4Innov
 
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-import asyncio
 import threading
 import json
 import sys
+import importlib.util
 from pathlib import Path
 import time
 from datetime import datetime
@@ -23,15 +23,33 @@ if str(parent_dir) not in sys.path:
 
 try:
     from src.controller.thymio_controller import ThymioController
+    from src.controller.aseba_validator import validate_aseba
+    from src.controller.simulated_client import SimulatedClientAsync
+    from src.controller.command_store import CommandStore
     from src.smart_voice_controller import SmartVoiceController
     from src.speech_recognizer import SpeechRecognizer
+    from gui.async_runtime import AsyncRuntime
+    from gui.log_sink import LogSink
+    from gui.virtual_list import VirtualCommandList
+    # Import sans préfixe : même instance que les modules du pipeline
+    from latency import latency_tracker, STAGES
 except ImportError as e:
     print(f"❌ Erreur d'importation: {e}")
     print("Vérifiez que les modules src/ sont présents")
     raise
 
+# Libellés des étapes d'initialisation du système vocal
+INIT_STAGE_LABELS = {
+    "model": "MODÈLE SÉMANTIQUE",
+    "index": "BASE VECTORIELLE",
+    "commands": "SYNCHRONISATION COMMANDES",
+    "speech": "MOTEUR VOCAL",
+    "warmup": "PRÉCHAUFFAGE",
+}
+
 # Chemins des modèles et configuration
 CONFIG_PATH = Path(__file__).parent / "config.json"
+ROOT_PATH = Path(__file__).parent.parent
 MODELS_PATH = Path(__file__).parent.parent / "models"
 
 class VoxThymioGUI:
@@ -44,9 +62,14 @@ class VoxThymioGUI:
         self.voice_mode = False
         self.voice_thread = None
         self.voice_active = False
+        self.voice_init_thread = None
         
         # Charger la configuration
         self.load_config()
+        self.setup_logging()
+        
+        # Catalogue des commandes (src/commands.json journalisé)
+        self.command_store = CommandStore()
         
         self.setup_window()
         self.create_widgets()
@@ -78,6 +101,11 @@ class VoxThymioGUI:
                         'danger': external_colors.get('danger', '#ff073a')
                     })
                 
+                # Paramètres vocaux et robot
+                for section in ('voice', 'thymio', 'logging'):
+                    if section in external_config:
+                        default_config.setdefault(section, {}).update(external_config[section])
+                
                 self.config = default_config
                 
         except FileNotFoundError:
@@ -119,10 +147,33 @@ class VoxThymioGUI:
             },
             "voice": {
                 "execution_threshold": 0.5,
-                "learning_threshold": 0.85
+                "learning_threshold": 0.85,
+                "gate_mode": "none",
+                "intent_server_url": None
+            },
+            "logging": {
+                "max_lines": 1000,
+                "flush_interval_ms": 100,
+                "file": "logs/voxthymio.log",
+                "max_bytes": 1048576,
+                "backup_count": 3
             }
         }
     
+    def setup_logging(self):
+        """Crée le journal : messages acceptés dès maintenant, affichés une fois le panneau créé."""
+        log_config = self.config['logging']
+        log_file = log_config.get('file')
+        
+        self.log_sink = LogSink(
+            self.root,
+            max_lines=log_config.get('max_lines', 1000),
+            flush_interval_ms=log_config.get('flush_interval_ms', 100),
+            log_file=ROOT_PATH / log_file if log_file else None,
+            max_bytes=log_config.get('max_bytes', 1048576),
+            backup_count=log_config.get('backup_count', 3)
+        )
+    
     def setup_window(self):
         """Configure la fenêtre principale avec style cyberpunk."""
         config = self.config
@@ -287,6 +338,7 @@ class VoxThymioGUI:
         
         # Widgets de droite
         self.create_voice_panel(right_frame)
+        self.create_latency_panel(right_frame)
         self.create_log_panel(right_frame)
         
         # Pied de page cyberpunk
@@ -470,13 +522,11 @@ class VoxThymioGUI:
         custom_buttons_frame = tk.Frame(frame, bg=colors['panel'])
         custom_buttons_frame.pack(fill="x", padx=10, pady=6)
         
-        # Liste pour stocker les boutons personnalisés
-        if not hasattr(self, 'custom_buttons'):
-            self.custom_buttons = []
-        
-        # Zone des boutons personnalisés existants
-        self.custom_commands_container = tk.Frame(custom_buttons_frame, bg=colors['panel'])
-        self.custom_commands_container.pack(fill="x", pady=(0, 6))
+        # Liste virtualisée : seules les lignes visibles sont des widgets
+        self.custom_list = VirtualCommandList(custom_buttons_frame, colors,
+                                              on_execute=self.execute_custom_command,
+                                              on_delete=self.delete_custom_command)
+        self.custom_list.pack(fill="x", pady=(0, 6))
         
         # Bouton pour ajouter une nouvelle commande
         add_button_frame = tk.Frame(custom_buttons_frame, bg=colors['panel'])
@@ -571,9 +621,9 @@ class VoxThymioGUI:
                 tk.messagebox.showerror("Erreur", "Le code Aseba est obligatoire!\nVeuillez saisir le code de votre commande.")
                 return
             
-            # Sauvegarder la commande
-            self.save_custom_command(name, description, code)
-            dialog.destroy()
+            # Sauvegarder la commande (la fenêtre reste ouverte si le code est invalide)
+            if self.save_custom_command(name, description, code):
+                dialog.destroy()
         
         # Boutons avec une approche simplifiée
         save_btn = tk.Button(button_container, text="💾 SAUVEGARDER", 
@@ -596,88 +646,63 @@ class VoxThymioGUI:
         name_entry.focus_set()
     
     def save_custom_command(self, name, description, code):
-        """Sauvegarde une commande personnalisée."""
+        """Sauvegarde une commande personnalisée. Retourne True si elle est enregistrée."""
+        # Vérification du code avant tout enregistrement
+        errors = validate_aseba(code)
+        if errors:
+            self.log_message(f"❌ Code Aseba invalide: {errors[0]}", "ERROR")
+            tk.messagebox.showerror("Code Aseba invalide", "\n".join(errors[:5]))
+            return False
+        
         try:
-            # Charger les commandes existantes
-            commands_path = Path(__file__).parent.parent / "src" / "commands.json"
-            if commands_path.exists():
-                with open(commands_path, 'r', encoding='utf-8') as f:
-                    commands = json.load(f)
-            else:
-                commands = {}
-            
-            # Ajouter la nouvelle commande
-            commands[description] = {
+            # Ajouter la nouvelle commande (une ligne de journal)
+            self.command_store.put(description, {
                 "description": description,
                 "code": code if code else f"# Commande personnalisée: {name}",
                 "custom": True
-            }
-            
-            # Sauvegarder
-            with open(commands_path, 'w', encoding='utf-8') as f:
-                json.dump(commands, f, ensure_ascii=False, indent=2)
+            })
             
             # Ajouter le bouton à l'interface
             self.add_custom_button(name, description)
             
             # Log
             self.log_message(f"✅ Commande '{name}' ajoutée avec succès", "INFO")
+            return True
             
         except Exception as e:
             self.log_message(f"❌ Erreur lors de la sauvegarde: {e}", "ERROR")
             tk.messagebox.showerror("Erreur", f"Impossible de sauvegarder la commande:\n{e}")
+            return False
     
     def add_custom_button(self, name, description):
-        """Ajoute un bouton pour une commande personnalisée."""
-        colors = self.config['ui']['colors']
-        
-        button_frame = tk.Frame(self.custom_commands_container, bg=colors['panel'])
-        button_frame.pack(fill="x", pady=2)
-        
-        # Bouton principal
-        custom_btn = ttk.Button(button_frame, text=f"🔧 {name}", 
-                               command=lambda: self.execute_custom_command(description),
-                               style="Cyber.Custom.TButton")
-        custom_btn.pack(side="left", fill="x", expand=True, padx=(0, 5), ipadx=10, ipady=5)
-        
-        # Bouton supprimer
-        delete_btn = ttk.Button(button_frame, text="🗑", 
-                               command=lambda: self.delete_custom_command(name, description, button_frame),
-                               style="Cyber.Danger.TButton")
-        delete_btn.pack(side="right", ipadx=5, ipady=5)
-        
-        self.custom_buttons.append((name, description, button_frame))
+        """Ajoute une commande personnalisée à la liste."""
+        self.custom_list.add_item(name, description)
     
     def execute_custom_command(self, description):
         """Exécute une commande personnalisée."""
         if self.voice_controller:
-            try:
-                self.voice_controller.process_command(description)
-                self.log_message(f"🔧 Commande personnalisée exécutée: {description}", "INFO")
-            except Exception as e:
-                self.log_message(f"❌ Erreur commande personnalisée: {e}", "ERROR")
+            def on_done(future):
+                error = None if future.cancelled() else future.exception()
+                if error is None and not future.cancelled() and future.result()['status'] == 'success':
+                    self.root.after(0, lambda: self.log_message(
+                        f"🔧 Commande personnalisée exécutée: {description}", "INFO"))
+                else:
+                    self.root.after(0, lambda: self.log_message(
+                        f"❌ Erreur commande personnalisée: {error or description}", "ERROR"))
+            
+            self.runtime.submit(self.voice_controller.process_command(description), on_done)
         else:
             self.log_message("❌ Contrôleur vocal non initialisé", "ERROR")
     
-    def delete_custom_command(self, name, description, button_frame):
+    def delete_custom_command(self, name, description):
         """Supprime une commande personnalisée."""
         if tk.messagebox.askyesno("Confirmer", f"Supprimer la commande '{name}' ?"):
             try:
-                # Supprimer du fichier commands.json
-                commands_path = Path(__file__).parent.parent / "src" / "commands.json"
-                if commands_path.exists():
-                    with open(commands_path, 'r', encoding='utf-8') as f:
-                        commands = json.load(f)
-                    
-                    if description in commands:
-                        del commands[description]
-                        
-                        with open(commands_path, 'w', encoding='utf-8') as f:
-                            json.dump(commands, f, ensure_ascii=False, indent=2)
+                # Supprimer du catalogue
+                self.command_store.delete(description)
                 
                 # Supprimer de l'interface
-                button_frame.destroy()
-                self.custom_buttons = [(n, d, f) for n, d, f in self.custom_buttons if f != button_frame]
+                self.custom_list.remove_item(description)
                 
                 self.log_message(f"🗑 Commande '{name}' supprimée", "INFO")
                 
@@ -687,17 +712,16 @@ class VoxThymioGUI:
     def load_custom_commands(self):
         """Charge les commandes personnalisées existantes."""
         try:
-            commands_path = Path(__file__).parent.parent / "src" / "commands.json"
-            if commands_path.exists():
-                with open(commands_path, 'r', encoding='utf-8') as f:
-                    commands = json.load(f)
-                
-                for description, details in commands.items():
-                    if details.get("custom", False):
-                        # Extraire le nom de la description ou utiliser une partie de la description
-                        name = description.split()[0:2]  # Prendre les 2 premiers mots
-                        name = " ".join(name) if len(name) > 1 else description[:20]
-                        self.add_custom_button(name, description)
+            commands = self.command_store.load()
+            
+            items = []
+            for description, details in commands.items():
+                if details.get("custom", False):
+                    # Extraire le nom de la description ou utiliser une partie de la description
+                    name = description.split()[0:2]  # Prendre les 2 premiers mots
+                    name = " ".join(name) if len(name) > 1 else description[:20]
+                    items.append((name, description))
+            self.custom_list.set_items(items)
         except Exception as e:
             self.log_message(f"⚠️ Erreur chargement commandes: {e}", "WARNING")
 
@@ -720,6 +744,13 @@ class VoxThymioGUI:
                                    style="Cyber.Status.TLabel")
         self.mic_status.pack()
         
+        # Progression de l'initialisation (affichée pendant le chargement)
+        self.init_progress = ttk.Progressbar(status_frame, 
+                                            style="Cyber.Horizontal.TProgressbar",
+                                            mode="determinate",
+                                            maximum=len(SmartVoiceController.INIT_STAGES),
+                                            length=260)
+        
         # Bouton vocal principal cyberpunk
         self.voice_btn = ttk.Button(frame, 
                                    text="🎤 ACTIVER MODE VOCAL",
@@ -727,6 +758,15 @@ class VoxThymioGUI:
                                    command=self.toggle_voice_mode)
         self.voice_btn.pack(pady=20, padx=20, fill="x", ipady=12)
         
+        # Bouton push-to-talk (actif uniquement en mode 'push_to_talk')
+        self.ptt_btn = ttk.Button(frame, 
+                                 text="🎙 MAINTENIR POUR PARLER",
+                                 style="Cyber.Secondary.TButton")
+        self.ptt_btn.bind("<ButtonPress-1>", self.on_push_to_talk_pressed)
+        self.ptt_btn.bind("<ButtonRelease-1>", self.on_push_to_talk_released)
+        if self.config['voice'].get('gate_mode') == "push_to_talk":
+            self.ptt_btn.pack(pady=(0, 10), padx=20, fill="x", ipady=8)
+        
         # Zone de commandes vocales cyberpunk
         commands_frame = tk.LabelFrame(frame, text=">> COMMANDES DISPONIBLES <<", 
                                       bg=colors['panel'], fg=colors['accent'], 
@@ -755,6 +795,81 @@ class VoxThymioGUI:
                                        pady=10)
         self.voice_indicator.pack(fill="x")
     
+    def create_latency_panel(self, parent):
+        """Panneau des latences : percentiles par étape et cascade du dernier énoncé."""
+        colors = self.config['ui']['colors']
+        
+        frame = tk.LabelFrame(parent, text="⏱ LATENCES", 
+                             bg=colors['panel'], fg=colors['primary'], 
+                             font=("Orbitron", 11, "bold"),
+                             relief="solid", bd=2)
+        frame.pack(fill="x", pady=(0, 8))
+        
+        self.latency_label = tk.Label(frame, text="EN ATTENTE DE MESURES...",
+                                      bg=colors['panel'], fg=colors['text_primary'],
+                                      font=("Consolas", 9), justify="left", anchor="w")
+        self.latency_label.pack(fill="x", padx=10, pady=(6, 2))
+        
+        self.waterfall_canvas = tk.Canvas(frame, height=16 * len(STAGES) + 18,
+                                          bg=colors['background'], highlightthickness=0)
+        self.waterfall_canvas.pack(fill="x", padx=10, pady=(2, 8))
+        
+        self.stage_colors = {
+            "microphone": colors['accent'],
+            "asr": colors['primary'],
+            "embedding": colors['warning'],
+            "search": colors['success'],
+            "robot": colors['danger']
+        }
+        self._latency_version = -1
+        self.update_latency_panel()
+    
+    def update_latency_panel(self):
+        """Rafraîchit le panneau des latences (seulement si de nouvelles mesures sont arrivées)."""
+        if latency_tracker.version != self._latency_version:
+            self._latency_version = latency_tracker.version
+            
+            stats = latency_tracker.percentiles()
+            if stats:
+                lines = [f"{'ÉTAPE':<11}{'P50':>8}{'P95':>8}{'P99':>8}{'N':>6}"]
+                for stage in STAGES:
+                    if stage in stats:
+                        s = stats[stage]
+                        lines.append(f"{stage.upper():<11}{s['p50']:>8.0f}{s['p95']:>8.0f}"
+                                     f"{s['p99']:>8.0f}{s['count']:>6}")
+                self.latency_label.config(text="\n".join(lines))
+            
+            self.draw_waterfall(latency_tracker.last_waterfall())
+        
+        self.root.after(500, self.update_latency_panel)
+    
+    def draw_waterfall(self, waterfall):
+        """Dessine la cascade des étapes d'un énoncé (barres horizontales)."""
+        canvas = self.waterfall_canvas
+        canvas.delete("all")
+        if not waterfall or not waterfall['stages']:
+            return
+        
+        colors = self.config['ui']['colors']
+        width = max(canvas.winfo_width(), 200)
+        label_width = 90
+        total = max(waterfall['total_ms'] or 0,
+                    max(s['offset_ms'] + s['duration_ms'] for s in waterfall['stages']), 1)
+        scale = (width - label_width - 60) / total
+        
+        canvas.create_text(4, 2, anchor="nw", fill=colors['text_normal'], font=("Consolas", 8),
+                           text=f"'{waterfall['label'][:40]}' : {total:.0f} ms")
+        for row, s in enumerate(waterfall['stages']):
+            y = 18 + row * 16
+            x0 = label_width + s['offset_ms'] * scale
+            x1 = max(x0 + 2, x0 + s['duration_ms'] * scale)
+            canvas.create_text(4, y, anchor="nw", fill=colors['text_normal'],
+                               font=("Consolas", 8), text=s['stage'].upper())
+            canvas.create_rectangle(x0, y + 2, x1, y + 12, width=0,
+                                    fill=self.stage_colors.get(s['stage'], colors['accent']))
+            canvas.create_text(x1 + 4, y, anchor="nw", fill=colors['text_normal'],
+                               font=("Consolas", 8), text=f"{s['duration_ms']:.0f} ms")
+    
     def create_log_panel(self, parent):
         """Panneau de logs cyberpunk."""
         colors = self.config['ui']['colors']
@@ -782,6 +897,13 @@ class VoxThymioGUI:
                                                  insertbackground=colors['primary'],
                                                  wrap="word")
         self.log_text.pack(fill="both", expand=True, padx=3, pady=3)
+        self.log_sink.attach(self.log_text, {
+            "INFO": colors['text_primary'],
+            "WARNING": colors['warning'],
+            "ERROR": colors['danger'],
+            "SUCCESS": colors['success'],
+            "SYSTEM": colors['accent']
+        })
         
         # Bouton de nettoyage cyberpunk
         clear_frame = tk.Frame(frame, bg=colors['panel'])
@@ -828,47 +950,23 @@ class VoxThymioGUI:
         self.update_time()
     
     def setup_async(self):
-        """Configure le support asynchrone."""
-        self.loop = None
-        self.async_thread = None
+        """Démarre la boucle asyncio partagée par toute l'application."""
+        self.runtime = AsyncRuntime()
+        self.runtime.start()
+        self._closed = False
     
     def log_message(self, message, level="INFO"):
-        """Ajoute un message au journal avec style cyberpunk."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        colors = self.config['ui']['colors']
-        
-        # Couleurs selon le niveau
-        level_colors = {
-            "INFO": colors['text_primary'],
-            "WARNING": colors['warning'], 
-            "ERROR": colors['danger'],
-            "SUCCESS": colors['success'],
-            "SYSTEM": colors['secondary']
-        }
-        
-        level_symbols = {
-            "INFO": "ℹ",
-            "WARNING": "⚠",
-            "ERROR": "❌",
-            "SUCCESS": "✅",
-            "SYSTEM": "⚡"
-        }
-        
-        symbol = level_symbols.get(level, "•")
+        """
+        Ajoute un message au journal (utilisable depuis n'importe quel thread).
         
-        self.log_text.config(state="normal")
-        self.log_text.insert("end", f"[{timestamp}] {symbol} {message}\n")
-        self.log_text.config(state="disabled")
-        self.log_text.see("end")
-        
-        # Mise à jour de l'interface
-        self.root.update_idletasks()
+        L'affichage est fait par lots par le LogSink, le message est aussi
+        écrit dans le fichier de journal.
+        """
+        self.log_sink.emit(message, level)
     
     def clear_logs(self):
         """Efface le journal."""
-        self.log_text.config(state="normal")
-        self.log_text.delete(1.0, "end")
-        self.log_text.config(state="disabled")
+        self.log_sink.clear()
         self.log_message("LOGS PURGÉS", "SYSTEM")
     
     def get_current_time(self):
@@ -885,28 +983,61 @@ class VoxThymioGUI:
         self.log_message("INITIATION LIAISON ROBOT THYMIO...", "INFO")
         self.connect_btn.config(state="disabled", text="LIAISON EN COURS...")
         
-        def connect_async():
-            async def do_connect():
-                self.thymio_controller = ThymioController()
-                success = await self.thymio_controller.connect()
-                
-                if success:
-                    self.root.after(0, self.on_connection_success)
-                else:
-                    self.root.after(0, self.on_connection_failed)
+        async def do_connect():
+            thymio_config = self.config.get('thymio', {})
+            self.thymio_controller = ThymioController(
+                connection_timeout=thymio_config.get('connection_timeout'),
+                auto_reconnect=thymio_config.get('auto_reconnect', False),
+                # Robot simulé : interface utilisable sans Thymio ni Thymio Suite
+                client_factory=SimulatedClientAsync if thymio_config.get('simulated') else None
+            )
+            self.thymio_controller.state_listeners.append(
+                lambda state: self.root.after(0, lambda: self.on_connection_state(state))
+            )
+            self.thymio_controller.timing_listeners.append(latency_tracker.record)
+            success = await self.thymio_controller.connect()
             
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(do_connect())
-            loop.close()
+            # Le superviseur tourne dans la boucle partagée pendant toute la session
+            if success and self.thymio_controller.auto_reconnect:
+                self.thymio_controller.start_supervisor()
+            return success
+        
+        def on_done(future):
+            success = not future.cancelled() and future.exception() is None and future.result()
+            self.root.after(0, self.on_connection_success if success else self.on_connection_failed)
+        
+        self.runtime.submit(do_connect(), on_done)
+    
+    def on_connection_state(self, state):
+        """Reflète les changements d'état signalés par le superviseur."""
+        colors = self.config['ui']['colors']
         
-        threading.Thread(target=connect_async, daemon=True).start()
+        if state == "reconnecting":
+            self.log_message("LIAISON PERDUE, RECONNEXION...", "WARNING")
+            self.connection_status.config(text="🔄 RECONNEXION...", foreground=colors['warning'])
+        elif state == "failed":
+            self.log_message("RECONNEXION IMPOSSIBLE", "ERROR")
+            self.connection_status.config(text="❌ LIAISON PERDUE", foreground=colors['danger'])
+            self.connect_btn.config(state="normal", text="🔄 RÉESSAYER", style="Cyber.Connect.TButton")
+        elif state == "disconnected" and self.thymio_controller.link_lost:
+            # Perte de liaison sans reconnexion automatique
+            self.log_message("LIAISON PERDUE", "ERROR")
+            self.connection_status.config(text="❌ LIAISON PERDUE", foreground=colors['danger'])
+            self.connect_btn.config(state="normal", text="🔄 RÉESSAYER", style="Cyber.Connect.TButton")
+        elif state == "connected" and self.connect_btn.cget("state") == "disabled":
+            stats = self.thymio_controller.get_connection_stats()
+            if stats.get('reconnects'):
+                self.log_message(f"LIAISON RÉTABLIE ({stats['last_reconnect_ms']:.0f} ms)", "SUCCESS")
+                self.connection_status.config(text="✅ SYSTÈME CONNECTÉ", foreground=colors['success'])
     
     def on_connection_success(self):
         """Callback de connexion réussie."""
         colors = self.config['ui']['colors']
         
         self.log_message("ROBOT THYMIO CONNECTÉ AVEC SUCCÈS", "SUCCESS")
+        robots = self.thymio_controller.get_nodes()
+        if len(robots) > 1:
+            self.log_message(f"FLOTTE: {len(robots)} ROBOTS VERROUILLÉS", "INFO")
         self.connection_status.config(text="✅ SYSTÈME CONNECTÉ", foreground=colors['success'])
         self.connect_btn.config(state="disabled", text="✅ CONNECTÉ", style="Cyber.Disabled.TButton")
         self.disconnect_btn.config(state="normal", style="Cyber.Connect.TButton")
@@ -928,16 +1059,90 @@ class VoxThymioGUI:
                            "Vérifiez que Thymio Suite est lancé et le robot connecté.")
     
     def init_voice_controller(self):
-        """Initialise le contrôleur vocal."""
-        colors = self.config['ui']['colors']
+        """
+        Initialise le contrôleur vocal en arrière-plan : modèle, base
+        vectorielle, commandes, moteur vocal puis préchauffage. La fenêtre
+        reste réactive et le mode vocal est activé dès que ses dépendances
+        sont prêtes.
+        """
+        # Reconnexion : les modèles déjà chargés sont conservés
+        if self.voice_controller is not None:
+            self.voice_controller.thymio_controller = self.thymio_controller
+            if self.voice_controller.is_voice_ready:
+                self.on_voice_ready()
+            return
         
         self.log_message("INITIALISATION SYSTÈME VOCAL...", "INFO")
+        self.voice_controller = SmartVoiceController(
+            self.thymio_controller, defer_init=True,
+            intent_server_url=self.config['voice'].get('intent_server_url')
+        )
+        self.init_progress.config(value=0)
+        self.init_progress.pack(pady=(6, 0))
+        
+        def progress(stage, status, elapsed_ms):
+            self.root.after(0, lambda: self.on_init_progress(stage, status, elapsed_ms))
+        
+        def initialize():
+            try:
+                self.voice_controller.initialize(progress)
+            except Exception as e:
+                self.root.after(0, lambda error=e: self.on_voice_init_failed(error))
+        
+        self.voice_init_thread = threading.Thread(target=initialize, daemon=True)
+        self.voice_init_thread.start()
+    
+    def on_init_progress(self, stage, status, elapsed_ms):
+        """Affiche l'avancement d'une étape d'initialisation."""
+        colors = self.config['ui']['colors']
+        label = INIT_STAGE_LABELS.get(stage, stage.upper())
+        
+        if status == "start":
+            # Le préchauffage se poursuit alors que le mode vocal est déjà actif
+            if not self.voice_controller.is_voice_ready:
+                self.mic_status.config(text=f"🎤 SYSTÈME VOCAL: {label}...", 
+                                     foreground=colors['warning'])
+            return
+        if status != "done":
+            return
+        
+        self.init_progress.step(1)
+        self.log_message(f"{label} PRÊT ({elapsed_ms:.0f} ms)", "INFO")
+        
+        if stage == "speech" and self.voice_controller.is_voice_ready:
+            self.on_voice_ready()
+        
+        timings = self.voice_controller.init_timings
+        if len(timings) == len(SmartVoiceController.INIT_STAGES):
+            self.init_progress.pack_forget()
+            self.log_message(f"SYSTÈME VOCAL INITIALISÉ EN {sum(timings.values()):.0f} ms", "SUCCESS")
+    
+    def on_voice_init_failed(self, error):
+        """Callback d'échec de l'initialisation vocale."""
+        colors = self.config['ui']['colors']
+        
+        self.init_progress.pack_forget()
+        self.log_message(f"ERREUR INITIALISATION VOCALE: {error}", "ERROR")
+        self.mic_status.config(text="🎤 SYSTÈME VOCAL: ❌ ERREUR", 
+                             foreground=colors['danger'])
+        # Nouvelle tentative possible à la prochaine connexion
+        self.voice_controller = None
+    
+    def on_voice_ready(self):
+        """Active le mode vocal une fois le moteur vocal et les commandes prêts."""
+        colors = self.config['ui']['colors']
+        
+        if not self.thymio_controller:
+            return
         
         try:
-            self.voice_controller = SmartVoiceController(self.thymio_controller)
+            self.voice_controller.speech_recognizer.set_gate_mode(
+                self.config['voice'].get('gate_mode', 'none'))
             
-            # Vérifier la disponibilité du microphone
-            speech_recognizer = SpeechRecognizer()
+            # Vérifier la disponibilité du microphone (sans charger de modèle)
+            microphones = SpeechRecognizer.probe_devices()
+            if not microphones:
+                raise RuntimeError("aucun microphone détecté")
             
             self.log_message("MICROPHONE DÉTECTÉ ET CONFIGURÉ", "SUCCESS")
             self.mic_status.config(text="🎤 SYSTÈME VOCAL: ✅ OPÉRATIONNEL", 
@@ -957,18 +1162,12 @@ class VoxThymioGUI:
         if self.voice_mode:
             self.toggle_voice_mode()
         
-        def disconnect_async():
-            async def do_disconnect():
-                if self.thymio_controller:
-                    await self.thymio_controller.disconnect()
-                self.root.after(0, self.on_disconnection_complete)
-            
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(do_disconnect())
-            loop.close()
+        async def do_disconnect():
+            if self.thymio_controller:
+                await self.thymio_controller.disconnect()
         
-        threading.Thread(target=disconnect_async, daemon=True).start()
+        self.runtime.submit(do_disconnect(),
+                            lambda future: self.root.after(0, self.on_disconnection_complete))
     
     def on_disconnection_complete(self):
         """Callback de déconnexion terminée."""
@@ -991,23 +1190,17 @@ class VoxThymioGUI:
         
         self.log_message(f"COMMANDE MANUELLE: {command.upper()}", "INFO")
         
-        def execute_async():
-            async def do_execute():
-                result = await self.thymio_controller.execute_command(command)
-                message = f"COMMANDE '{command.upper()}' EXÉCUTÉE" if result else f"ÉCHEC '{command.upper()}'"
-                level = "SUCCESS" if result else "ERROR"
-                self.root.after(0, lambda: self.log_message(message, level))
-            
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(do_execute())
-            loop.close()
+        async def do_execute():
+            result = await self.thymio_controller.execute_command(command)
+            message = f"COMMANDE '{command.upper()}' EXÉCUTÉE" if result else f"ÉCHEC '{command.upper()}'"
+            level = "SUCCESS" if result else "ERROR"
+            self.root.after(0, lambda: self.log_message(message, level))
         
-        threading.Thread(target=execute_async, daemon=True).start()
+        self.runtime.submit(do_execute())
     
     def toggle_voice_mode(self):
         """Active/désactive le mode vocal."""
-        if not self.voice_controller:
+        if not self.voice_controller or not self.voice_controller.is_voice_ready:
             messagebox.showerror("Erreur", "Système vocal non disponible !")
             return
         
@@ -1049,25 +1242,28 @@ class VoxThymioGUI:
             self.voice_thread.join(timeout=1)
     
     def voice_listener(self):
-        """Thread d'écoute vocale."""
+        """
+        Thread d'écoute vocale : la capture micro est bloquante, le
+        traitement des commandes est confié à la boucle partagée.
+        """
         colors = self.config['ui']['colors']
         
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
         while self.voice_active and self.voice_mode:
             try:
                 self.root.after(0, lambda: self.voice_indicator.config(
                     text="🎤 ANALYSE EN COURS...", foreground=colors['warning']))
                 
                 # Utiliser le contrôleur vocal existant
+                # Nouvel énoncé : les étapes micro et reconnaissance s'y rattachent
+                utterance = latency_tracker.begin()
                 command_text = self.voice_controller.speech_recognizer.listen()
                 
                 if not self.voice_active:
                     break
                 
                 if command_text:
-                    self.root.after(0, lambda cmd=command_text: self.process_voice_command(cmd))
+                    self.root.after(0, lambda cmd=command_text, u=utterance:
+                                    self.process_voice_command(cmd, u))
                 else:
                     self.root.after(0, lambda: self.voice_indicator.config(
                         text="🎤 AUCUNE PAROLE DÉTECTÉE", foreground=colors['warning']))
@@ -1078,13 +1274,11 @@ class VoxThymioGUI:
                 self.root.after(0, lambda: self.log_message(f"ERREUR VOCALE: {e}", "ERROR"))
                 time.sleep(1)
         
-        loop.close()
-        
         if not self.voice_mode:
             self.root.after(0, lambda: self.voice_indicator.config(
                 text="🔇 MODE VOCAL INACTIF", foreground=colors['text_secondary']))
     
-    def process_voice_command(self, command_text):
+    def process_voice_command(self, command_text, utterance=None):
         """Traite une commande vocale reconnue."""
         colors = self.config['ui']['colors']
         
@@ -1097,30 +1291,37 @@ class VoxThymioGUI:
             return
         
         # Traitement via le contrôleur vocal
-        def execute_voice_command():
-            async def do_execute():
-                result = await self.voice_controller.process_command(command_text)
-                
-                if result['status'] == 'success':
-                    message = f"COMMANDE VOCALE EXÉCUTÉE: {result.get('action', '').upper()}"
-                    level = "SUCCESS"
-                else:
-                    message = f"COMMANDE VOCALE NON RECONNUE: '{command_text.upper()}'"
-                    level = "WARNING"
-                
-                self.root.after(0, lambda: self.log_message(message, level))
-                
-                if self.voice_mode:
-                    self.root.after(0, lambda: self.voice_indicator.config(
-                        text="🎤 MODE VOCAL ACTIF - PARLEZ MAINTENANT", 
-                        foreground=colors['success']))
+        async def do_execute():
+            latency_tracker.attach(utterance)
+            result = await self.voice_controller.process_command(command_text)
+            
+            if result['status'] == 'success':
+                message = f"COMMANDE VOCALE EXÉCUTÉE: {result.get('action', '').upper()}"
+                level = "SUCCESS"
+            else:
+                message = f"COMMANDE VOCALE NON RECONNUE: '{command_text.upper()}'"
+                level = "WARNING"
             
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(do_execute())
-            loop.close()
+            self.root.after(0, lambda: self.log_message(message, level))
+            
+            if self.voice_mode:
+                self.root.after(0, lambda: self.voice_indicator.config(
+                    text="🎤 MODE VOCAL ACTIF - PARLEZ MAINTENANT", 
+                    foreground=colors['success']))
         
-        threading.Thread(target=execute_voice_command, daemon=True).start()
+        self.runtime.submit(do_execute())
+    
+    def on_push_to_talk_pressed(self, event=None):
+        """Début d'appui sur le bouton push-to-talk."""
+        if self.voice_controller and self.voice_mode:
+            self.voice_controller.speech_recognizer.push_to_talk_pressed()
+            self.voice_indicator.config(text="🎙 PARLEZ MAINTENANT...",
+                                        foreground=self.config['ui']['colors']['success'])
+    
+    def on_push_to_talk_released(self, event=None):
+        """Fin d'appui sur le bouton push-to-talk."""
+        if self.voice_controller and self.voice_controller.speech_recognizer:
+            self.voice_controller.speech_recognizer.push_to_talk_released()
     
     def on_closing(self):
         """Gestion de la fermeture de l'application."""
@@ -1132,29 +1333,24 @@ class VoxThymioGUI:
             if self.thymio_controller:
                 self.log_message("DÉCONNEXION EN COURS...", "INFO")
                 
-                def final_disconnect():
-                    try:
-                        async def do_disconnect():
-                            await self.thymio_controller.disconnect()
-                        
-                        loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(loop)
-                        loop.run_until_complete(do_disconnect())
-                        loop.close()
-                        
-                    except Exception as e:
-                        print(f"Erreur lors de la déconnexion: {e}")
-                    finally:
-                        self.root.after(0, self.root.quit)
-                
-                threading.Thread(target=final_disconnect, daemon=True).start()
-                self.root.after(2000, self.root.quit)
+                self.runtime.submit(self.thymio_controller.disconnect(),
+                                    lambda future: self.root.after(0, self.shutdown))
+                self.root.after(2000, self.shutdown)
             else:
-                self.root.quit()
+                self.shutdown()
                 
         except Exception as e:
             print(f"Erreur lors de la fermeture: {e}")
-            self.root.quit()
+            self.shutdown()
+    
+    def shutdown(self):
+        """Arrête la boucle asyncio puis quitte l'interface (une seule fois)."""
+        if self._closed:
+            return
+        self._closed = True
+        self.runtime.stop()
+        self.log_sink.close()
+        self.root.quit()
     
     def run(self):
         """Lance l'application."""
@@ -1178,12 +1374,9 @@ def main():
             "sentence_transformers"
         ]
         
-        missing_modules = []
-        for module in required_modules:
-            try:
-                __import__(module)
-            except ImportError:
-                missing_modules.append(module)
+        # Présence vérifiée sans importer (chargement différé des modèles)
+        missing_modules = [module for module in required_modules
+                           if importlib.util.find_spec(module) is None]
         
         if missing_modules:
             messagebox.showerror("Dépendances manquantes", 
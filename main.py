@@ -5,11 +5,18 @@ Développé par Espérance AYIWAHOUN pour AI4Innov
 Ce script lance l'interface graphique VoxThymio avec toutes les vérifications nécessaires.
 """
 
-import sys
+import argparse
+import builtins
+import importlib.util
 import os
-import subprocess
+import sys
+import threading
+import time
 from pathlib import Path
 
+# Origine des mesures de --profile-startup
+_STARTUP_TIME = time.perf_counter()
+
 def check_python_version():
     """Vérifie la version de Python."""
     if sys.version_info < (3, 8):
@@ -18,8 +25,15 @@ def check_python_version():
         return False
     return True
 
+def is_installed(module):
+    """Indique si un module est installé, sans l'importer."""
+    try:
+        return importlib.util.find_spec(module) is not None
+    except (ImportError, ValueError):
+        return False
+
 def check_requirements():
-    """Vérifie que les dépendances sont installées."""
+    """Vérifie que les dépendances sont installées (sans les importer)."""
     required_packages = [
         "tkinter",
         "asyncio",
@@ -28,30 +42,19 @@ def check_requirements():
         "pathlib"
     ]
     
-    optional_packages = [
-        "tdmclient",
-        "SpeechRecognition", 
-        "transformers",
-        "sentence_transformers",
-        "chromadb",
-        "torch",
-        "numpy"
-    ]
+    # Nom du paquet pip -> nom du module importé
+    optional_packages = {
+        "tdmclient": "tdmclient",
+        "SpeechRecognition": "speech_recognition",
+        "transformers": "transformers",
+        "sentence_transformers": "sentence_transformers",
+        "chromadb": "chromadb",
+        "torch": "torch",
+        "numpy": "numpy"
+    }
     
-    missing_required = []
-    missing_optional = []
-    
-    for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
-            missing_required.append(package)
-    
-    for package in optional_packages:
-        try:
-            __import__(package)
-        except ImportError:
-            missing_optional.append(package)
+    missing_required = [pkg for pkg in required_packages if not is_installed(pkg)]
+    missing_optional = [pkg for pkg, module in optional_packages.items() if not is_installed(module)]
     
     if missing_required:
         print("❌ Packages requis manquants:")
@@ -67,8 +70,103 @@ def check_requirements():
     
     return True
 
+class ImportProfiler:
+    """
+    Mesure la durée des imports du thread principal jusqu'à l'affichage de
+    la fenêtre (option --profile-startup).
+    """
+    
+    def __init__(self):
+        self.timings = {}  # module -> (durée cumulée, durée propre) en secondes
+        self._stack = []
+        self._original_import = builtins.__import__
+        self._main_thread = threading.main_thread()
+    
+    def start(self):
+        builtins.__import__ = self._import
+    
+    def stop(self):
+        builtins.__import__ = self._original_import
+    
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Modules déjà chargés et imports des autres threads : pas de mesure
+        if (level == 0 and name in sys.modules) or threading.current_thread() is not self._main_thread:
+            return self._original_import(name, globals, locals, fromlist, level)
+        
+        start = time.perf_counter()
+        self._stack.append(0.0)
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            key = "." * level + name
+            if key not in self.timings:
+                self.timings[key] = (elapsed, elapsed - children)
+    
+    def report(self, top=15):
+        """Affiche la durée jusqu'à la fenêtre et les imports les plus coûteux."""
+        self.stop()
+        total = time.perf_counter() - _STARTUP_TIME
+        imports = sum(own for _, own in self.timings.values())
+        
+        print("\n⏱️ Profil de démarrage")
+        print(f"   Fenêtre affichée après {total * 1000:.0f} ms "
+              f"(imports: {imports * 1000:.0f} ms, {len(self.timings)} modules)")
+        print(f"   {'module':<40}{'cumulé':>10}{'propre':>10}")
+        ranked = sorted(self.timings.items(), key=lambda item: item[1][0], reverse=True)
+        for name, (cumulative, own) in ranked[:top]:
+            print(f"   {name:<40}{cumulative * 1000:>8.1f}ms{own * 1000:>8.1f}ms")
+
+def launch_gui(profiler=None):
+    """Lance l'interface dans ce processus (sans second interpréteur)."""
+    gui_dir = Path(__file__).parent / "gui"
+    launcher_path = gui_dir / "launcher.py"
+    
+    if not launcher_path.exists():
+        print(f"❌ Fichier launcher non trouvé: {launcher_path}")
+        sys.exit(1)
+    
+    print("\n🚀 Lancement de l'interface graphique...")
+    
+    # Même répertoire de travail qu'un lancement direct du launcher
+    os.chdir(gui_dir)
+    sys.path.insert(0, str(gui_dir))
+    
+    import launcher
+    launcher.main(on_ready=profiler.report if profiler else None)
+
+def launch_headless(argv):
+    """Lance VoxThymio sans interface (sans importer Tk)."""
+    sys.path.insert(0, str(Path(__file__).parent / "src"))
+    
+    import headless
+    return headless.main(argv)
+
 def main():
     """Point d'entrée principal."""
+    parser = argparse.ArgumentParser(description="VoxThymio - contrôle vocal pour Thymio")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="affiche la durée des imports jusqu'à l'affichage de la fenêtre")
+    parser.add_argument("--headless", action="store_true",
+                        help="sans interface : commandes sur stdin, microphone ou fichiers, "
+                             "une ligne JSON par commande (voir --headless --help)")
+    
+    # Les autres options sont celles du mode sans interface, et la sortie
+    # standard y est réservée aux lignes JSON : pas de bannière
+    if "--headless" in sys.argv[1:]:
+        if not check_python_version():
+            sys.exit(1)
+        sys.exit(launch_headless([arg for arg in sys.argv[1:] if arg != "--headless"]))
+    
+    args = parser.parse_args()
+    
+    profiler = ImportProfiler() if args.profile_startup else None
+    if profiler:
+        profiler.start()
+    
     print("🤖 VoxThymio v1.0 - Système de contrôle vocal pour Thymio")
     print("   Développé par Espérance AYIWAHOUN (AI4Innov)")
     print("=" * 60)
@@ -87,22 +185,8 @@ def main():
     
     # Lancement de l'interface
     try:
-        gui_dir = Path(__file__).parent / "gui"
-        launcher_path = gui_dir / "launcher.py"
+        launch_gui(profiler)
         
-        if not launcher_path.exists():
-            print(f"❌ Fichier launcher non trouvé: {launcher_path}")
-            sys.exit(1)
-        
-        print("\n🚀 Lancement de l'interface graphique...")
-        
-        # Lancer le script GUI
-        os.chdir(gui_dir)
-        subprocess.run([sys.executable, "launcher.py"], check=True)
-        
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Erreur lors du lancement: {e}")
-        sys.exit(1)
     except KeyboardInterrupt:
         print("\n🛑 Arrêt demandé par l'utilisateur")
     except Exception as e:
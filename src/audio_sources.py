@@ -0,0 +1,225 @@
+"""
+Sources audio pour la reconnaissance vocale.
+
+Permet d'alimenter SpeechRecognizer avec autre chose que le microphone :
+fichier WAV/FLAC, répertoire d'enregistrements ou tableau NumPy en mémoire.
+Utile pour rejouer un corpus et mesurer la reconnaissance sans matériel audio.
+"""
+
+import wave
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+AUDIO_EXTENSIONS = (".wav", ".flac")
+
+AudioSegment = Tuple[np.ndarray, int]
+
+
+def read_audio_file(path: Union[str, Path]) -> AudioSegment:
+    """
+    Lit un fichier audio et le convertit en signal mono float32.
+
+    Les fichiers WAV sont lus avec la bibliothèque standard ; les autres
+    formats (FLAC...) nécessitent le paquet optionnel soundfile.
+
+    Args:
+        path (Union[str, Path]): Chemin du fichier
+
+    Returns:
+        AudioSegment: (signal mono float32 dans [-1, 1], fréquence en Hz)
+    """
+    path = Path(path)
+
+    if path.suffix.lower() == ".wav":
+        with wave.open(str(path), 'rb') as wav_file:
+            n_channels = wav_file.getnchannels()
+            sample_width = wav_file.getsampwidth()
+            rate = wav_file.getframerate()
+            raw = wav_file.readframes(wav_file.getnframes())
+
+        if sample_width == 1:
+            samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+        elif sample_width == 2:
+            samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+        elif sample_width == 4:
+            samples = np.frombuffer(raw, dtype=np.int32).astype(np.float32) / 2147483648.0
+        else:
+            raise ValueError(f"Largeur d'échantillon non supportée ({sample_width} octets): {path}")
+
+        if n_channels > 1:
+            samples = samples.reshape(-1, n_channels).mean(axis=1)
+        return samples, rate
+
+    if not SOUNDFILE_AVAILABLE:
+        raise RuntimeError(f"Format non supporté sans le paquet 'soundfile': {path.suffix}")
+
+    samples, rate = sf.read(str(path), dtype='float32', always_2d=True)
+    return samples.mean(axis=1), rate
+
+
+class AudioSource(ABC):
+    """
+    Interface commune des sources audio.
+
+    Une source fournit des segments (signal, fréquence) via read() jusqu'à
+    épuisement. Les sources « live » (microphone) sont capturées directement
+    par SpeechRecognizer selon le moteur actif.
+    """
+
+    is_live = False
+
+    @abstractmethod
+    def read(self, timeout: float = 5.0) -> Optional[AudioSegment]:
+        """
+        Retourne le segment suivant.
+
+        Args:
+            timeout (float): Durée maximale d'attente (sources live)
+
+        Returns:
+            Optional[AudioSegment]: Segment audio ou None si épuisée
+        """
+
+    @property
+    def exhausted(self) -> bool:
+        """Indique qu'aucun segment ne reste à lire."""
+        return False
+
+    def __iter__(self):
+        while not self.exhausted:
+            segment = self.read()
+            if segment is None:
+                return
+            yield segment
+
+
+class MicrophoneSource(AudioSource):
+    """Microphone du système (capture gérée par le moteur de reconnaissance)."""
+
+    is_live = True
+
+    def read(self, timeout: float = 5.0) -> Optional[AudioSegment]:
+        raise RuntimeError("La capture micro est réalisée par SpeechRecognizer")
+
+    def __repr__(self):
+        return "MicrophoneSource()"
+
+
+class ArraySource(AudioSource):
+    """Un ou plusieurs signaux NumPy en mémoire."""
+
+    def __init__(self, audio: Union[np.ndarray, List[np.ndarray]], sample_rate: int = 16000):
+        """
+        Args:
+            audio: Signal unique ou liste de signaux mono
+            sample_rate (int): Fréquence des signaux (Hz)
+        """
+        self.sample_rate = sample_rate
+        self._segments = [audio] if isinstance(audio, np.ndarray) else list(audio)
+        self._index = 0
+
+    def read(self, timeout: float = 5.0) -> Optional[AudioSegment]:
+        if self.exhausted:
+            return None
+        segment = np.asarray(self._segments[self._index], dtype=np.float32).reshape(-1)
+        self._index += 1
+        return segment, self.sample_rate
+
+    @property
+    def exhausted(self) -> bool:
+        return self._index >= len(self._segments)
+
+    def __repr__(self):
+        return f"ArraySource({len(self._segments)} segment(s), {self.sample_rate} Hz)"
+
+
+class FileSource(AudioSource):
+    """Un fichier WAV ou FLAC, lu en un seul segment."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        if not self.path.is_file():
+            raise FileNotFoundError(f"Fichier audio introuvable: {self.path}")
+        self._done = False
+
+    def read(self, timeout: float = 5.0) -> Optional[AudioSegment]:
+        if self._done:
+            return None
+        self._done = True
+        return read_audio_file(self.path)
+
+    @property
+    def exhausted(self) -> bool:
+        return self._done
+
+    def __repr__(self):
+        return f"FileSource('{self.path}')"
+
+
+class DirectorySource(AudioSource):
+    """Tous les enregistrements d'un répertoire, par ordre alphabétique."""
+
+    def __init__(self, directory: Union[str, Path], recursive: bool = False):
+        """
+        Args:
+            directory (Union[str, Path]): Répertoire contenant les fichiers audio
+            recursive (bool): Parcourt aussi les sous-répertoires
+        """
+        self.directory = Path(directory)
+        if not self.directory.is_dir():
+            raise NotADirectoryError(f"Répertoire introuvable: {self.directory}")
+
+        pattern = "**/*" if recursive else "*"
+        self.files = sorted(
+            path for path in self.directory.glob(pattern)
+            if path.is_file() and path.suffix.lower() in AUDIO_EXTENSIONS
+        )
+        self._index = 0
+        self.current_path: Optional[Path] = None
+
+    def read(self, timeout: float = 5.0) -> Optional[AudioSegment]:
+        if self.exhausted:
+            return None
+        self.current_path = self.files[self._index]
+        self._index += 1
+        return read_audio_file(self.current_path)
+
+    @property
+    def exhausted(self) -> bool:
+        return self._index >= len(self.files)
+
+    def __repr__(self):
+        return f"DirectorySource('{self.directory}', {len(self.files)} fichier(s))"
+
+
+def open_source(spec: Union[None, str, Path, np.ndarray, AudioSource]) -> AudioSource:
+    """
+    Construit une source audio à partir d'une description simple.
+
+    Args:
+        spec: None/"mic" (microphone), chemin de fichier ou de répertoire,
+              tableau NumPy (16 kHz) ou source déjà construite
+
+    Returns:
+        AudioSource: Source correspondante
+    """
+    if isinstance(spec, AudioSource):
+        return spec
+    if spec is None or (isinstance(spec, str) and spec == "mic"):
+        return MicrophoneSource()
+    if isinstance(spec, np.ndarray):
+        return ArraySource(spec)
+
+    path = Path(spec)
+    if path.is_dir():
+        return DirectorySource(path)
+    return FileSource(path)
@@ -0,0 +1,141 @@
+"""
+Analyse légère des programmes Aseba envoyés au Thymio.
+
+Reconnaît les programmes constitués uniquement d'affectations de constantes à
+des variables connues du robot : ceux-ci peuvent être appliqués en un seul
+set_variables, sans compilation ni redémarrage du programme.
+"""
+
+import hashlib
+import re
+from typing import Dict, List, Optional
+
+# Variables du Thymio modifiables par set_variables : nom -> taille
+WRITABLE_VARIABLES = {
+    "motor.left.target": 1,
+    "motor.right.target": 1,
+    "timer.period": 2,
+    "mic.threshold": 1,
+    "prox.comm.tx": 1,
+}
+
+_NAME = r"([a-zA-Z_][\w.]*)"
+_INT = r"-?\d+"
+_SCALAR_PATTERN = re.compile(rf"^{_NAME}\s*=\s*({_INT})$")
+_INDEXED_PATTERN = re.compile(rf"^{_NAME}\[(\d+)\]\s*=\s*({_INT})$")
+_ARRAY_PATTERN = re.compile(rf"^{_NAME}\s*=\s*\[\s*({_INT}(?:\s*,\s*{_INT})*)\s*\]$")
+_LEDS_CALL_PATTERN = re.compile(rf"^call leds\.[\w.]+\(\s*{_INT}(?:\s*,\s*{_INT})*\s*\)$")
+
+# Résultats d'analyse indexés par empreinte du code source
+_CACHE_LIMIT = 1024
+_parse_cache: Dict[str, Optional[Dict[str, List[int]]]] = {}
+
+
+def code_hash(code: str) -> str:
+    """Empreinte stable d'un programme Aseba."""
+    return hashlib.sha1(code.encode("utf-8")).hexdigest()
+
+
+def split_statements(code: str) -> List[str]:
+    """Découpe un programme en instructions, sans commentaires ni lignes vides."""
+    statements = []
+    for line in code.splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            statements.append(re.sub(r"\s+", " ", line))
+    return statements
+
+
+def _parse(code: str) -> Optional[Dict[str, List[int]]]:
+    """Analyse non mise en cache, voir parse_constant_assignments()."""
+    statements = split_statements(code)
+    if not statements:
+        return None
+
+    values: Dict[str, List[Optional[int]]] = {}
+
+    for statement in statements:
+        match = _SCALAR_PATTERN.match(statement)
+        if match:
+            name, value = match.group(1), int(match.group(2))
+            # Tableau affecté par un scalaire (timer.period = X) : l'écriture
+            # des autres éléments n'est pas voulue, passage par la compilation
+            if WRITABLE_VARIABLES.get(name) != 1:
+                return None
+            values[name] = [value]
+            continue
+
+        match = _INDEXED_PATTERN.match(statement)
+        if match:
+            name, index, value = match.group(1), int(match.group(2)), int(match.group(3))
+            size = WRITABLE_VARIABLES.get(name)
+            if size is None or index >= size:
+                return None
+            values.setdefault(name, [None] * size)[index] = value
+            continue
+
+        match = _ARRAY_PATTERN.match(statement)
+        if match:
+            name = match.group(1)
+            items = [int(item) for item in match.group(2).split(",")]
+            if WRITABLE_VARIABLES.get(name) != len(items):
+                return None
+            values[name] = items
+            continue
+
+        # Instruction autre qu'une affectation de constante
+        return None
+
+    # set_variables écrit des tableaux complets : tous les éléments sont requis
+    if any(value is None for items in values.values() for value in items):
+        return None
+
+    return values
+
+
+def parse_constant_assignments(code: str) -> Optional[Dict[str, List[int]]]:
+    """
+    Extrait les affectations d'un programme composé uniquement de constantes.
+
+    Les affectations successives d'une même variable sont fusionnées (la
+    dernière l'emporte). Les résultats sont mis en cache par empreinte.
+
+    Args:
+        code (str): Programme Aseba
+
+    Returns:
+        Optional[Dict[str, List[int]]]: Valeurs à écrire (format set_variables),
+            ou None si le programme nécessite une compilation
+    """
+    key = code_hash(code)
+    if key not in _parse_cache:
+        if len(_parse_cache) >= _CACHE_LIMIT:
+            _parse_cache.clear()
+        _parse_cache[key] = _parse(code)
+
+    values = _parse_cache[key]
+    return {name: list(items) for name, items in values.items()} if values else None
+
+
+def is_idempotent(code: str) -> bool:
+    """
+    Indique si relancer un programme ne change rien à l'état du robot.
+
+    C'est le cas des programmes composés uniquement d'affectations de
+    constantes et d'appels aux LEDs avec des arguments constants : sans
+    événement, boucle ni son, une seconde exécution produit le même état.
+
+    Args:
+        code (str): Programme Aseba
+
+    Returns:
+        bool: True si le programme est idempotent
+    """
+    statements = split_statements(code)
+    return bool(statements) and all(
+        _SCALAR_PATTERN.match(statement)
+        or _INDEXED_PATTERN.match(statement)
+        or _ARRAY_PATTERN.match(statement)
+        or _LEDS_CALL_PATTERN.match(statement)
+        for statement in statements
+    )
@@ -0,0 +1,449 @@
+"""
+Vérification locale des programmes Aseba avant leur envoi au Thymio.
+
+Analyse lexicale et syntaxique légère, complétée d'un contrôle des symboles
+(variables et fonctions natives du Thymio, événements, sous-programmes).
+Un programme refusé ici n'atteint jamais le TDM : pas d'aller-retour réseau
+pour une faute de frappe, ni de robot laissé dans un état intermédiaire.
+
+La vérification n'est pas exhaustive : un programme accepté peut encore être
+refusé par le compilateur Aseba, mais un programme refusé est invalide.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from .aseba_parser import code_hash
+except ImportError:
+    from aseba_parser import code_hash
+
+# Variables du Thymio : nom -> taille
+THYMIO_VARIABLES = {
+    "id": 1, "source": 1, "args": 32,
+    "event.source": 1, "event.args": 32,
+    "fwversion": 2, "productId": 1,
+    "buttons._raw": 5, "buttons._mean": 5, "buttons._noise": 5,
+    "button.backward": 1, "button.left": 1, "button.center": 1,
+    "button.forward": 1, "button.right": 1,
+    "prox.horizontal": 7,
+    "prox.comm.rx._payloads": 7, "prox.comm.rx._intensities": 7,
+    "prox.comm.rx": 1, "prox.comm.tx": 1,
+    "prox.ground.ambiant": 2, "prox.ground.reflected": 2, "prox.ground.delta": 2,
+    "motor.left.target": 1, "motor.right.target": 1,
+    "motor.left.speed": 1, "motor.right.speed": 1,
+    "motor.left.pwm": 1, "motor.right.pwm": 1,
+    "_vbat": 2, "_imot": 2, "_integrator": 2,
+    "acc": 3, "acc._tap": 1,
+    "leds.top": 3, "leds.bottom.left": 3, "leds.bottom.right": 3, "leds.circle": 8,
+    "temperature": 1,
+    "rc5.address": 1, "rc5.command": 1,
+    "mic.intensity": 1, "mic.threshold": 1, "mic._mean": 1,
+    "timer.period": 2,
+    "sd.present": 1,
+}
+
+# Fonctions natives du Thymio : nom -> nombre d'arguments
+THYMIO_FUNCTIONS = {
+    "math.copy": 2, "math.fill": 2, "math.addscalar": 3,
+    "math.add": 3, "math.sub": 3, "math.mul": 3, "math.div": 3,
+    "math.min": 3, "math.max": 3, "math.clamp": 4, "math.dot": 4,
+    "math.stat": 4, "math.argbounds": 2, "math.sort": 1, "math.muldiv": 4,
+    "math.atan2": 3, "math.sin": 2, "math.cos": 2, "math.rot2": 3,
+    "math.sqrt": 2, "math.rand": 1,
+    "leds.top": 3, "leds.bottom.left": 3, "leds.bottom.right": 3,
+    "leds.circle": 8, "leds.prox.h": 8, "leds.prox.v": 2, "leds.buttons": 4,
+    "leds.rc": 1, "leds.temperature": 2, "leds.sound": 1,
+    "sound.record": 1, "sound.play": 1, "sound.replay": 1, "sound.system": 1,
+    "sound.freq": 2, "sound.wave": 1, "sound.duration": 2,
+    "prox.comm.enable": 1,
+    "sd.open": 1, "sd.write": 1, "sd.read": 1, "sd.seek": 1,
+    "_system.reboot": 0, "_system.settings.read": 2, "_system.settings.write": 2,
+    "_poweroff": 0,
+}
+
+# Événements locaux du Thymio
+THYMIO_EVENTS = {
+    "button.backward", "button.left", "button.center", "button.forward", "button.right",
+    "buttons", "prox", "prox.comm", "tap", "acc", "mic", "sound.finished",
+    "temperature", "rc5", "motor", "timer0", "timer1",
+}
+
+KEYWORDS = {
+    "var", "if", "then", "elseif", "else", "end", "while", "do", "for", "in",
+    "step", "when", "onevent", "sub", "callsub", "call", "emit", "return",
+    "and", "or", "not", "abs",
+}
+
+_TOKEN_PATTERN = re.compile(r"""
+    (?P<block_comment>\#\*.*?\*\#)
+  | (?P<comment>\#[^\n]*)
+  | (?P<newline>\n)
+  | (?P<space>[ \t\r]+)
+  | (?P<number>0x[0-9a-fA-F]+|0b[01]+|\d+)
+  | (?P<name>[A-Za-z_][\w.]*)
+  | (?P<op><<=|>>=|==|!=|<=|>=|<<|>>|\+\+|--|[-+*/%|&^]=|[-+*/%<>=()\[\],:|&^~])
+""", re.VERBOSE | re.DOTALL)
+
+# Précédence des opérateurs binaires (du moins au plus prioritaire)
+_BINARY_PRECEDENCE = [
+    {"or"}, {"and"},
+    {"==", "!=", "<", "<=", ">", ">="},
+    {"|"}, {"^"}, {"&"},
+    {"<<", ">>"},
+    {"+", "-"},
+    {"*", "/", "%"},
+]
+
+_ASSIGN_OPERATORS = {"=", "+=", "-=", "*=", "/=", "%=", "|=", "&=", "^=", "<<=", ">>="}
+
+# Résultats indexés par (empreinte du code, événements supplémentaires)
+_CACHE_LIMIT = 1024
+_validation_cache: Dict[Tuple[str, Tuple[str, ...]], Tuple[str, ...]] = {}
+
+
+class _Token:
+    __slots__ = ("kind", "text", "line")
+
+    def __init__(self, kind: str, text: str, line: int):
+        self.kind = kind
+        self.text = text
+        self.line = line
+
+
+class AsebaSyntaxError(Exception):
+    """Erreur de syntaxe détectée localement."""
+
+    def __init__(self, message: str, line: int):
+        super().__init__(f"ligne {line}: {message}")
+        self.line = line
+
+
+def tokenize(code: str) -> List[_Token]:
+    """
+    Découpe un programme Aseba en jetons (commentaires et blancs exclus).
+
+    Raises:
+        AsebaSyntaxError: Caractère inattendu
+    """
+    tokens = []
+    line = 1
+    position = 0
+    while position < len(code):
+        match = _TOKEN_PATTERN.match(code, position)
+        if not match:
+            raise AsebaSyntaxError(f"caractère inattendu '{code[position]}'", line)
+        kind = match.lastgroup
+        text = match.group()
+        if kind in ("name", "number", "op"):
+            if kind == "name" and text in KEYWORDS:
+                kind = "keyword"
+            tokens.append(_Token(kind, text, line))
+        line += text.count("\n")
+        position = match.end()
+    tokens.append(_Token("eof", "", line))
+    return tokens
+
+
+class _Checker:
+    """Analyse descendante récursive et contrôle des symboles."""
+
+    def __init__(self, tokens: List[_Token], events: Set[str]):
+        self.tokens = tokens
+        self.index = 0
+        self.events = events
+        self.variables: Dict[str, Optional[int]] = dict(THYMIO_VARIABLES)
+        self.subroutines: Set[str] = set()
+        self.called_subroutines: List[Tuple[str, int]] = []
+        self.errors: List[str] = []
+        self.seen_code = False
+
+    # --- Jetons --- #
+    @property
+    def current(self) -> _Token:
+        return self.tokens[self.index]
+
+    def advance(self) -> _Token:
+        token = self.tokens[self.index]
+        if token.kind != "eof":
+            self.index += 1
+        return token
+
+    def check(self, text: str) -> bool:
+        return self.current.text == text and self.current.kind in ("keyword", "op")
+
+    def accept(self, text: str) -> bool:
+        if self.check(text):
+            self.advance()
+            return True
+        return False
+
+    def expect(self, text: str) -> _Token:
+        if not self.check(text):
+            found = self.current.text or "fin du programme"
+            raise AsebaSyntaxError(f"'{text}' attendu, '{found}' trouvé", self.current.line)
+        return self.advance()
+
+    def expect_name(self) -> _Token:
+        if self.current.kind != "name":
+            found = self.current.text or "fin du programme"
+            raise AsebaSyntaxError(f"identifiant attendu, '{found}' trouvé", self.current.line)
+        return self.advance()
+
+    def error(self, message: str, line: int):
+        self.errors.append(f"ligne {line}: {message}")
+
+    # --- Programme --- #
+    def run(self) -> List[str]:
+        try:
+            while self.current.kind != "eof":
+                self.top_level_statement()
+        except AsebaSyntaxError as e:
+            self.errors.append(str(e))
+
+        for name, line in self.called_subroutines:
+            if name not in self.subroutines:
+                self.error(f"sous-programme inconnu '{name}'", line)
+        return self.errors
+
+    def top_level_statement(self):
+        token = self.current
+        if self.accept("var"):
+            if self.seen_code:
+                self.error("les déclarations 'var' doivent précéder le code", token.line)
+            self.declaration(token.line)
+        elif self.accept("onevent"):
+            name = self.expect_name()
+            if name.text not in THYMIO_EVENTS and name.text not in self.events:
+                self.error(f"événement inconnu '{name.text}'", name.line)
+            self.seen_code = True
+        elif self.accept("sub"):
+            name = self.expect_name()
+            if name.text in self.subroutines:
+                self.error(f"sous-programme '{name.text}' déjà défini", name.line)
+            self.subroutines.add(name.text)
+            self.seen_code = True
+        else:
+            self.statement()
+            self.seen_code = True
+
+    def declaration(self, line: int):
+        name = self.expect_name()
+        if name.text in self.variables:
+            self.error(f"variable '{name.text}' déjà définie", name.line)
+
+        size: Optional[int] = 1
+        if self.accept("["):
+            if self.check("]"):
+                size = None  # taille déduite de l'initialisation
+            else:
+                size_token = self.advance()
+                if size_token.kind != "number":
+                    raise AsebaSyntaxError("taille de tableau constante attendue", size_token.line)
+                size = int(size_token.text, 0)
+            self.expect("]")
+
+        if self.accept("="):
+            length = self.expression()
+            if size is None:
+                size = length
+            elif length is not None and length != size:
+                self.error(f"taille incompatible pour '{name.text}' ({length} au lieu de {size})", line)
+        elif size is None:
+            self.error(f"taille de '{name.text}' inconnue", line)
+
+        self.variables[name.text] = size
+
+    # --- Instructions --- #
+    def block(self, terminators: Iterable[str]):
+        terminators = set(terminators)
+        while not any(self.check(word) for word in terminators):
+            if self.current.kind == "eof":
+                raise AsebaSyntaxError(f"'{'/'.join(sorted(terminators))}' manquant", self.current.line)
+            if self.check("onevent") or self.check("sub") or self.check("var"):
+                raise AsebaSyntaxError(f"'{self.current.text}' interdit dans un bloc", self.current.line)
+            self.statement()
+
+    def statement(self):
+        token = self.current
+
+        if self.accept("if"):
+            self.expression()
+            self.expect("then")
+            self.block({"elseif", "else", "end"})
+            while self.accept("elseif"):
+                self.expression()
+                self.expect("then")
+                self.block({"elseif", "else", "end"})
+            if self.accept("else"):
+                self.block({"end"})
+            self.expect("end")
+        elif self.accept("while") or self.accept("when"):
+            self.expression()
+            self.expect("do")
+            self.block({"end"})
+            self.expect("end")
+        elif self.accept("for"):
+            self.lvalue()
+            self.expect("in")
+            self.expression()
+            self.expect(":")
+            self.expression()
+            if self.accept("step"):
+                self.expression()
+            self.expect("do")
+            self.block({"end"})
+            self.expect("end")
+        elif self.accept("call"):
+            self.native_call()
+        elif self.accept("callsub"):
+            name = self.expect_name()
+            self.called_subroutines.append((name.text, name.line))
+        elif self.accept("emit"):
+            name = self.expect_name()
+            if name.text not in self.events:
+                self.error(f"événement inconnu '{name.text}'", name.line)
+            if self.starts_expression():
+                self.expression()
+        elif self.accept("return"):
+            pass
+        elif token.kind == "name":
+            size = self.lvalue()
+            if self.accept("++") or self.accept("--"):
+                return
+            operator = self.current
+            if operator.text not in _ASSIGN_OPERATORS:
+                raise AsebaSyntaxError(f"affectation attendue après '{token.text}'", operator.line)
+            self.advance()
+            length = self.expression()
+            if size is not None and length is not None and length != size and length != 1:
+                self.error(f"taille incompatible pour '{token.text}' ({length} au lieu de {size})",
+                           token.line)
+        else:
+            found = token.text or "fin du programme"
+            raise AsebaSyntaxError(f"instruction inattendue '{found}'", token.line)
+
+    def native_call(self):
+        name = self.expect_name()
+        arity = THYMIO_FUNCTIONS.get(name.text)
+        if arity is None:
+            self.error(f"fonction native inconnue '{name.text}'", name.line)
+
+        self.expect("(")
+        count = 0
+        if not self.check(")"):
+            self.expression()
+            count = 1
+            while self.accept(","):
+                self.expression()
+                count += 1
+        self.expect(")")
+
+        if arity is not None and count != arity:
+            self.error(f"'{name.text}' attend {arity} argument(s), {count} fourni(s)", name.line)
+
+    def lvalue(self) -> Optional[int]:
+        """Variable éventuellement indexée ; retourne la taille désignée."""
+        name = self.expect_name()
+        if name.text not in self.variables:
+            self.error(f"variable inconnue '{name.text}'", name.line)
+            size = None
+        else:
+            size = self.variables[name.text]
+
+        if self.accept("["):
+            start = self.current
+            self.expression()
+            if self.accept(":"):
+                end = self.current
+                self.expression()
+                self.expect("]")
+                if start.kind == "number" and end.kind == "number":
+                    low, high = int(start.text, 0), int(end.text, 0)
+                    if size is not None and not (0 <= low <= high < size):
+                        self.error(f"plage [{low}:{high}] hors de '{name.text}'", name.line)
+                    return high - low + 1
+                return None
+            self.expect("]")
+            if start.kind == "number" and size is not None:
+                index = int(start.text, 0)
+                if size == 1 and THYMIO_VARIABLES.get(name.text) == 1:
+                    self.error(f"'{name.text}' n'est pas un tableau", name.line)
+                elif index >= size:
+                    self.error(f"indice {index} hors de '{name.text}' (taille {size})", name.line)
+            return 1
+        return size
+
+    # --- Expressions --- #
+    def starts_expression(self) -> bool:
+        token = self.current
+        return (token.kind in ("name", "number")
+                or token.text in ("(", "[", "-", "~", "not", "abs"))
+
+    def expression(self, level: int = 0) -> Optional[int]:
+        """Analyse une expression ; retourne sa taille si elle est connue."""
+        if level == len(_BINARY_PRECEDENCE):
+            return self.unary()
+        size = self.expression(level + 1)
+        while self.current.text in _BINARY_PRECEDENCE[level] and self.current.kind in ("op", "keyword"):
+            self.advance()
+            self.expression(level + 1)
+            size = 1
+        return size
+
+    def unary(self) -> Optional[int]:
+        if self.accept("-") or self.accept("~") or self.accept("not") or self.accept("abs"):
+            self.unary()
+            return 1
+        return self.primary()
+
+    def primary(self) -> Optional[int]:
+        token = self.current
+        if token.kind == "number":
+            self.advance()
+            return 1
+        if token.kind == "name":
+            return self.lvalue()
+        if self.accept("("):
+            size = self.expression()
+            self.expect(")")
+            return size
+        if self.accept("["):
+            count = 1
+            self.expression()
+            while self.accept(","):
+                self.expression()
+                count += 1
+            self.expect("]")
+            return count
+        found = token.text or "fin du programme"
+        raise AsebaSyntaxError(f"expression attendue, '{found}' trouvé", token.line)
+
+
+def validate_aseba(code: str, events: Iterable[str] = ()) -> List[str]:
+    """
+    Vérifie un programme Aseba destiné au Thymio.
+
+    Les résultats sont mis en cache par empreinte du code.
+
+    Args:
+        code (str): Programme Aseba
+        events (Iterable[str]): Événements globaux déclarés en plus des
+            événements du Thymio (ex. ceux du programme résident)
+
+    Returns:
+        List[str]: Erreurs détectées (liste vide si le programme est valide)
+    """
+    events = tuple(sorted(set(events)))
+    key = (code_hash(code), events)
+
+    if key not in _validation_cache:
+        if len(_validation_cache) >= _CACHE_LIMIT:
+            _validation_cache.clear()
+        try:
+            errors = _Checker(tokenize(code), set(events)).run()
+        except AsebaSyntaxError as e:
+            errors = [str(e)]
+        _validation_cache[key] = tuple(errors)
+
+    return list(_validation_cache[key])
@@ -0,0 +1,232 @@
+"""
+File d'envoi des commandes vers un nœud Thymio.
+
+La voix, les boutons de l'interface et les commandes personnalisées peuvent
+appeler execute_code en même temps depuis des threads et des boucles
+différents. Plutôt que de rejouer tout l'historique sur le lien TDM, la file
+fusionne les commandes en attente : une consigne de mouvement remplace la
+consigne de mouvement précédente et une commande identique n'est envoyée
+qu'une fois. Le robot reflète ainsi la dernière intention de l'utilisateur.
+"""
+
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+try:
+    from .aseba_parser import code_hash, parse_constant_assignments
+except ImportError:
+    from aseba_parser import code_hash, parse_constant_assignments
+
+# Variables dont l'écriture constitue une consigne de mouvement
+MOTION_VARIABLES = {"motor.left.target", "motor.right.target"}
+
+
+def is_motion_command(code: str) -> bool:
+    """Indique si un programme se limite à des consignes moteurs constantes."""
+    values = parse_constant_assignments(code)
+    return values is not None and set(values) <= MOTION_VARIABLES
+
+
+class _Entry:
+    """Commande en attente et appelants qui attendent son résultat."""
+
+    def __init__(self, code: str):
+        self.code = code
+        self.key = code_hash(code)
+        self.is_motion = is_motion_command(code)
+        self.waiters: List[Future] = [Future()]
+
+    def absorb(self, other: "_Entry"):
+        """Reprend les appelants d'une commande remplacée."""
+        self.waiters.extend(other.waiters)
+
+    def resolve(self, result: bool):
+        for waiter in self.waiters:
+            if not waiter.done():
+                waiter.set_result(result)
+
+    def fail(self, error: BaseException):
+        for waiter in self.waiters:
+            if not waiter.done():
+                waiter.set_exception(error)
+
+
+class CommandQueue:
+    """
+    File d'attente à fusion pour un nœud (la commande la plus récente gagne).
+
+    Le premier appelant qui trouve la file inactive l'exécute jusqu'à ce
+    qu'elle soit vide ; les autres attendent simplement le résultat de leur
+    commande, quelle que soit leur boucle asyncio.
+    """
+
+    def __init__(self, execute: Callable[[str], Awaitable[bool]], max_depth: int = 8):
+        """
+        Args:
+            execute: Coroutine qui transmet un programme au nœud
+            max_depth (int): Nombre maximal de commandes en attente
+        """
+        self._execute = execute
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+        self._pending: Deque[_Entry] = deque()
+        self._draining = False
+        
+        # Exécution en cours (boucle, tâche), annulable depuis un autre thread
+        self._inflight: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Task]] = None
+        # Tâche qui a repris le vidage après l'annulation d'un appelant
+        self._successor: Optional[asyncio.Task] = None
+
+        self.stats = {
+            'submitted': 0,   # commandes reçues
+            'executed': 0,    # commandes transmises au robot
+            'merged': 0,      # commandes remplacées par une plus récente
+            'dropped': 0,     # commandes abandonnées (file pleine ou annulée)
+            'preempted': 0,   # exécutions interrompues par une commande prioritaire
+        }
+
+    async def submit(self, code: str) -> bool:
+        """
+        Ajoute une commande et attend qu'elle (ou celle qui l'a remplacée)
+        soit transmise.
+
+        Args:
+            code (str): Programme Aseba
+
+        Returns:
+            bool: Résultat de l'exécution, False si la commande a été abandonnée
+        """
+        entry = _Entry(code)
+        waiter = entry.waiters[0]
+
+        with self._lock:
+            self.stats['submitted'] += 1
+            self._enqueue(entry)
+            should_drain = not self._draining
+            self._draining = True
+
+        if should_drain:
+            await self._drain()
+
+        return await asyncio.wrap_future(waiter)
+
+    def _enqueue(self, entry: _Entry):
+        """Insère une commande en fusionnant celles qu'elle rend obsolètes."""
+        for pending in list(self._pending):
+            if pending.key == entry.key or (entry.is_motion and pending.is_motion):
+                self._pending.remove(pending)
+                entry.absorb(pending)
+                self.stats['merged'] += 1
+
+        while len(self._pending) >= self.max_depth:
+            self._pending.popleft().resolve(False)
+            self.stats['dropped'] += 1
+
+        self._pending.append(entry)
+
+    async def _drain(self):
+        """Exécute les commandes en attente jusqu'à ce que la file soit vide."""
+        entry = None
+        try:
+            while True:
+                with self._lock:
+                    if not self._pending:
+                        self._draining = False
+                        return
+                    entry = self._pending.popleft()
+
+                # Tâche séparée : une commande prioritaire peut l'annuler
+                # sans interrompre l'appelant qui vide la file
+                task = asyncio.ensure_future(self._execute(entry.code))
+                with self._lock:
+                    self._inflight = (asyncio.get_running_loop(), task)
+                try:
+                    await asyncio.wait({task})
+                finally:
+                    with self._lock:
+                        self._inflight = None
+                    if not task.done():
+                        task.cancel()
+
+                if task.cancelled():
+                    entry.resolve(False)
+                elif task.exception() is not None:
+                    entry.fail(task.exception())
+                else:
+                    entry.resolve(task.result())
+                    self.stats['executed'] += 1
+                entry = None
+        finally:
+            # Sortie anormale (annulation de l'appelant, par exemple un délai
+            # dépassé) : seule la commande en cours est perdue, les commandes
+            # des autres appelants sont confiées à une nouvelle tâche
+            if entry is not None:
+                entry.resolve(False)
+            with self._lock:
+                if self._draining:
+                    self._draining = self._hand_off()
+
+    def _hand_off(self) -> bool:
+        """
+        Relance le vidage de la file dans une tâche indépendante
+        (appelé avec le verrou).
+
+        Returns:
+            bool: True si une tâche a repris le vidage ; sinon la prochaine
+                soumission le relancera
+        """
+        if not self._pending:
+            return False
+        try:
+            self._successor = asyncio.get_running_loop().create_task(self._drain())
+        except RuntimeError:
+            return False
+        return True
+
+    def clear(self) -> int:
+        """
+        Abandonne toutes les commandes en attente.
+
+        Returns:
+            int: Nombre de commandes abandonnées
+        """
+        with self._lock:
+            count = len(self._pending)
+            while self._pending:
+                self._pending.popleft().resolve(False)
+            self.stats['dropped'] += count
+        return count
+
+    def cancel_inflight(self) -> bool:
+        """
+        Interrompt la commande en cours de transmission, depuis n'importe
+        quel thread. L'appelant de cette commande reçoit False.
+
+        Returns:
+            bool: True si une exécution a été interrompue
+        """
+        with self._lock:
+            inflight = self._inflight
+            if inflight is None:
+                return False
+            self.stats['preempted'] += 1
+
+        loop, task = inflight
+        try:
+            loop.call_soon_threadsafe(task.cancel)
+        except RuntimeError:
+            # Boucle déjà fermée : rien à interrompre
+            return False
+        return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Retourne les compteurs de la file."""
+        with self._lock:
+            return dict(self.stats, pending=len(self._pending))
@@ -0,0 +1,215 @@
+"""
+Stockage des commandes (commands.json) journalisé et atomique.
+
+Chaque modification est ajoutée en fin de journal (JSON Lines) : une ligne
+par ajout ou suppression, quelle que soit la taille du catalogue. Quand le
+journal dépasse une taille donnée, il est fusionné dans l'instantané
+commands.json, réécrit de façon atomique (fichier temporaire, fsync puis
+os.replace). Un arrêt brutal laisse donc soit l'ancien instantané, soit le
+nouveau, et au pire une dernière ligne de journal tronquée, ignorée à la
+relecture.
+
+Les écrivains concurrents (interface, ligne de commande) sont sérialisés
+par un verrou de fichier (fcntl sous Linux/macOS, msvcrt sous Windows).
+"""
+
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    # Windows
+    import msvcrt
+    FCNTL_AVAILABLE = False
+
+DEFAULT_COMMANDS_PATH = Path(__file__).parent.parent / "commands.json"
+
+
+@contextmanager
+def file_lock(path: Path):
+    """Verrou exclusif inter-processus sur un fichier dédié."""
+    with open(path, 'a+') as handle:
+        if FCNTL_AVAILABLE:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK abandonne après 10 s : réessayer
+                    time.sleep(0.05)
+        try:
+            yield
+        finally:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class CommandStore:
+    """Catalogue de commandes : instantané JSON + journal des modifications."""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_COMMANDS_PATH,
+                 compact_bytes: int = 64 * 1024):
+        """
+        Args:
+            path (Union[str, Path]): Instantané (commands.json)
+            compact_bytes (int): Taille du journal déclenchant une compaction
+        """
+        self.path = Path(path)
+        self.journal_path = self.path.with_name(self.path.stem + ".journal.jsonl")
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.compact_bytes = compact_bytes
+
+        self.stats = {'writes': 0, 'compactions': 0, 'skipped_lines': 0}
+
+    # Lecture
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Lit le catalogue complet (instantané + journal).
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Identifiant -> définition de la commande
+        """
+        with file_lock(self.lock_path):
+            return self._load_locked()
+
+    def _load_locked(self) -> Dict[str, Dict[str, Any]]:
+        commands: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                commands = json.load(f)
+
+        if self.journal_path.exists():
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line_number, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Ligne tronquée par un arrêt brutal pendant l'écriture
+                        self.stats['skipped_lines'] += 1
+                        print(f"⚠️ Journal des commandes: ligne {line_number} illisible, ignorée")
+                        continue
+                    self._apply(commands, entry)
+
+        return commands
+
+    @staticmethod
+    def _apply(commands: Dict[str, Dict[str, Any]], entry: Dict[str, Any]):
+        """Rejoue une modification (opérations idempotentes)."""
+        if entry.get("op") == "put":
+            commands[entry["id"]] = entry["value"]
+        elif entry.get("op") == "delete":
+            commands.pop(entry["id"], None)
+
+    def get(self, command_id: str) -> Optional[Dict[str, Any]]:
+        """Retourne la définition d'une commande ou None."""
+        return self.load().get(command_id)
+
+    # Écriture
+
+    def put(self, command_id: str, value: Dict[str, Any]):
+        """
+        Ajoute ou remplace une commande (une ligne de journal).
+
+        Args:
+            command_id (str): Identifiant de la commande
+            value (Dict[str, Any]): Définition (description, code...)
+        """
+        self._append({"op": "put", "id": command_id, "value": value})
+
+    def delete(self, command_id: str):
+        """
+        Supprime une commande (une ligne de journal).
+
+        Args:
+            command_id (str): Identifiant de la commande
+        """
+        self._append({"op": "delete", "id": command_id})
+
+    def _append(self, entry: Dict[str, Any]):
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with file_lock(self.lock_path):
+            # Isoler une éventuelle ligne tronquée pour ne pas perdre celle-ci
+            if not self._journal_ends_cleanly():
+                line = "\n" + line
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self.stats['writes'] += 1
+
+            if self.journal_path.stat().st_size >= self.compact_bytes:
+                self._compact_locked()
+
+    def _journal_ends_cleanly(self) -> bool:
+        """Indique si le journal est vide ou se termine par un saut de ligne."""
+        try:
+            with open(self.journal_path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return True
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) == b"\n"
+        except FileNotFoundError:
+            return True
+
+    def compact(self):
+        """Fusionne le journal dans l'instantané et vide le journal."""
+        with file_lock(self.lock_path):
+            self._compact_locked()
+
+    def _compact_locked(self):
+        commands = self._load_locked()
+
+        # Écriture atomique : fichier temporaire dans le même répertoire,
+        # fsync, puis remplacement
+        fd, temp_path = tempfile.mkstemp(prefix=self.path.name + ".", suffix=".tmp",
+                                         dir=str(self.path.parent))
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(commands, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self._fsync_directory()
+
+        # L'instantané contient tout : le journal peut être vidé. Un arrêt
+        # entre les deux étapes ne fait que rejouer des opérations idempotentes
+        with open(self.journal_path, 'w', encoding='utf-8') as f:
+            f.flush()
+            os.fsync(f.fileno())
+        self.stats['compactions'] += 1
+
+    def _fsync_directory(self):
+        """Rend le renommage durable (sans effet sous Windows)."""
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        fd = os.open(str(self.path.parent), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Retourne les compteurs du stockage et la taille du journal."""
+        size = self.journal_path.stat().st_size if self.journal_path.exists() else 0
+        return dict(self.stats, journal_bytes=size)
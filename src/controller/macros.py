@@ -0,0 +1,134 @@
+"""
+Macros : séquences temporisées exécutées de manière autonome par le Thymio.
+
+Une macro est une suite d'étapes (code Aseba ou commande connue, suivie
+d'une durée). Elle est compilée en un seul programme Aseba cadencé par
+timer.period[0] et onevent timer0 : le programme est téléversé une fois et
+le robot enchaîne les étapes sans aller-retour avec l'ordinateur.
+
+Exemple d'entrée dans commands.json :
+
+    "avancer_puis_droite": {
+      "description": "avance 2 secondes puis tourne à droite",
+      "macro": [
+        {"command": "avancer", "duration_ms": 2000},
+        {"command": "tourner_droite", "duration_ms": 1000}
+      ]
+    }
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from .aseba_parser import split_statements
+except ImportError:
+    from aseba_parser import split_statements
+
+# timer.period est un entier 16 bits signé (millisecondes)
+MAX_STEP_DURATION_MS = 32767
+
+# Variable du programme qui mémorise l'étape en cours
+STEP_VARIABLE = "macro_step"
+
+STOP_CODE = "motor.left.target = 0\nmotor.right.target = 0"
+
+
+def _step_code(step: Dict[str, Any], commands: Dict[str, str]) -> str:
+    """Code Aseba d'une étape (code direct ou commande référencée)."""
+    if "code" in step:
+        code = step["code"]
+    elif "command" in step:
+        name = step["command"]
+        if name not in commands:
+            raise ValueError(f"Commande inconnue dans la macro: {name}")
+        code = commands[name]
+    else:
+        raise ValueError(f"Étape de macro sans 'code' ni 'command': {step}")
+
+    statements = split_statements(code)
+    if any(statement.startswith(("onevent", "var ", "sub ")) for statement in statements):
+        raise ValueError("Une étape de macro ne peut contenir ni onevent, ni var, ni sub")
+    return "\n".join(statements)
+
+
+def _segments(steps: List[Dict[str, Any]], commands: Dict[str, str],
+              stop_at_end: bool) -> List[Tuple[List[str], int]]:
+    """
+    Regroupe les étapes en segments (codes, durée) : les étapes sans durée
+    sont exécutées immédiatement avec les suivantes.
+    """
+    segments = []
+    pending: List[str] = []
+
+    for step in steps:
+        duration = int(step.get("duration_ms", 0))
+        if duration < 0 or duration > MAX_STEP_DURATION_MS:
+            raise ValueError(
+                f"Durée d'étape invalide ({duration} ms) : "
+                f"entre 0 et {MAX_STEP_DURATION_MS} ms"
+            )
+        code = _step_code(step, commands)
+        if code:
+            pending.append(code)
+        if duration > 0:
+            segments.append((pending, duration))
+            pending = []
+
+    if stop_at_end and segments and not pending:
+        # Dernière étape temporisée : arrêt des moteurs à son expiration
+        pending.append(STOP_CODE)
+    if pending or not segments:
+        segments.append((pending, 0))
+
+    return segments
+
+
+def _indent(codes: List[str], level: int) -> List[str]:
+    prefix = "    " * level
+    return [f"{prefix}{line}" for code in codes for line in code.splitlines()]
+
+
+def compile_macro(steps: List[Dict[str, Any]], commands: Optional[Dict[str, str]] = None,
+                  stop_at_end: bool = True) -> str:
+    """
+    Compile une séquence temporisée en un programme Aseba autonome.
+
+    Args:
+        steps (List[Dict[str, Any]]): Étapes {"code" | "command", "duration_ms"}
+        commands (Optional[Dict[str, str]]): Commandes référencées (nom -> code)
+        stop_at_end (bool): Arrête les moteurs à la fin de la dernière étape
+            temporisée
+
+    Returns:
+        str: Programme Aseba
+
+    Raises:
+        ValueError: Étape invalide ou durée hors de la plage de timer.period
+    """
+    if not steps:
+        raise ValueError("Macro vide")
+
+    segments = _segments(steps, commands or {}, stop_at_end)
+
+    first_codes, first_duration = segments[0]
+    lines = [f"var {STEP_VARIABLE} = 1", ""]
+    lines.extend(_indent(first_codes, 0))
+    lines.append(f"timer.period[0] = {first_duration}")
+
+    if len(segments) > 1:
+        lines.append("")
+        lines.append("onevent timer0")
+        for index, (codes, duration) in enumerate(segments[1:], start=1):
+            keyword = "if" if index == 1 else "elseif"
+            lines.append(f"    {keyword} {STEP_VARIABLE} == {index} then")
+            lines.extend(_indent(codes, 2))
+            lines.append(f"        timer.period[0] = {duration}")
+            lines.append(f"        {STEP_VARIABLE} = {index + 1}")
+        lines.append("    end")
+
+    return "\n".join(lines) + "\n"
+
+
+def macro_duration_ms(steps: List[Dict[str, Any]]) -> int:
+    """Durée totale d'une macro en millisecondes."""
+    return sum(int(step.get("duration_ms", 0)) for step in steps)
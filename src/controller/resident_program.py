@@ -0,0 +1,118 @@
+"""
+Programme Aseba résident pour le robot Thymio.
+
+Le programme est téléversé une seule fois à la connexion. Les commandes
+connues sont ensuite transmises sous forme d'événements (send_events) au lieu
+d'être recompilées et relancées à chaque fois.
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+try:
+    from .aseba_parser import split_statements
+except ImportError:
+    from aseba_parser import split_statements
+
+# Événements gérés par le programme résident : (nom, nombre d'arguments)
+RESIDENT_EVENTS = [
+    ("set_motors", 2),
+    ("set_leds_top", 3),
+    ("play_sound", 2),
+    ("run_macro", 1),
+]
+
+# Macros embarquées, appelées par leur index via l'événement run_macro
+DEFAULT_MACROS = [
+    # 0 : arrêt complet (moteurs et LEDs)
+    "motor.left.target = 0\nmotor.right.target = 0\ncall leds.top(0, 0, 0)",
+]
+
+_INT = r"(-?\d+)"
+_MOTOR_PATTERN = re.compile(rf"^motor\.(left|right)\.target\s*=\s*{_INT}$")
+_LEDS_PATTERN = re.compile(rf"^call\s+leds\.top\(\s*{_INT}\s*,\s*{_INT}\s*,\s*{_INT}\s*\)$")
+_SOUND_PATTERN = re.compile(rf"^call\s+sound\.freq\(\s*{_INT}\s*,\s*{_INT}\s*\)$")
+
+
+def build_resident_program(macros: Optional[List[str]] = None) -> str:
+    """
+    Génère le source Aseba du programme résident.
+
+    Args:
+        macros (Optional[List[str]]): Corps des macros, indexés à partir de 0
+
+    Returns:
+        str: Programme Aseba
+    """
+    macros = DEFAULT_MACROS if macros is None else macros
+
+    lines = [
+        "onevent set_motors",
+        "    motor.left.target = event.args[0]",
+        "    motor.right.target = event.args[1]",
+        "",
+        "onevent set_leds_top",
+        "    call leds.top(event.args[0], event.args[1], event.args[2])",
+        "",
+        "onevent play_sound",
+        "    call sound.freq(event.args[0], event.args[1])",
+        "",
+        "onevent run_macro",
+    ]
+    for index, body in enumerate(macros):
+        lines.append(f"    if event.args[0] == {index} then")
+        lines.extend(f"        {statement}" for statement in split_statements(body))
+        lines.append("    end")
+
+    return "\n".join(lines) + "\n"
+
+
+def match_resident_event(code: str,
+                         macros: Optional[List[str]] = None) -> Optional[Tuple[str, List[int]]]:
+    """
+    Cherche l'événement résident équivalent à un programme.
+
+    Seuls les programmes très simples sont reconnus (consignes moteurs,
+    couleur des LEDs du dessus, son, macro connue) ; tout le reste doit
+    passer par la compilation.
+
+    Args:
+        code (str): Programme Aseba
+        macros (Optional[List[str]]): Macros du programme résident
+
+    Returns:
+        Optional[Tuple[str, List[int]]]: (événement, arguments) ou None
+    """
+    macros = DEFAULT_MACROS if macros is None else macros
+    statements = split_statements(code)
+
+    if not statements:
+        return None
+
+    # Macro embarquée
+    for index, body in enumerate(macros):
+        if statements == split_statements(body):
+            return "run_macro", [index]
+
+    # Consignes moteurs gauche + droite
+    if len(statements) == 2:
+        targets = {}
+        for statement in statements:
+            match = _MOTOR_PATTERN.match(statement)
+            if not match:
+                break
+            targets[match.group(1)] = int(match.group(2))
+        else:
+            if set(targets) == {"left", "right"}:
+                return "set_motors", [targets["left"], targets["right"]]
+
+    if len(statements) == 1:
+        match = _LEDS_PATTERN.match(statements[0])
+        if match:
+            return "set_leds_top", [int(value) for value in match.groups()]
+
+        match = _SOUND_PATTERN.match(statements[0])
+        if match:
+            return "play_sound", [int(value) for value in match.groups()]
+
+    return None
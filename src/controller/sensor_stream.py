@@ -0,0 +1,236 @@
+"""
+Flux des capteurs du robot Thymio.
+
+Les variables surveillées (prox.horizontal, prox.ground, acc, vitesses des
+moteurs...) sont reçues par notification du TDM et rangées dans des tampons
+circulaires NumPy préalloués et horodatés. Les consommateurs lisent les
+dernières valeurs sans copie ; un enregistreur optionnel écrit chaque
+variable en colonnes binaires sur disque.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+# Variables capteurs du Thymio : nom -> taille
+SENSOR_VARIABLES = {
+    "prox.horizontal": 7,
+    "prox.ground.ambiant": 2,
+    "prox.ground.reflected": 2,
+    "prox.ground.delta": 2,
+    "acc": 3,
+    "motor.left.speed": 1,
+    "motor.right.speed": 1,
+    "motor.left.target": 1,
+    "motor.right.target": 1,
+    "mic.intensity": 1,
+    "temperature": 1,
+    "button.center": 1,
+    "button.forward": 1,
+    "button.backward": 1,
+    "button.left": 1,
+    "button.right": 1,
+}
+
+SensorCallback = Callable[[str, np.ndarray, float], None]
+
+
+class RingBuffer:
+    """
+    Tampon circulaire horodaté à lecture sans copie.
+
+    Chaque échantillon est écrit deux fois (positions i et i + capacité) :
+    toute fenêtre des `capacity` derniers échantillons est donc contiguë en
+    mémoire et peut être rendue sous forme de vue NumPy.
+
+    Les vues reflètent le tampon : elles sont écrasées par les échantillons
+    suivants. Copier le résultat pour le conserver.
+    """
+
+    def __init__(self, capacity: int, width: int, dtype=np.float32):
+        """
+        Args:
+            capacity (int): Nombre d'échantillons conservés
+            width (int): Nombre de valeurs par échantillon
+            dtype: Type NumPy des valeurs
+        """
+        self.capacity = capacity
+        self.width = width
+        self._values = np.zeros((2 * capacity, width), dtype=dtype)
+        self._timestamps = np.zeros(2 * capacity, dtype=np.float64)
+        self._count = 0
+
+    def append(self, values, timestamp: float):
+        """Ajoute un échantillon (écrase le plus ancien si le tampon est plein)."""
+        index = self._count % self.capacity
+        self._values[index] = values
+        self._values[index + self.capacity] = values
+        self._timestamps[index] = timestamp
+        self._timestamps[index + self.capacity] = timestamp
+        self._count += 1
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    @property
+    def total(self) -> int:
+        """Nombre d'échantillons reçus depuis la création."""
+        return self._count
+
+    def window(self, n: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Retourne les n derniers échantillons, du plus ancien au plus récent.
+
+        Args:
+            n (Optional[int]): Nombre d'échantillons (défaut : tous)
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (horodatages, valeurs), vues sans copie
+        """
+        available = len(self)
+        n = available if n is None else min(n, available)
+        end = self._count % self.capacity + self.capacity
+        return self._timestamps[end - n:end], self._values[end - n:end]
+
+    def latest(self) -> Optional[Tuple[float, np.ndarray]]:
+        """Retourne le dernier échantillon (horodatage, valeurs) ou None."""
+        if self._count == 0:
+            return None
+        index = (self._count - 1) % self.capacity
+        return self._timestamps[index], self._values[index]
+
+
+class ColumnarRecorder:
+    """
+    Enregistre les échantillons en colonnes binaires, une paire de fichiers
+    par variable : <nom>.f32 (valeurs float32) et <nom>.ts (float64).
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        """
+        Args:
+            directory (Union[str, Path]): Répertoire de l'enregistrement
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._files: Dict[str, Tuple] = {}
+        self._widths: Dict[str, int] = {}
+
+    def write(self, name: str, values: np.ndarray, timestamp: float):
+        """Ajoute un échantillon de la variable."""
+        files = self._files.get(name)
+        if files is None:
+            files = (open(self.directory / f"{name}.f32", 'ab'),
+                     open(self.directory / f"{name}.ts", 'ab'))
+            self._files[name] = files
+            self._widths[name] = int(values.size)
+            self._write_meta()
+        np.asarray(values, dtype=np.float32).tofile(files[0])
+        np.float64(timestamp).tofile(files[1])
+
+    def _write_meta(self):
+        """Décrit la largeur de chaque variable (nécessaire à la relecture)."""
+        with open(self.directory / "meta.json", 'w', encoding='utf-8') as f:
+            json.dump({'variables': self._widths}, f, indent=2)
+
+    def close(self):
+        """Ferme les fichiers de l'enregistrement."""
+        for values_file, ts_file in self._files.values():
+            values_file.close()
+            ts_file.close()
+        self._files.clear()
+
+    @staticmethod
+    def load(directory: Union[str, Path]) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Relit un enregistrement.
+
+        Args:
+            directory (Union[str, Path]): Répertoire de l'enregistrement
+
+        Returns:
+            Dict[str, Tuple[np.ndarray, np.ndarray]]: nom -> (horodatages, valeurs)
+        """
+        directory = Path(directory)
+        with open(directory / "meta.json", 'r', encoding='utf-8') as f:
+            widths = json.load(f)['variables']
+
+        data = {}
+        for name, width in widths.items():
+            timestamps = np.fromfile(directory / f"{name}.ts", dtype=np.float64)
+            values = np.fromfile(directory / f"{name}.f32", dtype=np.float32).reshape(-1, width)
+            count = min(len(timestamps), len(values))
+            data[name] = (timestamps[:count], values[:count])
+        return data
+
+
+class SensorStream:
+    """Réception des variables d'un nœud dans des tampons circulaires."""
+
+    def __init__(self, variables: Iterable[str], capacity: int = 1024,
+                 recorder: Optional[ColumnarRecorder] = None):
+        """
+        Args:
+            variables (Iterable[str]): Variables à conserver
+            capacity (int): Échantillons conservés par variable
+            recorder (Optional[ColumnarRecorder]): Enregistrement sur disque
+        """
+        self.variables = list(variables)
+        self.capacity = capacity
+        self.recorder = recorder
+        self.callbacks: List[SensorCallback] = []
+        self.node_id: Optional[str] = None
+
+        # Tampons préalloués pour les variables de taille connue, les autres
+        # sont créés au premier échantillon
+        self.buffers: Dict[str, RingBuffer] = {
+            name: RingBuffer(capacity, SENSOR_VARIABLES[name])
+            for name in self.variables if name in SENSOR_VARIABLES
+        }
+
+    def on_variables_changed(self, node, variables: Dict[str, List[int]]):
+        """Écouteur tdmclient : range les variables suivies reçues."""
+        timestamp = time.monotonic()
+        for name in self.variables:
+            values = variables.get(name)
+            if values is None:
+                continue
+
+            buffer = self.buffers.get(name)
+            if buffer is None:
+                buffer = RingBuffer(self.capacity, len(values))
+                self.buffers[name] = buffer
+            buffer.append(values, timestamp)
+
+            _, row = buffer.latest()
+            if self.recorder is not None:
+                self.recorder.write(name, row, timestamp)
+            for callback in self.callbacks:
+                try:
+                    callback(name, row, timestamp)
+                except Exception as e:
+                    print(f"⚠️ Erreur dans un abonné capteur ({name}): {e}")
+
+    def add_callback(self, callback: SensorCallback):
+        """Appelle callback(nom, valeurs, horodatage) à chaque échantillon."""
+        self.callbacks.append(callback)
+
+    def latest(self, name: str) -> Optional[Tuple[float, np.ndarray]]:
+        """Dernier échantillon d'une variable (vue sans copie) ou None."""
+        buffer = self.buffers.get(name)
+        return buffer.latest() if buffer else None
+
+    def window(self, name: str, n: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Derniers échantillons d'une variable (vues sans copie)."""
+        buffer = self.buffers.get(name)
+        if buffer is None:
+            return np.empty(0, dtype=np.float64), np.empty((0, 0), dtype=np.float32)
+        return buffer.window(n)
+
+    def close(self):
+        """Termine l'enregistrement éventuel."""
+        if self.recorder is not None:
+            self.recorder.close()
@@ -0,0 +1,397 @@
+"""
+Thymio simulé pour les essais et mesures sans robot ni Thymio Suite.
+
+SimulatedClientAsync imite la partie de tdmclient.ClientAsync utilisée par
+ThymioController (découverte, verrouillage, compile/run, set_variables,
+send_events, notifications de variables). Les nœuds simulés appliquent les
+consignes moteurs à un modèle cinématique simple, et la liaison peut
+ajouter une latence et des pannes configurables.
+
+Utilisation :
+
+    controller = ThymioController(client_factory=SimulatedClientAsync)
+
+Le simulateur fonctionne dans le processus : il ne remplace pas un serveur
+TDM accessible par le réseau.
+"""
+
+import asyncio
+import math
+import random
+import time
+from typing import Callable, Dict, List, Optional
+
+try:
+    from .aseba_parser import parse_constant_assignments
+    from .aseba_validator import THYMIO_VARIABLES, validate_aseba
+except ImportError:
+    from aseba_parser import parse_constant_assignments
+    from aseba_validator import THYMIO_VARIABLES, validate_aseba
+
+# États des nœuds (mêmes valeurs que tdmclient.ThymioFB)
+NODE_STATUS_UNKNOWN = 0
+NODE_STATUS_CONNECTED = 1
+NODE_STATUS_AVAILABLE = 2
+NODE_STATUS_BUSY = 3
+NODE_STATUS_READY = 4
+NODE_STATUS_DISCONNECTED = 5
+
+VM_EXECUTION_STATE_COMMAND_RESET = 5
+
+# Modèle cinématique : 500 unités de consigne ≈ 20 cm/s, roues espacées de 9,5 cm
+SPEED_CM_PER_UNIT = 20.0 / 500.0
+WHEEL_BASE_CM = 9.5
+MOTOR_TIME_CONSTANT = 0.1  # s, réponse du premier ordre des moteurs
+
+VariablesListener = Callable[[object, Dict[str, List[int]]], None]
+
+
+class SimulatedLinkError(ConnectionError):
+    """Panne injectée sur la liaison simulée."""
+
+
+class SimulatedNode:
+    """Nœud Thymio simulé (interface de tdmclient.ClientAsyncCacheNode)."""
+
+    def __init__(self, client: "SimulatedClientAsync", id_str: str, name: str):
+        self.thymio = client
+        self.id_str = id_str
+        self.props = {"name": name}
+        self.status = NODE_STATUS_AVAILABLE
+        self.watch_flags = 0
+        self._listeners: List[VariablesListener] = []
+        self.reset()
+
+    def reset(self):
+        """Remet le robot dans son état initial (variables, pose, programme)."""
+        self.var: Dict[str, List[int]] = {
+            name: [0] * size for name, size in THYMIO_VARIABLES.items()
+        }
+        self.var["acc"] = [0, 0, 22]
+        self.program: Optional[str] = None
+        self.running = False
+        self.events: Dict[str, int] = {}
+        self.x = 0.0
+        self.y = 0.0
+        self.theta = 0.0
+        self._speeds = [0.0, 0.0]
+        self._last_update = time.monotonic()
+        self._changed: Dict[str, List[int]] = {}
+        self.calls = {'compile': 0, 'run': 0, 'set_variables': 0, 'send_events': 0}
+
+    # --- Liaison --- #
+    async def _link(self):
+        """Latence et panne éventuelle de la liaison."""
+        await self.thymio._link_delay()
+        if self.status == NODE_STATUS_DISCONNECTED:
+            raise SimulatedLinkError(f"Nœud {self.id_str} déconnecté")
+
+    # --- Interface tdmclient --- #
+    async def lock_node(self):
+        await self._link()
+        if self.status != NODE_STATUS_AVAILABLE:
+            return "node not available"
+        self.status = NODE_STATUS_READY
+        return None
+
+    async def unlock(self):
+        await self._link()
+        self.status = NODE_STATUS_AVAILABLE
+        return None
+
+    async def register_events(self, events):
+        await self._link()
+        self.events.update({name: size for name, size in events})
+        return None
+
+    async def compile(self, program: str):
+        await self._link()
+        self.calls['compile'] += 1
+        errors = validate_aseba(program, self.events)
+        if errors:
+            return {"error_msg": errors[0]}
+        self.program = program
+        self.running = False
+        return None
+
+    async def run(self):
+        await self._link()
+        self.calls['run'] += 1
+        if self.program is None:
+            return "no program"
+        self.running = True
+        self._execute_initial_code(self.program)
+        return None
+
+    async def stop(self):
+        await self._link()
+        self.running = False
+        return None
+
+    def set_vm_execution_state(self, state: int, request_id_notify=None):
+        if state == VM_EXECUTION_STATE_COMMAND_RESET:
+            self.running = False
+        if request_id_notify:
+            request_id_notify(None)
+
+    async def set_variables(self, variables: Dict[str, List[int]]):
+        await self._link()
+        self.calls['set_variables'] += 1
+        for name, values in variables.items():
+            self._write(name, list(values))
+        return None
+
+    async def send_events(self, events: Dict[str, List[int]]):
+        await self._link()
+        self.calls['send_events'] += 1
+        for name, args in events.items():
+            self._handle_event(name, list(args))
+        return None
+
+    async def watch(self, flags=0, variables=False, events=False, vm_state=False):
+        await self._link()
+        if variables:
+            self.watch_flags |= 1
+        return None
+
+    def add_variables_changed_listener(self, listener: VariablesListener):
+        self._listeners.append(listener)
+
+    def remove_variables_changed_listener(self, listener: VariablesListener):
+        self._listeners.remove(listener)
+
+    # --- Modèle du robot --- #
+    def _write(self, name: str, values: List[int]):
+        if name not in self.var:
+            return
+        self.var[name] = values
+        self._changed[name] = values
+
+    def _execute_initial_code(self, program: str):
+        """Exécute les affectations constantes d'un programme (modèle simplifié)."""
+        values = parse_constant_assignments(program)
+        if values:
+            for name, items in values.items():
+                self._write(name, items)
+
+    def _handle_event(self, name: str, args: List[int]):
+        """Événements du programme résident."""
+        if name == "set_motors":
+            self._write("motor.left.target", [args[0]])
+            self._write("motor.right.target", [args[1]])
+        elif name == "set_leds_top":
+            self._write("leds.top", args[:3])
+        elif name == "run_macro" and args and args[0] == 0:
+            self._write("motor.left.target", [0])
+            self._write("motor.right.target", [0])
+            self._write("leds.top", [0, 0, 0])
+
+    def advance(self, now: Optional[float] = None):
+        """Intègre la cinématique jusqu'à l'instant donné."""
+        now = time.monotonic() if now is None else now
+        dt = now - self._last_update
+        if dt <= 0:
+            return
+        self._last_update = now
+
+        # Réponse du premier ordre des moteurs vers la consigne
+        alpha = 1.0 - math.exp(-dt / MOTOR_TIME_CONSTANT)
+        targets = (self.var["motor.left.target"][0], self.var["motor.right.target"][0])
+        for side in (0, 1):
+            self._speeds[side] += alpha * (targets[side] - self._speeds[side])
+
+        left = self._speeds[0] * SPEED_CM_PER_UNIT
+        right = self._speeds[1] * SPEED_CM_PER_UNIT
+        linear = (left + right) / 2
+        self.theta += (right - left) / WHEEL_BASE_CM * dt
+        self.x += linear * math.cos(self.theta) * dt
+        self.y += linear * math.sin(self.theta) * dt
+
+        for name, speed in (("motor.left.speed", self._speeds[0]), ("motor.right.speed", self._speeds[1])):
+            value = [int(round(speed))]
+            if self.var[name] != value:
+                self._write(name, value)
+
+    @property
+    def pose(self) -> Dict[str, float]:
+        """Position (cm) et orientation (rad) du robot."""
+        self.advance()
+        return {'x': self.x, 'y': self.y, 'theta': self.theta}
+
+    def _notify(self) -> bool:
+        """Envoie les variables modifiées aux écouteurs (si surveillées)."""
+        if not self._changed:
+            return False
+        changed, self._changed = self._changed, {}
+        if not self.watch_flags:
+            return False
+        for listener in list(self._listeners):
+            listener(self, changed)
+        return True
+
+    def __repr__(self):
+        return f"SimulatedNode({self.id_str}, status={self.status})"
+
+
+class SimulatedClientAsync:
+    """Client TDM simulé (interface de tdmclient.ClientAsync)."""
+
+    NODE_STATUS_UNKNOWN = NODE_STATUS_UNKNOWN
+    NODE_STATUS_CONNECTED = NODE_STATUS_CONNECTED
+    NODE_STATUS_AVAILABLE = NODE_STATUS_AVAILABLE
+    NODE_STATUS_BUSY = NODE_STATUS_BUSY
+    NODE_STATUS_READY = NODE_STATUS_READY
+    NODE_STATUS_DISCONNECTED = NODE_STATUS_DISCONNECTED
+
+    DEFAULT_SLEEP = 0.01
+
+    def __init__(self, node_count: int = 1, latency: float = 0.0, jitter: float = 0.0,
+                 failure_rate: float = 0.0, seed: Optional[int] = None):
+        """
+        Args:
+            node_count (int): Nombre de robots simulés
+            latency (float): Latence fixe de chaque échange (s)
+            jitter (float): Variation aléatoire maximale ajoutée à la latence (s)
+            failure_rate (float): Probabilité qu'un échange échoue (0 à 1)
+            seed (Optional[int]): Graine du générateur aléatoire
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self.connected = True
+        self.nodes: List[SimulatedNode] = [
+            SimulatedNode(self, f"sim-{index}", f"thymio-sim-{index}") for index in range(node_count)
+        ]
+        self.stats = {'messages': 0, 'failures': 0}
+
+    async def _link_delay(self):
+        """Applique la latence et les pannes injectées."""
+        self.stats['messages'] += 1
+        if not self.connected:
+            raise SimulatedLinkError("TDM simulé indisponible")
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        else:
+            await asyncio.sleep(0)
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            self.stats['failures'] += 1
+            raise SimulatedLinkError("Panne injectée sur la liaison")
+
+    # --- Interface tdmclient --- #
+    def first_node(self, node_id: Optional[str] = None, node_name: Optional[str] = None):
+        for node in self.nodes:
+            if ((node_id is None or node.id_str == node_id) and
+                    (node_name is None or node.props["name"] == node_name)):
+                return node
+        return None
+
+    async def wait_for_status(self, expected_status: int, **kwargs):
+        while True:
+            node = self.first_node(**kwargs)
+            if node is not None and node.status == expected_status:
+                return
+            await asyncio.sleep(self.DEFAULT_SLEEP)
+
+    async def sleep(self, duration: float = -1, wake=None):
+        start = time.monotonic()
+        while duration < 0 or time.monotonic() < start + duration:
+            self.process_waiting_messages()
+            if wake is not None and wake():
+                break
+            await asyncio.sleep(self.DEFAULT_SLEEP)
+
+    async def send_msg_and_get_result(self, send_fun):
+        result = None
+
+        def notify(value):
+            nonlocal result
+            result = value
+
+        await self._link_delay()
+        send_fun(notify)
+        return result
+
+    def process_waiting_messages(self) -> bool:
+        if not self.connected:
+            raise SimulatedLinkError("TDM simulé indisponible")
+        now = time.monotonic()
+        processed = False
+        for node in self.nodes:
+            node.advance(now)
+            processed = node._notify() or processed
+        return processed
+
+    def is_tdm_connected(self) -> bool:
+        return self.connected
+
+    def close(self):
+        pass
+
+    def disconnect(self):
+        self.connected = False
+
+    # --- Contrôle de la simulation --- #
+    def drop_node(self, index: int = 0):
+        """Simule la perte d'un robot (câble USB débranché...)."""
+        self.nodes[index].status = NODE_STATUS_DISCONNECTED
+
+    def restore_node(self, index: int = 0):
+        """Rend de nouveau disponible un robot perdu."""
+        self.nodes[index].status = NODE_STATUS_AVAILABLE
+
+    def reset(self):
+        """Remet tous les robots simulés dans leur état initial."""
+        self.connected = True
+        self.stats = {'messages': 0, 'failures': 0}
+        for node in self.nodes:
+            node.status = NODE_STATUS_AVAILABLE
+            node.watch_flags = 0
+            node.reset()
+
+
+if __name__ == "__main__":
+    """Mesure de latence de bout en bout du contrôleur sur liaison simulée."""
+    import argparse
+    import statistics
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).parent))
+    from thymio_controller import ThymioController
+
+    parser = argparse.ArgumentParser(description="Banc d'essai du contrôleur Thymio simulé")
+    parser.add_argument("--commands", type=int, default=200, help="Nombre de commandes")
+    parser.add_argument("--latency", type=float, default=0.005, help="Latence de la liaison (s)")
+    parser.add_argument("--jitter", type=float, default=0.002, help="Gigue de la liaison (s)")
+    parser.add_argument("--nodes", type=int, default=1, help="Nombre de robots simulés")
+    args = parser.parse_args()
+
+    async def benchmark():
+        controller = ThymioController(client_factory=lambda: SimulatedClientAsync(
+            node_count=args.nodes, latency=args.latency, jitter=args.jitter, seed=0))
+        if not await controller.connect(discovery_time=0):
+            return
+
+        programs = [
+            "motor.left.target = 200\nmotor.right.target = 200",
+            "call leds.top(32, 0, 0)",
+            "motor.left.target = -100\nmotor.right.target = 100",
+            "call sound.system(1)\ncall leds.bottom.left(0, 32, 0)",
+        ]
+        latencies = []
+        for index in range(args.commands):
+            start = time.perf_counter()
+            await controller.execute_code(programs[index % len(programs)], target=ThymioController.BROADCAST)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        latencies.sort()
+        print(f"\n📊 {args.commands} commandes sur {args.nodes} robot(s) simulé(s)")
+        print(f"   p50: {statistics.median(latencies):.2f} ms  "
+              f"p95: {latencies[int(len(latencies) * 0.95) - 1]:.2f} ms  "
+              f"max: {latencies[-1]:.2f} ms")
+        print(f"   Chemins: {controller.get_stats()}")
+        await controller.disconnect()
+
+    asyncio.run(benchmark())
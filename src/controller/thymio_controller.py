@@ -2,20 +2,157 @@
 Contrôleur pour le robot Thymio - Version 2
 Support amélioré pour les commandes définies dans commands.json
 """
-from tdmclient import ClientAsync
-from typing import Dict, List
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+import threading
 import warnings
 import asyncio
+import time
+
+try:
+    from tdmclient import ClientAsync, ThymioFB
+    TDMCLIENT_AVAILABLE = True
+    VM_RESET = ThymioFB.VM_EXECUTION_STATE_COMMAND_RESET
+except ImportError:
+    # Sans tdmclient, seul le client simulé (client_factory) est utilisable
+    ClientAsync = None
+    TDMCLIENT_AVAILABLE = False
+    VM_RESET = 5
+
+try:
+    from .aseba_parser import code_hash, is_idempotent, parse_constant_assignments
+    from .resident_program import RESIDENT_EVENTS, DEFAULT_MACROS, build_resident_program, match_resident_event
+    from .command_queue import CommandQueue
+    from .sensor_stream import ColumnarRecorder, SensorStream
+    from .macros import compile_macro
+    from .aseba_validator import validate_aseba
+    from .command_store import CommandStore
+except ImportError:
+    from aseba_parser import code_hash, is_idempotent, parse_constant_assignments
+    from resident_program import RESIDENT_EVENTS, DEFAULT_MACROS, build_resident_program, match_resident_event
+    from command_queue import CommandQueue
+    from sensor_stream import ColumnarRecorder, SensorStream
+    from macros import compile_macro
+    from aseba_validator import validate_aseba
+    from command_store import CommandStore
+
+class ConnectionState:
+    """États de la connexion au TDM."""
+    DISCONNECTED = "disconnected"
+    CONNECTING = "connecting"
+    CONNECTED = "connected"
+    RECONNECTING = "reconnecting"
+    FAILED = "failed"
+
 
 class ThymioController:
     """Contrôleur pour le robot Thymio avec support pour les commandes JSON."""
     
-    def __init__(self):
-        """Initialise le contrôleur Thymio."""
-        self.client = ClientAsync()
-        self.node = None
+    # Cible désignant tous les robots connectés
+    BROADCAST = "*"
+
+    def __init__(self, use_resident_program: bool = True, queue_depth: int = 8,
+                 node_timeout: float = 5.0, connection_timeout: Optional[float] = None,
+                 auto_reconnect: bool = False, command_deadline: float = 3.0,
+                 client_factory: Optional[Callable[[], Any]] = None):
+        """
+        Initialise le contrôleur Thymio.
+        
+        Args:
+            use_resident_program (bool): Téléverse un programme résident à la
+                connexion et envoie les commandes connues sous forme d'événements
+            queue_depth (int): Nombre maximal de commandes en attente par nœud
+            node_timeout (float): Délai maximal d'exécution par robot (s) lors
+                d'un envoi à plusieurs robots
+            connection_timeout (Optional[float]): Délai maximal d'une tentative
+                de connexion (s), None pour attendre indéfiniment
+            auto_reconnect (bool): Reconnexion automatique par le superviseur
+            command_deadline (float): Durée (s) pendant laquelle une commande
+                émise pendant une reconnexion attend le retour de la liaison
+            client_factory (Optional[Callable]): Fabrique du client TDM
+                (ClientAsync par défaut), rappelée à chaque reconnexion
+        """
+        if client_factory is None and not TDMCLIENT_AVAILABLE:
+            raise ImportError("tdmclient n'est pas installé (pip install tdmclient) ; "
+                              "utiliser client_factory=SimulatedClientAsync pour travailler sans robot")
+        self._client_factory = client_factory or ClientAsync
+        self.client = None          # créé par connect() : le TDM peut être absent au démarrage
+        self.node = None            # robot principal (cible par défaut)
         self.connected = False
         self.commands = self._load_default_commands()
+        
+        # Macros : séquences temporisées compilées en un programme autonome
+        self.macros: Dict[str, str] = {}
+        
+        # Voie prioritaire : commandes de sécurité qui court-circuitent la file,
+        # marquées "priority" dans commands.json (l'arrêt si le fichier est illisible)
+        self.priority_commands = {"arreter"}
+        self._load_command_definitions()
+        
+        # Supervision de la connexion
+        self.connection_timeout = connection_timeout
+        self.auto_reconnect = auto_reconnect
+        self.command_deadline = command_deadline
+        self.probe_interval = 1.0       # s entre deux contrôles de santé
+        self.backoff_initial = 0.5      # s avant la deuxième tentative
+        self.backoff_max = 10.0         # s, plafond du délai entre tentatives
+        self.max_reconnect_attempts = 10
+        self.state = ConnectionState.DISCONNECTED
+        self.state_listeners: List[Callable[[str], None]] = []
+        
+        # Observateurs de durée : appelés avec ("robot", début, fin) en
+        # secondes time.perf_counter après chaque envoi de programme
+        self.timing_listeners: List[Callable[[str, float, float], None]] = []
+        self._selection: Optional[List[str]] = None
+        self._discovery_time = 0.5
+        self._connected_event = threading.Event()
+        self._supervisor_stop = threading.Event()
+        self._reconnect_latencies = deque(maxlen=50)  # secondes
+        self.connection_stats = {'probes': 0, 'losses': 0, 'reconnects': 0, 'failures': 0}
+        self.link_lost = False          # perte détectée, liaison non rétablie depuis
+        self._last_loss: Optional[float] = None  # horodatage (time.time) de la dernière perte
+        
+        # Flux de capteurs par nœud et tâche qui relève les notifications
+        self.sensor_streams: Dict[str, SensorStream] = {}
+        self.sensor_poll_interval = 0.02  # s
+        self._sensor_pump: Optional[asyncio.Task] = None
+        
+        # Flotte de robots verrouillés (id -> nœud) et groupes nommés
+        self.nodes: Dict[str, Any] = {}
+        self.groups: Dict[str, List[str]] = {}
+        self.node_timeout = node_timeout
+        
+        # Programme résident
+        self.use_resident_program = use_resident_program
+        self.resident_macros = list(DEFAULT_MACROS)
+        self._resident_source = build_resident_program(self.resident_macros)
+        
+        # Empreinte du programme chargé sur chaque nœud (par id)
+        self._loaded_program: Dict[str, Optional[str]] = {}
+        
+        # Nœuds dont l'état a été modifié depuis le chargement du programme
+        self._state_changed: Dict[str, bool] = {}
+        
+        # Miroir des dernières valeurs écrites sur chaque nœud
+        self._variable_mirror: Dict[str, Dict[str, List[int]]] = {}
+        
+        # File d'envoi à fusion par nœud
+        self.queue_depth = queue_depth
+        self._queues: Dict[str, CommandQueue] = {}
+        
+        # Latences de la voie prioritaire
+        self._priority_latencies = deque(maxlen=100)  # secondes
+        
+        # Compteurs par chemin d'exécution
+        self.stats = {
+            'variables': 0,     # set_variables
+            'events': 0,        # événements du programme résident
+            'compiled': 0,      # compilation + exécution
+            'restarted': 0,     # programme déjà chargé, simple redémarrage
+            'skipped': 0,       # programme idempotent déjà appliqué
+            'unchanged': 0,     # écritures supprimées (valeurs identiques)
+            'rejected': 0,      # programmes refusés par la vérification locale
+        }
 
     def _load_default_commands(self) -> Dict[str, str]:
         """Charge les commandes depuis le fichier JSON."""
@@ -29,32 +166,517 @@ class ThymioController:
             "tourner_droite": "motor.left.target = 100\nmotor.right.target = -100"
         }
 
-    async def connect(self) -> bool:
-        """Établit une connexion avec un robot Thymio."""
+    def _load_command_definitions(self):
+        """Compile les macros et relève les commandes prioritaires de commands.json."""
+        try:
+            entries = CommandStore().load()
+        except Exception as e:
+            print(f"⚠️ Macros et commandes prioritaires non chargées: {e}")
+            return
+        
+        if entries:
+            self.priority_commands = {name for name, entry in entries.items()
+                                      if entry.get("priority", False)}
+        for name, entry in entries.items():
+            if "macro" in entry:
+                self.define_macro(name, entry["macro"])
+
+    def define_macro(self, name: str, steps: List[Dict[str, Any]]) -> bool:
+        """
+        Compile et enregistre une macro, exécutable ensuite comme une commande.
+        
+        Args:
+            name (str): Nom de la macro
+            steps (List[Dict[str, Any]]): Étapes {"code" | "command", "duration_ms"}
+            
+        Returns:
+            bool: True si la macro est valide
+        """
+        try:
+            program = compile_macro(steps, self.commands)
+        except ValueError as e:
+            print(f"❌ Macro '{name}' invalide: {e}")
+            return False
+        
+        self.macros[name] = program
+        self.commands[name] = program
+        return True
+
+    async def execute_macro(self, macro: Union[str, List[Dict[str, Any]]],
+                            target: Optional[str] = None) -> bool:
+        """
+        Exécute une macro : le programme est téléversé une seule fois puis
+        le robot enchaîne les étapes de lui-même.
+        
+        Args:
+            macro: Nom d'une macro enregistrée ou liste d'étapes
+            target (Optional[str]): Robot, groupe ou "*" (défaut : robot principal)
+            
+        Returns:
+            bool: True si la macro a été lancée
+        """
+        if isinstance(macro, str):
+            program = self.macros.get(macro)
+            if program is None:
+                print(f"❌ Macro inconnue: {macro}")
+                return False
+        else:
+            try:
+                program = compile_macro(macro, self.commands)
+            except ValueError as e:
+                print(f"❌ Macro invalide: {e}")
+                return False
+        
+        return await self.execute_code(program, target=target)
+
+    async def connect(self, selection: Optional[Iterable[str]] = None,
+                      discovery_time: float = 0.5) -> bool:
+        """
+        Établit une connexion avec les robots Thymio disponibles.
+        
+        Tous les robots servis par le TDM sont verrouillés, ou seulement ceux
+        de la sélection. Le premier robot verrouillé devient le robot principal.
+        
+        Args:
+            selection (Optional[Iterable[str]]): Identifiants ou noms des robots
+                à verrouiller (None : tous)
+            discovery_time (float): Attente (s) laissant les autres robots se
+                signaler après le premier
+            
+        Returns:
+            bool: True si au moins un robot est connecté
+        """
+        self._selection = list(selection) if selection is not None else None
+        self._discovery_time = discovery_time
+        self._set_state(ConnectionState.CONNECTING)
+        
+        success = await self._open_session()
+        self._set_state(ConnectionState.CONNECTED if success else ConnectionState.DISCONNECTED)
+        return success
+
+    async def _open_session(self) -> bool:
+        """Tentative de connexion unique, bornée par connection_timeout."""
+        # ClientAsync ouvre la connexion TDM dès sa construction : un TDM
+        # injoignable compte comme une tentative échouée
+        if self.client is None:
+            try:
+                self.client = self._client_factory()
+            except Exception as e:
+                print(f"❌ TDM injoignable: {e}")
+                self.connected = False
+                return False
+        
+        try:
+            return await asyncio.wait_for(
+                self._lock_fleet(self._selection, self._discovery_time),
+                self.connection_timeout
+            )
+        except asyncio.TimeoutError:
+            print(f"⏱️ Délai de connexion dépassé ({self.connection_timeout}s)")
+            self.connected = False
+            return False
+
+    async def _lock_fleet(self, selection: Optional[List[str]], discovery_time: float) -> bool:
+        """Découvre et verrouille les robots (voir connect())."""
         try:
             with warnings.catch_warnings():
                 warnings.simplefilter("ignore")
                 await self.client.wait_for_status(self.client.NODE_STATUS_AVAILABLE)
-                self.node = self.client.first_node()
+                if discovery_time > 0:
+                    await self.client.sleep(discovery_time)
+                
+                wanted = set(selection) if selection is not None else None
+                candidates = [
+                    node for node in self.client.nodes
+                    if node.status == self.client.NODE_STATUS_AVAILABLE
+                    and (wanted is None or node.id_str in wanted or self._node_name(node) in wanted)
+                ]
                 
-                if self.node:
-                    await self.node.lock_node()
-                    await self.client.wait_for_status(self.client.NODE_STATUS_READY)
-                    self.connected = True
-                    print(f"✅ Connecté au Thymio (ID: {self.node.id_str})")
-                    return True
-                else:
+                if not candidates:
                     print("❌ Aucun robot Thymio détecté")
                     return False
+                
+                # Verrouillage de tous les robots en parallèle
+                locked = await asyncio.gather(*(self._lock(node) for node in candidates))
+                for node, success in zip(candidates, locked):
+                    if success:
+                        self.nodes[node.id_str] = node
+                
+                if not self.nodes:
+                    print("❌ Aucun robot Thymio n'a pu être verrouillé")
+                    return False
+                
+                self.node = next(iter(self.nodes.values()))
+                self.connected = True
+                for node in self.nodes.values():
+                    print(f"✅ Connecté au Thymio (ID: {node.id_str})")
+                
+                if self.use_resident_program:
+                    await asyncio.gather(*(self._upload_resident_program(node)
+                                           for node in self.nodes.values()))
+                return True
         
         except Exception as e:
             print(f"❌ Erreur de connexion: {e}")
             self.connected = False
             return False
+
+    async def _lock(self, node) -> bool:
+        """Verrouille un nœud et attend qu'il soit prêt."""
+        try:
+            error = await node.lock_node()
+            if error is not None:
+                print(f"⚠️ Thymio {node.id_str} non verrouillé: {error}")
+                return False
+            while node.status != self.client.NODE_STATUS_READY:
+                if not self.client.process_waiting_messages():
+                    await asyncio.sleep(self.client.DEFAULT_SLEEP)
+            return True
+        except Exception as e:
+            print(f"⚠️ Thymio {node.id_str} non verrouillé: {e}")
+            return False
+
+    def _set_state(self, state: str):
+        """Change l'état de la connexion et prévient les observateurs."""
+        if state == self.state:
+            return
+        self.state = state
+        if state == ConnectionState.CONNECTED:
+            self.link_lost = False
+            self._connected_event.set()
+        else:
+            self._connected_event.clear()
+        for listener in list(self.state_listeners):
+            try:
+                listener(state)
+            except Exception as e:
+                print(f"⚠️ Erreur d'un observateur de connexion: {e}")
+
+    def start_supervisor(self) -> asyncio.Task:
+        """
+        Lance le superviseur dans la boucle courante.
+        
+        La boucle doit rester active pendant toute la session ; à défaut,
+        exécuter supervise() dans un thread dédié.
+        
+        Returns:
+            asyncio.Task: Tâche du superviseur
+        """
+        return asyncio.ensure_future(self.supervise())
+
+    def stop_supervisor(self):
+        """Demande l'arrêt du superviseur (depuis n'importe quel thread)."""
+        self._supervisor_stop.set()
+
+    async def supervise(self):
+        """
+        Surveille la liaison et reconnecte les robots perdus.
+        
+        Le contrôle de santé est passif : il traite les messages en attente
+        du TDM et vérifie l'état des nœuds verrouillés, sans aller-retour
+        supplémentaire avec les robots. En cas de perte, la reconnexion est
+        tentée avec un délai croissant (backoff exponentiel).
+        """
+        self._supervisor_stop.clear()
+        print("🩺 Superviseur de connexion démarré")
         
-    async def execute_command(self, command: str) -> bool:
-        """Exécute une commande sur le robot Thymio."""
-        if not self.connected or not self.node:
+        while not self._supervisor_stop.is_set():
+            await asyncio.sleep(self.probe_interval)
+            if self._supervisor_stop.is_set() or self.state != ConnectionState.CONNECTED:
+                continue
+            
+            self.connection_stats['probes'] += 1
+            if self._is_healthy():
+                continue
+            
+            self.connection_stats['losses'] += 1
+            self.link_lost = True
+            self._last_loss = time.time()
+            print("⚠️ Liaison avec le Thymio perdue")
+            
+            if self.auto_reconnect:
+                if await self._reconnect():
+                    continue
+                break  # _reconnect() a signalé l'état FAILED
+            
+            # Sans reconnexion automatique : les robots sont oubliés et l'état
+            # DISCONNECTED fait échouer immédiatement les commandes suivantes
+            self._reset_session()
+            self._set_state(ConnectionState.DISCONNECTED)
+            break
+        
+        print("🩺 Superviseur de connexion arrêté")
+
+    def _is_healthy(self) -> bool:
+        """Contrôle de santé : TDM joignable et nœuds toujours prêts."""
+        try:
+            if hasattr(self.client, "is_tdm_connected") and not self.client.is_tdm_connected():
+                return False
+            self.client.process_waiting_messages()
+        except Exception:
+            return False
+        
+        live = {node.id_str: node for node in self.client.nodes}
+        return bool(self.nodes) and all(
+            node_id in live and live[node_id].status == self.client.NODE_STATUS_READY
+            for node_id in self.nodes
+        )
+
+    async def _reconnect(self) -> bool:
+        """
+        Reconnecte les robots avec un backoff exponentiel.
+        
+        Returns:
+            bool: True si la liaison est rétablie
+        """
+        self._set_state(ConnectionState.RECONNECTING)
+        start = time.perf_counter()
+        delay = self.backoff_initial
+        
+        for attempt in range(1, self.max_reconnect_attempts + 1):
+            if self._supervisor_stop.is_set():
+                break
+            self._reset_session()
+            
+            if await self._open_session():
+                latency = time.perf_counter() - start
+                self._reconnect_latencies.append(latency)
+                self.connection_stats['reconnects'] += 1
+                self._set_state(ConnectionState.CONNECTED)
+                print(f"✅ Liaison rétablie en {latency:.2f}s (tentative {attempt})")
+                await self._resubscribe_sensors()
+                return True
+            
+            print(f"🔄 Tentative {attempt}/{self.max_reconnect_attempts} échouée, "
+                  f"nouvel essai dans {delay:.1f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.backoff_max)
+        
+        self.connection_stats['failures'] += 1
+        self._set_state(ConnectionState.FAILED)
+        print("❌ Reconnexion impossible")
+        return False
+
+    def _reset_session(self):
+        """Ferme le client TDM et oublie l'état des robots avant une reconnexion."""
+        if self.client is not None:
+            try:
+                self.client.close()
+                if hasattr(self.client, "disconnect"):
+                    self.client.disconnect()
+            except Exception:
+                pass
+        
+        # Nouveau client créé par la prochaine tentative (_open_session)
+        self.client = None
+        self.node = None
+        self.connected = False
+        self.nodes.clear()
+        
+        # L'état des robots est inconnu après une perte de liaison
+        self._loaded_program.clear()
+        self._variable_mirror.clear()
+        self._state_changed.clear()
+        for queue in self._queues.values():
+            queue.clear()
+            queue.cancel_inflight()
+        self._queues.clear()
+
+    async def _await_connection(self) -> bool:
+        """
+        Attend le rétablissement de la liaison pour une commande émise
+        pendant une (re)connexion, au plus command_deadline secondes.
+        
+        Returns:
+            bool: True si la commande peut être envoyée
+        """
+        if self.state not in (ConnectionState.CONNECTING, ConnectionState.RECONNECTING):
+            return self.connected and self.node is not None
+        
+        # Attente compatible avec n'importe quelle boucle / n'importe quel thread
+        deadline = time.monotonic() + self.command_deadline
+        while not self._connected_event.is_set():
+            if time.monotonic() >= deadline:
+                print("⏱️ Liaison non rétablie, commande abandonnée")
+                return False
+            await asyncio.sleep(0.05)
+        return self.connected and self.node is not None
+
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """
+        Retourne l'état de la connexion et la latence des reconnexions.
+        
+        Returns:
+            Dict[str, Any]: État, compteurs et latences en millisecondes
+        """
+        stats = dict(self.connection_stats, state=self.state, link_lost=self.link_lost)
+        if self._last_loss is not None:
+            stats['last_loss_at'] = self._last_loss
+        latencies = [value * 1000 for value in self._reconnect_latencies]
+        if latencies:
+            stats.update({
+                'last_reconnect_ms': round(latencies[-1], 1),
+                'mean_reconnect_ms': round(sum(latencies) / len(latencies), 1),
+            })
+        return stats
+
+    @staticmethod
+    def _node_name(node) -> Optional[str]:
+        """Nom d'un nœud tel que déclaré au TDM."""
+        return node.props.get("name") if hasattr(node, "props") else None
+
+    def define_group(self, name: str, members: Iterable[str]) -> bool:
+        """
+        Définit un groupe nommé de robots.
+        
+        Args:
+            name (str): Nom du groupe
+            members (Iterable[str]): Identifiants ou noms des robots
+            
+        Returns:
+            bool: True si tous les membres sont connectés
+        """
+        ids = []
+        for member in members:
+            node = self._find_node(member)
+            if node is None:
+                print(f"❌ Robot inconnu dans le groupe '{name}': {member}")
+                return False
+            ids.append(node.id_str)
+        self.groups[name] = ids
+        return True
+
+    def _find_node(self, reference: str):
+        """Retrouve un robot connecté par identifiant ou par nom."""
+        if reference in self.nodes:
+            return self.nodes[reference]
+        for node in self.nodes.values():
+            if self._node_name(node) == reference:
+                return node
+        return None
+
+    def _resolve_target(self, target: Optional[str]) -> List[Any]:
+        """
+        Traduit une cible en liste de nœuds.
+        
+        Args:
+            target (Optional[str]): None (robot principal), "*" (tous),
+                nom de groupe, identifiant ou nom de robot
+            
+        Returns:
+            List[Any]: Nœuds ciblés (vide si la cible est inconnue)
+        """
+        if target is None:
+            return [self.node] if self.node else []
+        if target == self.BROADCAST:
+            return list(self.nodes.values())
+        if target in self.groups:
+            return [self.nodes[node_id] for node_id in self.groups[target] if node_id in self.nodes]
+        node = self._find_node(target)
+        return [node] if node else []
+
+    async def subscribe_sensors(self, variables: Iterable[str], capacity: int = 1024,
+                                record_to: Optional[str] = None,
+                                target: Optional[str] = None) -> Optional[SensorStream]:
+        """
+        Reçoit en continu des variables du robot dans des tampons circulaires.
+        
+        Les valeurs arrivent par notification du TDM (watch), sans
+        interrogation. Une tâche de la boucle courante relève les messages
+        tant qu'un abonnement existe.
+        
+        Args:
+            variables (Iterable[str]): Variables à suivre (prox.horizontal, acc...)
+            capacity (int): Échantillons conservés par variable
+            record_to (Optional[str]): Répertoire d'enregistrement en colonnes
+            target (Optional[str]): Robot visé (défaut : robot principal)
+            
+        Returns:
+            Optional[SensorStream]: Flux du robot ou None en cas d'échec
+        """
+        nodes = self._resolve_target(target)
+        if len(nodes) != 1:
+            print(f"❌ Abonnement capteurs: cible invalide ({target})")
+            return None
+        node = nodes[0]
+        
+        recorder = ColumnarRecorder(record_to) if record_to else None
+        stream = SensorStream(variables, capacity, recorder)
+        stream.node_id = node.id_str
+        
+        try:
+            await self._attach_stream(node, stream)
+        except Exception as e:
+            print(f"❌ Abonnement capteurs impossible: {e}")
+            stream.close()
+            return None
+        
+        previous = self.sensor_streams.pop(node.id_str, None)
+        if previous is not None:
+            self._detach_stream(node, previous)
+        self.sensor_streams[node.id_str] = stream
+        
+        if self._sensor_pump is None or self._sensor_pump.done():
+            self._sensor_pump = asyncio.ensure_future(self._pump_sensors())
+        
+        print(f"📡 Capteurs suivis sur {node.id_str}: {', '.join(stream.variables)}")
+        return stream
+
+    def unsubscribe_sensors(self, target: Optional[str] = None):
+        """Arrête le suivi des capteurs d'un robot (défaut : robot principal)."""
+        for node in self._resolve_target(target):
+            stream = self.sensor_streams.pop(node.id_str, None)
+            if stream is not None:
+                self._detach_stream(node, stream)
+
+    async def _attach_stream(self, node, stream: SensorStream):
+        """Active les notifications de variables et branche le flux."""
+        await node.watch(variables=True)
+        node.add_variables_changed_listener(stream.on_variables_changed)
+
+    def _detach_stream(self, node, stream: SensorStream):
+        """Débranche un flux et termine son enregistrement."""
+        try:
+            node.remove_variables_changed_listener(stream.on_variables_changed)
+        except ValueError:
+            pass
+        stream.close()
+
+    async def _resubscribe_sensors(self):
+        """Rebranche les flux existants sur les nœuds d'une nouvelle session."""
+        for node_id, stream in list(self.sensor_streams.items()):
+            node = self.nodes.get(node_id)
+            if node is None:
+                continue
+            try:
+                await self._attach_stream(node, stream)
+            except Exception as e:
+                print(f"⚠️ Capteurs de {node_id} non rétablis: {e}")
+        if self.sensor_streams and (self._sensor_pump is None or self._sensor_pump.done()):
+            self._sensor_pump = asyncio.ensure_future(self._pump_sensors())
+
+    async def _pump_sensors(self):
+        """Relève les notifications du TDM tant qu'un flux est actif."""
+        while self.sensor_streams and self.connected:
+            try:
+                self.client.process_waiting_messages()
+            except Exception as e:
+                print(f"⚠️ Lecture des capteurs interrompue: {e}")
+            await asyncio.sleep(self.sensor_poll_interval)
+
+    def get_nodes(self) -> List[Dict[str, Any]]:
+        """Retourne l'identifiant et le nom des robots connectés."""
+        return [{'id': node_id, 'name': self._node_name(node)} for node_id, node in self.nodes.items()]
+        
+    async def execute_command(self, command: str, target: Optional[str] = None) -> bool:
+        """
+        Exécute une commande sur le robot Thymio.
+        
+        Args:
+            command (str): Nom de la commande
+            target (Optional[str]): Robot, groupe ou "*" (défaut : robot principal)
+        """
+        if not await self._await_connection():
             print("❌ Robot non connecté")
             return False
         
@@ -66,46 +688,348 @@ class ThymioController:
             # Récupère le code Aseba associé à la commande
             aseba_code = self.commands[command]
             
-            # Exécute le code
-            await self.node.compile(aseba_code)
-            await self.node.run()
-            
-            return True
+            # Exécute le code (événement résident si possible)
+            results = await self.execute_on(aseba_code, target,
+                                            priority=command in self.priority_commands)
+            return bool(results) and all(results.values())
             
         except Exception as e:
             print(f"❌ Erreur lors de l'exécution de '{command}': {e}")
             return False
 
-    async def execute_code(self, code: str) -> bool:
-        """Exécute directement du code Aseba sur le robot."""
-        if not self.connected or not self.node:
+    async def execute_code(self, code: str, priority: bool = False,
+                           target: Optional[str] = None) -> bool:
+        """
+        Exécute directement du code Aseba sur le robot.
+        
+        Args:
+            code (str): Programme Aseba
+            priority (bool): Commande de sécurité (arrêt...) : vide la file,
+                interrompt l'envoi en cours et écrit directement sur le robot
+            target (Optional[str]): Robot, groupe ou "*" (défaut : robot principal)
+        """
+        start = time.perf_counter()
+        if not await self._await_connection():
             print("❌ Robot non connecté")
             return False
             
         try:
-            await self.node.compile(code)
-            await self.node.run()
-            return True
+            results = await self.execute_on(code, target, priority=priority)
+            return bool(results) and all(results.values())
             
         except Exception as e:
             print(f"❌ Erreur lors de l'exécution du code: {e}")
             return False
+        
+        finally:
+            self._notify_timing("robot", start, time.perf_counter())
+
+    def _notify_timing(self, stage: str, start: float, end: float):
+        """Transmet une durée d'étape aux observateurs."""
+        for listener in list(self.timing_listeners):
+            try:
+                listener(stage, start, end)
+            except Exception as e:
+                print(f"⚠️ Erreur d'un observateur de durée: {e}")
+
+    async def execute_on(self, code: str, target: Optional[str] = None,
+                         priority: bool = False) -> Dict[str, bool]:
+        """
+        Exécute un programme sur plusieurs robots en parallèle.
+        
+        Chaque robot dispose de sa propre file et de son propre délai : un
+        robot lent ou bloqué n'attarde pas les autres.
+        
+        Args:
+            code (str): Programme Aseba
+            target (Optional[str]): Robot, groupe ou "*" (défaut : robot principal)
+            priority (bool): Utilise la voie prioritaire
+            
+        Returns:
+            Dict[str, bool]: Résultat par identifiant de robot
+        """
+        nodes = self._resolve_target(target)
+        if not nodes:
+            print(f"❌ Cible inconnue: {target}")
+            return {}
+        
+        if len(nodes) == 1:
+            return {nodes[0].id_str: await self._run_on_node(nodes[0], code, priority)}
+        
+        results = await asyncio.gather(*(
+            self._run_on_node(node, code, priority, timeout=self.node_timeout) for node in nodes
+        ))
+        return {node.id_str: result for node, result in zip(nodes, results)}
+
+    async def _run_on_node(self, node, code: str, priority: bool,
+                           timeout: Optional[float] = None) -> bool:
+        """Exécute un programme sur un robot, avec un délai maximal éventuel."""
+        try:
+            if priority:
+                operation = self._execute_priority(node, code)
+            else:
+                operation = self._submit(node, code)
+            if timeout is None:
+                return await operation
+            return await asyncio.wait_for(operation, timeout)
+        except asyncio.TimeoutError:
+            print(f"⏱️ Thymio {node.id_str}: délai dépassé")
+            return False
+        except Exception as e:
+            print(f"❌ Thymio {node.id_str}: {e}")
+            return False
+
+    def _get_queue(self, node) -> CommandQueue:
+        """Retourne la file d'envoi du nœud (créée au premier usage)."""
+        queue = self._queues.get(node.id_str)
+        if queue is None:
+            queue = CommandQueue(lambda code: self._dispatch(node, code), self.queue_depth)
+            self._queues[node.id_str] = queue
+        return queue
+
+    async def _submit(self, node, code: str) -> bool:
+        """Place un programme dans la file du nœud et attend son envoi."""
+        return await self._get_queue(node).submit(code)
+
+    async def _execute_priority(self, node, code: str) -> bool:
+        """
+        Voie prioritaire : abandonne les commandes en attente, interrompt
+        celle en cours et transmet le programme par le chemin le plus court.
+        
+        Args:
+            node: Nœud Thymio cible
+            code (str): Programme Aseba
+            
+        Returns:
+            bool: True si la commande a été transmise
+        """
+        start = time.perf_counter()
+        
+        queue = self._get_queue(node)
+        queue.clear()
+        queue.cancel_inflight()
+        
+        values = parse_constant_assignments(code)
+        if values is not None:
+            # Un programme compilé actif réécrirait les moteurs : on l'arrête
+            # simplement, sans recharger le programme résident
+            if self._loaded_program.get(node.id_str) is not None and not self._is_resident_loaded(node):
+                await node.stop()
+                self._loaded_program[node.id_str] = None
+            # Écriture inconditionnelle : le miroir peut être périmé après une annulation
+            await node.set_variables(values)
+            self._variable_mirror.setdefault(node.id_str, {}).update(values)
+            self._state_changed[node.id_str] = True
+            self.stats['variables'] += 1
+            result = True
+        else:
+            result = await self._dispatch(node, code)
+        
+        self._priority_latencies.append(time.perf_counter() - start)
+        return result
+
+    async def _dispatch(self, node, code: str) -> bool:
+        """
+        Envoie un programme au robot par le chemin le plus rapide disponible.
+        
+        Args:
+            node: Nœud Thymio cible
+            code (str): Programme Aseba
+            
+        Returns:
+            bool: True si la commande a été transmise
+        """
+        # 1. Affectations de constantes : un seul set_variables
+        values = parse_constant_assignments(code)
+        if values is not None and await self._release_custom_program(node):
+            return await self._write_variables(node, values)
+        
+        # 2. Commande connue du programme résident : un événement
+        if self.use_resident_program:
+            event = match_resident_event(code, self.resident_macros)
+            if event and await self._ensure_resident_program(node):
+                name, args = event
+                await node.send_events({name: args})
+                self._track_event(node, name, args)
+                self.stats['events'] += 1
+                return True
+        
+        # 3. Cas général : compilation
+        return await self._compile_and_run(node, code)
+
+    async def _write_variables(self, node, values: Dict[str, List[int]]) -> bool:
+        """
+        Écrit des variables en ignorant celles dont la valeur est inchangée.
+        
+        Args:
+            node: Nœud Thymio cible
+            values (Dict[str, List[int]]): Valeurs au format set_variables
+            
+        Returns:
+            bool: True (écriture effectuée ou inutile)
+        """
+        mirror = self._variable_mirror.setdefault(node.id_str, {})
+        changed = {name: value for name, value in values.items() if mirror.get(name) != value}
+        
+        if not changed:
+            self.stats['unchanged'] += 1
+            return True
+        
+        await node.set_variables(changed)
+        mirror.update(changed)
+        self._state_changed[node.id_str] = True
+        self.stats['variables'] += 1
+        return True
+
+    def _track_event(self, node, name: str, args: List[int]):
+        """Met à jour le miroir des variables après un événement résident."""
+        mirror = self._variable_mirror.setdefault(node.id_str, {})
+        if name == "set_motors":
+            mirror["motor.left.target"] = [args[0]]
+            mirror["motor.right.target"] = [args[1]]
+        elif name == "run_macro":
+            # Une macro peut écrire n'importe quelle variable
+            mirror.clear()
+        self._state_changed[node.id_str] = True
+
+    async def _compile_and_run(self, node, code: str) -> bool:
+        """Compile et lance un programme (remplace le programme résident)."""
+        program_hash = code_hash(code)
+        
+        if self._loaded_program.get(node.id_str) == program_hash:
+            # Programme identique déjà chargé : pas de nouvelle compilation
+            if is_idempotent(code) and not self._state_changed.get(node.id_str):
+                self.stats['skipped'] += 1
+                return True
+            await self._restart_program(node)
+            self.stats['restarted'] += 1
+        else:
+            # Vérification locale : un programme invalide n'atteint pas le TDM
+            errors = validate_aseba(code, (name for name, _ in RESIDENT_EVENTS))
+            if errors:
+                print(f"❌ Code Aseba invalide: {'; '.join(errors)}")
+                self.stats['rejected'] += 1
+                return False
+            # tdmclient retourne l'erreur de compilation au lieu de la lever
+            error = await node.compile(code)
+            if error is not None:
+                print(f"❌ Programme refusé par le TDM: {error}")
+                self.stats['rejected'] += 1
+                return False
+            await node.run()
+            self._loaded_program[node.id_str] = program_hash
+            self.stats['compiled'] += 1
+        
+        # Le programme peut écrire n'importe quelle variable
+        self._variable_mirror.pop(node.id_str, None)
+        self._state_changed[node.id_str] = False
+        return True
+
+    async def _restart_program(self, node):
+        """Relance depuis le début le programme déjà chargé (reset + run)."""
+        await node.thymio.send_msg_and_get_result(
+            lambda notify: node.set_vm_execution_state(
+                VM_RESET, request_id_notify=notify)
+        )
+        await node.run()
+
+    def _is_resident_loaded(self, node) -> bool:
+        """Indique si le programme résident est chargé sur le nœud."""
+        return self._loaded_program.get(node.id_str) == code_hash(self._resident_source)
+
+    async def _ensure_resident_program(self, node) -> bool:
+        """Recharge le programme résident s'il a été remplacé par une compilation."""
+        if self._is_resident_loaded(node):
+            return True
+        return await self._upload_resident_program(node)
+
+    async def _release_custom_program(self, node) -> bool:
+        """
+        Arrête un programme compilé encore actif avant une écriture directe
+        de variables, pour qu'il ne réécrive pas les valeurs envoyées.
+        
+        Returns:
+            bool: True si l'écriture directe peut avoir lieu
+        """
+        if self._loaded_program.get(node.id_str) is None or self._is_resident_loaded(node):
+            return True
+        if self.use_resident_program:
+            return await self._upload_resident_program(node)
+        await node.stop()
+        self._loaded_program[node.id_str] = None
+        return True
+
+    async def _upload_resident_program(self, node) -> bool:
+        """
+        Téléverse le programme résident et déclare ses événements.
+        
+        Args:
+            node: Nœud Thymio cible
+            
+        Returns:
+            bool: True si le programme est chargé
+        """
+        try:
+            await node.register_events(RESIDENT_EVENTS)
+            error = await node.compile(self._resident_source)
+            if error is not None:
+                print(f"❌ Compilation du programme résident impossible: {error}")
+                return False
+            await node.run()
+            self._loaded_program[node.id_str] = code_hash(self._resident_source)
+            self._state_changed[node.id_str] = False
+            print("📦 Programme résident chargé")
+            return True
+        except Exception as e:
+            print(f"❌ Erreur lors du chargement du programme résident: {e}")
+            return False
+
+    def get_stats(self) -> Dict[str, int]:
+        """Retourne le nombre de commandes passées par chaque chemin et par la file."""
+        stats = dict(self.stats)
+        for queue in self._queues.values():
+            for key, value in queue.get_stats().items():
+                stats[f'queue_{key}'] = stats.get(f'queue_{key}', 0) + value
+        return stats
 
     async def disconnect(self) -> None:
         """Déconnecte le robot Thymio."""
+        self.stop_supervisor()
+        for node_id in list(self.sensor_streams):
+            self.unsubscribe_sensors(node_id)
         if self.connected:
             try:
-                # Arrête le robot et éteint les LEDs
-                await self.execute_command("arreter")
+                # Arrête les robots et éteint les LEDs
+                await self.execute_command("arreter", target=self.BROADCAST)
                 
                 # Ferme la connexion
                 self.client.close()
                 self.connected = False
+                self.nodes.clear()
+                self._set_state(ConnectionState.DISCONNECTED)
                 
                 print("👋 Thymio déconnecté")
             except Exception as e:
                 print(f"❌ Erreur lors de la déconnexion: {e}")
                 
+    def get_priority_stats(self) -> Dict[str, Any]:
+        """
+        Retourne la latence des commandes prioritaires (arrêt), mesurée de
+        l'appel jusqu'à l'écriture sur le robot, préemption comprise.
+        
+        Returns:
+            Dict[str, Any]: Nombre de commandes et latences en millisecondes
+        """
+        latencies = [value * 1000 for value in self._priority_latencies]
+        if not latencies:
+            return {'count': 0}
+        return {
+            'count': len(latencies),
+            'last_ms': round(latencies[-1], 2),
+            'mean_ms': round(sum(latencies) / len(latencies), 2),
+            'max_ms': round(max(latencies), 2),
+        }
+
     def is_connected(self) -> bool:
         """Vérifie si le robot est connecté."""
         return self.connected and self.node is not None
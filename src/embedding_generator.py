@@ -1,9 +1,9 @@
 import numpy as np
-import torch
-from sentence_transformers import SentenceTransformer
 import re
 from typing import List, Union
 
+from latency import latency_tracker
+
 
 class EmbeddingGenerator:
     """
@@ -19,6 +19,9 @@ class EmbeddingGenerator:
             model_name (str): Nom du modèle Sentence Transformers.
                              Par défaut: "paraphrase-multilingual-MiniLM-L12-v2"
         """
+        # Imports lourds différés : le module reste rapide à importer
+        import torch
+        from sentence_transformers import SentenceTransformer
         
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         print(f"🔧 Utilisation du périphérique : {self.device}")
@@ -79,11 +82,12 @@ class EmbeddingGenerator:
         try:
             # Génération de l'embedding avec Sentence Transformers
             # Le modèle gère automatiquement la tokenisation, l'encodage et la normalisation
-            embedding = self.model.encode(
-                cleaned_text,
-                convert_to_numpy=True,
-                normalize_embeddings=True  # Normalisation automatique
-            )
+            with latency_tracker.measure("embedding"):
+                embedding = self.model.encode(
+                    cleaned_text,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True  # Normalisation automatique
+                )
             
             return embedding
             
@@ -3,12 +3,12 @@ Gestionnaire de base vectorielle utilisant ChromaDB pour VoxThymio
 Stocke et gère les embeddings des commandes avec leurs métadonnées.
 """
 
-import chromadb
-from chromadb.config import Settings
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 import numpy as np
 
+from latency import latency_tracker
+
 
 class EmbeddingManager:
     """
@@ -23,6 +23,10 @@ class EmbeddingManager:
         Args:
             db_path (str): Chemin vers la base de données ChromaDB
         """
+        # Import différé : chromadb n'est chargé qu'à l'ouverture de la base
+        import chromadb
+        from chromadb.config import Settings
+        
         self.db_path = Path(db_path)
         self.db_path.mkdir(exist_ok=True)
         
@@ -49,7 +53,7 @@ class EmbeddingManager:
             print(f"✅ Collection '{self.collection_name}' créée.")
     
     def add_command(self, command_id: str, description: str, 
-                   code: str, embedding: np.ndarray) -> bool:
+                   code: str, embedding: np.ndarray, priority: bool = False) -> bool:
         """
         Ajoute une nouvelle commande à la base vectorielle.
         
@@ -58,6 +62,7 @@ class EmbeddingManager:
             description (str): Description en langage naturel
             code (str): Code associé à la commande
             embedding (np.ndarray): Embedding de la description
+            priority (bool): Commande de sécurité exécutée par la voie prioritaire
             
         Returns:
             bool: True si ajouté avec succès, False sinon
@@ -66,7 +71,7 @@ class EmbeddingManager:
             # Vérifier si la commande existe déjà
             if self.command_exists(command_id):
                 print(f"⚠️ La commande '{command_id}' existe déjà. Mise à jour...")
-                return self.update_command(command_id, description, code, embedding)
+                return self.update_command(command_id, description, code, embedding, priority)
             
             # Convertir l'embedding en liste pour ChromaDB
             embedding_list = embedding.tolist() if isinstance(embedding, np.ndarray) else embedding
@@ -76,6 +81,7 @@ class EmbeddingManager:
                 "command_id": command_id,
                 "description": description,
                 "code": code,
+                "priority": bool(priority),
                 "created_at": str(np.datetime64('now'))
             }
             
@@ -107,38 +113,67 @@ class EmbeddingManager:
         Returns:
             List[Dict[str, Any]]: Liste des commandes similaires avec leurs scores
         """
+        return self.search_similar_commands_batch([query_embedding], n_results, min_similarity)[0]
+    
+    def search_similar_commands_batch(self, query_embeddings: List[np.ndarray],
+                                      n_results: int = 5,
+                                      min_similarity: float = 0.6) -> List[List[Dict[str, Any]]]:
+        """
+        Recherche les commandes similaires à plusieurs requêtes en une seule
+        interrogation de l'index.
+        
+        Args:
+            query_embeddings (List[np.ndarray]): Embeddings des requêtes
+            n_results (int): Nombre maximum de résultats par requête
+            min_similarity (float): Seuil de similarité minimum
+            
+        Returns:
+            List[List[Dict[str, Any]]]: Commandes similaires de chaque requête,
+                dans l'ordre des requêtes
+        """
+        if len(query_embeddings) == 0:
+            return []
+        
         try:
-            # Convertir l'embedding en liste
-            embedding_list = query_embedding.tolist() if isinstance(query_embedding, np.ndarray) else query_embedding
+            # Convertir les embeddings en listes
+            embedding_lists = [
+                embedding.tolist() if isinstance(embedding, np.ndarray) else embedding
+                for embedding in query_embeddings
+            ]
             
             # Recherche dans la collection
-            results = self.collection.query(
-                query_embeddings=[embedding_list],
-                n_results=n_results
-            )
+            with latency_tracker.measure("search"):
+                results = self.collection.query(
+                    query_embeddings=embedding_lists,
+                    n_results=n_results
+                )
             
             # Traitement des résultats
-            similar_commands = []
-            if results and results['ids'] and results['ids'][0]:
-                for i, command_id in enumerate(results['ids'][0]):
+            all_similar = []
+            for query_index in range(len(embedding_lists)):
+                similar_commands = []
+                ids = results['ids'][query_index] if results and results['ids'] else []
+                for i, command_id in enumerate(ids):
                     # ChromaDB retourne des distances, nous devons calculer la similarité
-                    distance = results['distances'][0][i]
+                    distance = results['distances'][query_index][i]
                     similarity = 1 - distance  # Conversion distance -> similarité
                     
                     if similarity >= min_similarity:
-                        metadata = results['metadatas'][0][i]
+                        metadata = results['metadatas'][query_index][i]
                         similar_commands.append({
                             'command_id': command_id,
                             'similarity': similarity,
                             'description': metadata.get('description', ''),
-                            'code': metadata.get('code', '')
+                            'code': metadata.get('code', ''),
+                            'priority': bool(metadata.get('priority', False))
                         })
+                all_similar.append(similar_commands)
             
-            return similar_commands
+            return all_similar
             
         except Exception as e:
             print(f"❌ Erreur lors de la recherche: {e}")
-            return []
+            return [[] for _ in query_embeddings]
     
     def get_best_match(self, query_embedding: np.ndarray, 
                       threshold: float = 0.6) -> Optional[Dict[str, Any]]:
@@ -172,7 +207,7 @@ class EmbeddingManager:
             return False
     
     def update_command(self, command_id: str, description: str, 
-                      code: str, embedding: np.ndarray) -> bool:
+                      code: str, embedding: np.ndarray, priority: bool = False) -> bool:
         """
         Met à jour une commande existante.
         
@@ -181,6 +216,7 @@ class EmbeddingManager:
             description (str): Nouvelle description
             code (str): Nouveau code
             embedding (np.ndarray): Nouvel embedding
+            priority (bool): Commande de sécurité exécutée par la voie prioritaire
             
         Returns:
             bool: True si mis à jour avec succès
@@ -190,7 +226,7 @@ class EmbeddingManager:
             self.collection.delete(ids=[command_id])
             
             # Ajouter la nouvelle version
-            return self.add_command(command_id, description, code, embedding)
+            return self.add_command(command_id, description, code, embedding, priority)
             
         except Exception as e:
             print(f"❌ Erreur lors de la mise à jour de '{command_id}': {e}")
@@ -232,6 +268,7 @@ class EmbeddingManager:
                         'command_id': command_id,
                         'description': metadata.get('description', ''),
                         'code': metadata.get('code', ''),
+                        'priority': bool(metadata.get('priority', False)),
                         'created_at': metadata.get('created_at', ''),
                     })
             
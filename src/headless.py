@@ -0,0 +1,259 @@
+"""
+VoxThymio sans interface graphique.
+
+Chaîne voix -> robot en ligne de commande, pour les petites machines sans
+écran installées à côté des robots :
+
+    python main.py --headless                          # commandes texte sur stdin
+    python main.py --headless --mode mic --daemon      # écoute permanente
+    python main.py --headless --mode file enregistrements/
+
+Chaque commande produit une ligne JSON sur la sortie standard ; les messages
+de diagnostic des modules sont redirigés vers la sortie d'erreur.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import signal
+import sys
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Optional, TextIO, Tuple
+
+from smart_voice_controller import SmartVoiceController
+from controller.thymio_controller import ThymioController
+from controller.simulated_client import SimulatedClientAsync
+from latency import latency_tracker
+
+# Étapes d'initialisation sans reconnaissance vocale (mode texte)
+TEXT_STAGES = ["model", "index", "commands", "warmup"]
+
+# Délai maximal entre deux tentatives de connexion en mode démon (s)
+MAX_CONNECT_DELAY = 30.0
+
+
+class JsonEmitter:
+    """Écrit un événement JSON par ligne."""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+
+    def emit(self, event: str, **fields: Any):
+        record = {"event": event, "ts": datetime.now().isoformat(timespec="milliseconds")}
+        record.update(fields)
+        self.stream.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self.stream.flush()
+
+
+class HeadlessRunner:
+    """Connexion au robot, initialisation puis traitement des entrées."""
+
+    def __init__(self, args: argparse.Namespace, output: TextIO):
+        """
+        Args:
+            args (argparse.Namespace): Options de la ligne de commande
+            output (TextIO): Flux des événements JSON
+        """
+        self.args = args
+        self.emitter = JsonEmitter(output)
+        self.thymio_controller: Optional[ThymioController] = None
+        self.voice_controller: Optional[SmartVoiceController] = None
+        self.stats = {'commands': 0, 'succeeded': 0, 'failed': 0}
+
+    async def run(self) -> int:
+        """
+        Exécute le mode sans interface.
+
+        Returns:
+            int: Code de sortie (0 : succès, 1 : commande en échec,
+                2 : connexion ou initialisation impossible)
+        """
+        args = self.args
+        try:
+            # Aucune connexion ici : le TDM est contacté par _connect()
+            self.thymio_controller = ThymioController(
+                auto_reconnect=args.daemon,
+                client_factory=SimulatedClientAsync if args.simulated else None
+            )
+        except ImportError as e:
+            self.emitter.emit("error", message=str(e))
+            return 2
+        self.thymio_controller.state_listeners.append(
+            lambda state: self.emitter.emit("connection", state=state))
+        self.thymio_controller.timing_listeners.append(latency_tracker.record)
+
+        try:
+            if not await self._connect():
+                self.emitter.emit("error", message="Connexion au Thymio impossible")
+                return 2
+            if args.daemon:
+                self.thymio_controller.start_supervisor()
+
+            if not await self._initialize():
+                return 2
+
+            async for source, text in self._inputs():
+                await self._process(source, text)
+                if args.mode == "mic" and not args.daemon:
+                    break
+        finally:
+            self.thymio_controller.stop_supervisor()
+            await self.thymio_controller.disconnect()
+            self.emitter.emit("stopped", **self.stats)
+
+        return 0 if self.stats['failed'] == 0 else 1
+
+    async def _connect(self) -> bool:
+        """Connexion au robot ; en mode démon, réessaie jusqu'au succès."""
+        delay = 1.0
+        while True:
+            if await self.thymio_controller.connect():
+                return True
+            if not self.args.daemon:
+                return False
+            self.emitter.emit("retry", delay_s=delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_CONNECT_DELAY)
+
+    async def _initialize(self) -> bool:
+        """Charge les modèles (hors de la boucle) et signale la fin de l'initialisation."""
+        self.voice_controller = SmartVoiceController(self.thymio_controller, defer_init=True,
+                                                     intent_server_url=self.args.intent_server)
+        stages = None if self.args.mode in ("mic", "file") else TEXT_STAGES
+
+        loop = asyncio.get_running_loop()
+        try:
+            timings = await loop.run_in_executor(
+                None, lambda: self.voice_controller.initialize(stages=stages))
+        except Exception as e:
+            self.emitter.emit("error", message=f"Initialisation impossible: {e}")
+            return False
+
+        self.emitter.emit("ready", mode=self.args.mode, init_ms=timings,
+                          robots=[robot['id'] for robot in self.thymio_controller.get_nodes()])
+        return True
+
+    async def _inputs(self) -> AsyncIterator[Tuple[str, str]]:
+        """Commandes à traiter : (origine, texte)."""
+        if self.args.mode == "stdin":
+            async for line in self._stdin_lines():
+                yield "stdin", line
+            return
+
+        # stream() rattache chaque texte à l'énoncé mesuré pendant la capture :
+        # stages_ms inclut alors les étapes microphone et asr
+        recognizer = self.voice_controller.speech_recognizer
+        if self.args.mode == "file":
+            if not self.args.paths:
+                self.emitter.emit("error", message="Aucun fichier audio indiqué")
+                return
+            for path in self.args.paths:
+                recognizer.set_source(path)
+                async for text in recognizer.stream():
+                    yield path, text
+        else:
+            recognizer.set_source(None)
+            async for text in recognizer.stream():
+                yield "mic", text
+
+    async def _stdin_lines(self) -> AsyncIterator[str]:
+        """Lignes de l'entrée standard (lecture bloquante hors de la boucle)."""
+        loop = asyncio.get_running_loop()
+        while True:
+            line = await loop.run_in_executor(None, sys.stdin.readline)
+            if not line:
+                return  # Fin de l'entrée
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+    async def _process(self, source: str, text: str):
+        """Traite une commande et émet son résultat."""
+        start = time.perf_counter()
+        result = await self.voice_controller.process_command(text)
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        succeeded = result.get('status') == 'success'
+        self.stats['commands'] += 1
+        self.stats['succeeded' if succeeded else 'failed'] += 1
+
+        waterfall = latency_tracker.last_waterfall()
+        stages = {}
+        if waterfall and waterfall['label'] == text:
+            stages = {stage['stage']: stage['duration_ms'] for stage in waterfall['stages']}
+
+        self.emitter.emit(
+            "command",
+            source=source,
+            input=text,
+            status=result.get('status'),
+            action=result.get('action'),
+            message=result.get('message'),
+            similarity=result.get('similarity'),
+            latency_ms=round(latency_ms, 1),
+            stages_ms=stages
+        )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="voxthymio --headless",
+        description="VoxThymio sans interface : une ligne JSON par commande sur stdout"
+    )
+    parser.add_argument("--mode", choices=("stdin", "mic", "file"), default="stdin",
+                        help="texte sur stdin (défaut), microphone ou fichiers audio")
+    parser.add_argument("paths", nargs="*",
+                        help="fichiers ou répertoires audio (mode file)")
+    parser.add_argument("--daemon", action="store_true",
+                        help="fonctionnement permanent : reconnexion automatique, "
+                             "écoute continue, arrêt propre sur SIGTERM")
+    parser.add_argument("--simulated", action="store_true",
+                        help="robot simulé (sans Thymio ni Thymio Suite)")
+    parser.add_argument("--intent-server", metavar="URL",
+                        help="client léger du serveur d'intentions partagé "
+                             "(par exemple http://127.0.0.1:8765)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Point d'entrée du mode sans interface.
+
+    Args:
+        argv (Optional[List[str]]): Arguments (défaut : sys.argv[1:])
+
+    Returns:
+        int: Code de sortie
+    """
+    args = build_parser().parse_args(argv)
+    output = sys.stdout
+
+    async def run() -> int:
+        runner = HeadlessRunner(args, output)
+        task = asyncio.ensure_future(runner.run())
+
+        # Arrêt propre du démon (indisponible sous Windows)
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, task.cancel)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        try:
+            return await task
+        except asyncio.CancelledError:
+            return 0
+
+    # Les messages des modules ne doivent pas se mêler aux lignes JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            return asyncio.run(run())
+        except KeyboardInterrupt:
+            return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
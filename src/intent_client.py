@@ -0,0 +1,124 @@
+"""
+Client du serveur d'intentions (intent_server.py).
+
+Utilisé par SmartVoiceController en mode client léger : le modèle
+d'embeddings et la base vectorielle sont hébergés une seule fois par le
+serveur, partagé par toutes les interfaces du poste. Chaque thread garde
+sa propre connexion HTTP persistante.
+"""
+
+import http.client
+import json
+import threading
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote, urlsplit
+
+DEFAULT_INTENT_SERVER_URL = "http://127.0.0.1:8765"
+
+
+class IntentClient:
+    """Résolution des commandes par le serveur d'intentions."""
+
+    def __init__(self, url: str = DEFAULT_INTENT_SERVER_URL, timeout: float = 10.0):
+        """
+        Args:
+            url (str): Adresse du serveur (http://hôte:port)
+            timeout (float): Délai maximal d'une requête (s)
+        """
+        parsed = urlsplit(url if "://" in url else f"http://{url}")
+        self.url = url
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 80
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.connection = connection
+        return connection
+
+    def _request(self, method: str, path: str,
+                 payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Envoie une requête et retourne la réponse JSON.
+
+        Raises:
+            ConnectionError: Serveur injoignable
+            RuntimeError: Requête refusée par le serveur
+        """
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+
+        for attempt in range(2):
+            connection = self._connection()
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                data = json.loads(response.read() or b"{}")
+                break
+            except (http.client.HTTPException, OSError) as e:
+                connection.close()
+                self._local.connection = None
+                # Connexion persistante fermée par le serveur : une seule nouvelle tentative
+                if attempt == 1:
+                    raise ConnectionError(f"Serveur d'intentions injoignable ({self.url}): {e}") from e
+
+        if data.get('status') == 'error':
+            raise RuntimeError(data.get('message', f"Erreur du serveur ({response.status})"))
+        return data
+
+    def health(self) -> Dict[str, Any]:
+        """Vérifie que le serveur répond et retourne son état."""
+        return self._request("GET", "/health")
+
+    def resolve(self, text: str, n_results: int = 3,
+                min_similarity: float = 0.4) -> Dict[str, Any]:
+        """
+        Cherche les commandes les plus proches d'un texte.
+
+        Args:
+            text (str): Commande normalisée
+            n_results (int): Nombre maximum de candidats
+            min_similarity (float): Seuil de similarité minimum
+
+        Returns:
+            Dict[str, Any]: {'candidates': [...], 'timings': {'embedding_ms', 'search_ms'}}
+        """
+        return self._request("POST", "/resolve", {
+            'text': text,
+            'n_results': n_results,
+            'min_similarity': min_similarity
+        })
+
+    def list_commands(self) -> List[Dict[str, Any]]:
+        """Retourne toutes les commandes de la base du serveur."""
+        return self._request("GET", "/commands")['commands']
+
+    def add_command(self, command_id: str, description: str, code: str) -> Dict[str, Any]:
+        """Ajoute une commande à la base du serveur."""
+        return self._request("POST", "/commands", {
+            'command_id': command_id,
+            'description': description,
+            'code': code
+        })
+
+    def delete_command(self, command_id: str) -> Dict[str, Any]:
+        """Supprime une commande de la base du serveur."""
+        return self._request("DELETE", f"/commands/{quote(command_id, safe='')}")
+
+    def reload_commands(self) -> Dict[str, Any]:
+        """Demande au serveur d'indexer les commandes ajoutées à commands.json."""
+        return self._request("POST", "/commands/reload")
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistiques de la base, du modèle et du regroupement des requêtes."""
+        return self._request("GET", "/stats")
+
+    def close(self):
+        """Ferme la connexion du thread courant."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
@@ -0,0 +1,330 @@
+"""
+Serveur d'intentions local pour VoxThymio.
+
+Sur un poste partagé, chaque interface chargeait son propre modèle
+d'embeddings et sa propre base vectorielle. Ce serveur les héberge une seule
+fois et résout les commandes pour tous les clients légers du poste
+(SmartVoiceController avec intent_server_url) :
+
+    python src/intent_server.py --port 8765
+
+Les requêtes de résolution reçues en même temps, quel que soit le client,
+sont regroupées : un seul encodage par lot et une seule interrogation de
+l'index. L'exécution sur le robot reste du côté de chaque client.
+
+Points d'accès (HTTP/1.1, JSON, connexions persistantes) :
+
+    GET    /health            état du serveur
+    POST   /resolve           {"text", "n_results", "min_similarity"}
+    GET    /commands          commandes de la base
+    POST   /commands          {"command_id", "description", "code"}
+    DELETE /commands/<id>     suppression d'une commande
+    POST   /commands/reload   indexation des ajouts de commands.json
+    GET    /stats             base, modèle et regroupement des requêtes
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+from smart_voice_controller import SmartVoiceController
+
+# Étapes d'initialisation du serveur (pas de reconnaissance vocale)
+SERVER_STAGES = ["model", "index", "commands", "warmup"]
+
+# Taille maximale d'un corps de requête (octets)
+MAX_BODY_BYTES = 64 * 1024
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+                413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class IntentServer:
+    """Modèle et base vectorielle partagés, résolution par lots."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765,
+                 max_batch: int = 32, batch_window_ms: float = 2.0):
+        """
+        Args:
+            host (str): Adresse d'écoute (locale par défaut)
+            port (int): Port d'écoute
+            max_batch (int): Nombre maximal de requêtes par lot
+            batch_window_ms (float): Attente maximale des requêtes suivantes
+                avant de traiter un lot
+        """
+        self.host = host
+        self.port = port
+        self.max_batch = max_batch
+        self.batch_window = batch_window_ms / 1000
+
+        # Contrôleur sans robot : seules la base et le modèle sont utilisés
+        self.voice_controller = SmartVoiceController(None, defer_init=True)
+
+        # Un seul thread pour le modèle et la base : les lots s'exécutent en série
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="intent")
+        self._pending: Optional[asyncio.Queue] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._batch_task: Optional[asyncio.Task] = None
+
+        self.stats = {'requests': 0, 'batches': 0, 'largest_batch': 0,
+                      'connections': 0, 'active_connections': 0}
+
+    async def start(self):
+        """Charge le modèle et la base, puis ouvre le port d'écoute."""
+        loop = asyncio.get_running_loop()
+        timings = await loop.run_in_executor(
+            self._executor, lambda: self.voice_controller.initialize(stages=SERVER_STAGES))
+
+        self._pending = asyncio.Queue()
+        self._batch_task = asyncio.create_task(self._batch_worker())
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        print(f"✅ Serveur d'intentions prêt sur http://{self.host}:{self.port} "
+              f"({sum(timings.values()):.0f} ms)")
+
+    async def serve_forever(self):
+        """Démarre le serveur et traite les requêtes jusqu'à l'annulation."""
+        await self.start()
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def stop(self):
+        """Ferme le port d'écoute et arrête le traitement des lots."""
+        if self._server is not None:
+            self._server.close()
+        if self._batch_task is not None:
+            self._batch_task.cancel()
+            self._batch_task = None
+        self._executor.shutdown(wait=False)
+
+    # Regroupement des résolutions
+
+    async def resolve(self, text: str, n_results: int = 3,
+                      min_similarity: float = 0.4) -> Dict[str, Any]:
+        """
+        Met une résolution en file et attend le résultat de son lot.
+
+        Args:
+            text (str): Commande normalisée
+            n_results (int): Nombre maximum de candidats
+            min_similarity (float): Seuil de similarité minimum
+
+        Returns:
+            Dict[str, Any]: {'candidates': [...], 'timings': {...}, 'batch_size': int}
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._pending.put((text, n_results, min_similarity, future))
+        return await future
+
+    async def _batch_worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._pending.get()]
+
+            # Requêtes déjà en attente, puis celles qui arrivent dans la fenêtre
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                if not self._pending.empty():
+                    batch.append(self._pending.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._pending.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            self.stats['batches'] += 1
+            self.stats['largest_batch'] = max(self.stats['largest_batch'], len(batch))
+
+            try:
+                results = await loop.run_in_executor(self._executor, self._resolve_batch, batch)
+            except Exception as e:
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (*_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def _resolve_batch(self, batch: List[Tuple[str, int, float, asyncio.Future]]) -> List[Dict[str, Any]]:
+        """Encode les textes du lot et interroge l'index en une fois (thread du modèle)."""
+        voice = self.voice_controller
+
+        start = time.perf_counter()
+        embeddings = voice.embedding_generator.generate_embeddings_batch([item[0] for item in batch])
+        embedded = time.perf_counter()
+
+        # Une interrogation pour tout le lot, filtrée ensuite par requête
+        n_results = max(item[1] for item in batch)
+        min_similarity = min(item[2] for item in batch)
+        matches = voice.vector_db.search_similar_commands_batch(embeddings, n_results, min_similarity)
+        end = time.perf_counter()
+
+        timings = {'embedding_ms': round((embedded - start) * 1000, 2),
+                   'search_ms': round((end - embedded) * 1000, 2)}
+        return [
+            {
+                'candidates': [match for match in candidates
+                               if match['similarity'] >= item_min][:item_n],
+                'timings': timings,
+                'batch_size': len(batch)
+            }
+            for (_, item_n, item_min, _), candidates in zip(batch, matches)
+        ]
+
+    # HTTP
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.stats['connections'] += 1
+        self.stats['active_connections'] += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_BYTES:
+                    self._write_response(writer, 413, {'status': 'error',
+                                                       'message': 'Requête trop volumineuse'}, False)
+                    await writer.drain()
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self._route(method.upper(), path, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self.stats['active_connections'] -= 1
+            writer.close()
+
+    @staticmethod
+    def _write_response(writer: asyncio.StreamWriter, status: int,
+                        payload: Dict[str, Any], keep_alive: bool):
+        body = json.dumps(payload, ensure_ascii=False, default=float).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        """Exécute une requête et retourne (code HTTP, réponse)."""
+        path = path.split("?", 1)[0].rstrip("/") or "/"
+        loop = asyncio.get_running_loop()
+        voice = self.voice_controller
+
+        try:
+            payload = json.loads(body) if body else {}
+        except json.JSONDecodeError:
+            return 400, {'status': 'error', 'message': 'JSON invalide'}
+
+        try:
+            if method == "GET" and path == "/health":
+                return 200, {'status': 'success', 'ready': voice.ready_stages >= set(SERVER_STAGES),
+                             **self.stats}
+
+            if method == "POST" and path == "/resolve":
+                text = str(payload.get('text', '')).strip()
+                if not text:
+                    return 400, {'status': 'error', 'message': 'Commande vide reçue.'}
+                self.stats['requests'] += 1
+                result = await self.resolve(text,
+                                            int(payload.get('n_results', 3)),
+                                            float(payload.get('min_similarity', 0.4)))
+                return 200, {'status': 'success', **result}
+
+            if method == "GET" and path == "/commands":
+                commands = await loop.run_in_executor(self._executor, voice.get_all_commands)
+                return 200, {'status': 'success', 'commands': commands}
+
+            if method == "POST" and path == "/commands":
+                return await loop.run_in_executor(self._executor, self._add_command, payload)
+
+            if method == "POST" and path == "/commands/reload":
+                count = await loop.run_in_executor(self._executor, self._reload_commands)
+                return 200, {'status': 'success', 'total_commands': count}
+
+            if method == "DELETE" and path.startswith("/commands/"):
+                command_id = unquote(path[len("/commands/"):])
+                result = await loop.run_in_executor(self._executor, voice.delete_command, command_id)
+                return (200 if result['status'] == 'success' else 404), result
+
+            if method == "GET" and path == "/stats":
+                database = await loop.run_in_executor(self._executor, voice.vector_db.get_stats)
+                return 200, {'status': 'success',
+                             'database': database,
+                             'embedding_model': voice.embedding_generator.get_model_info(),
+                             'server': dict(self.stats)}
+
+            return 404, {'status': 'error', 'message': f'Point d\'accès inconnu: {method} {path}'}
+
+        except (ValueError, KeyError, TypeError) as e:
+            return 400, {'status': 'error', 'message': f'Requête invalide: {e}'}
+        except Exception as e:
+            print(f"❌ Erreur du serveur d'intentions: {e}")
+            return 500, {'status': 'error', 'message': f'Erreur interne: {e}'}
+
+    def _add_command(self, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """Ajoute une commande (contrôle des doublons du contrôleur vocal)."""
+        result = self.voice_controller.add_new_command(
+            payload['command_id'], payload['description'], payload.get('code', ''))
+        return 200, result
+
+    def _reload_commands(self) -> int:
+        """Relit commands.json et indexe les commandes absentes de la base."""
+        voice = self.voice_controller
+        voice.default_commands = voice._read_commands()
+        voice._load_commands()
+        return voice.vector_db.get_stats().get('total_commands', 0)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Point d'entrée du serveur d'intentions."""
+    parser = argparse.ArgumentParser(description="VoxThymio - serveur d'intentions partagé")
+    parser.add_argument("--host", default="127.0.0.1", help="adresse d'écoute (défaut: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="port d'écoute (défaut: 8765)")
+    parser.add_argument("--max-batch", type=int, default=32,
+                        help="nombre maximal de requêtes par lot")
+    parser.add_argument("--batch-window-ms", type=float, default=2.0,
+                        help="attente maximale des requêtes suivantes avant un lot (ms)")
+    args = parser.parse_args(argv)
+
+    server = IntentServer(args.host, args.port, args.max_batch, args.batch_window_ms)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("\n🛑 Serveur d'intentions arrêté")
+    except OSError as e:
+        print(f"❌ Impossible d'ouvrir le port {args.port}: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
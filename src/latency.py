@@ -0,0 +1,180 @@
+"""
+Mesure de la latence du pipeline voix -> robot.
+
+Chaque étape (microphone, reconnaissance vocale, embedding, recherche dans
+l'index, envoi au robot) enregistre sa durée dans le suivi partagé du
+processus. Le suivi conserve une fenêtre glissante par étape pour les
+percentiles p50/p95/p99 et, pour chaque énoncé, la cascade de ses étapes.
+
+L'énoncé en cours est porté par une variable de contexte : il suit la tâche
+asyncio qui traite la commande et les appels exécutés avec
+contextvars.copy_context().run dans un thread.
+
+Exemple :
+
+    from latency import latency_tracker
+
+    with latency_tracker.measure("embedding"):
+        embedding = model.encode(text)
+"""
+
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Étapes du pipeline, dans l'ordre d'exécution
+STAGES = ("microphone", "asr", "embedding", "search", "robot")
+
+_current_utterance: contextvars.ContextVar = contextvars.ContextVar("latency_utterance", default=None)
+
+
+class Utterance:
+    """Cascade des étapes d'un énoncé."""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.start = time.perf_counter()
+        self.stages: List[Tuple[str, float, float]] = []  # (étape, début, fin)
+        self.total_ms: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Étapes en millisecondes, relatives au début de l'énoncé."""
+        return {
+            'label': self.label,
+            'total_ms': round(self.total_ms, 1) if self.total_ms is not None else None,
+            'stages': [
+                {
+                    'stage': stage,
+                    'offset_ms': round((start - self.start) * 1000, 1),
+                    'duration_ms': round((end - start) * 1000, 1)
+                }
+                for stage, start, end in self.stages
+            ]
+        }
+
+
+class LatencyTracker:
+    """Percentiles glissants par étape et cascades des derniers énoncés."""
+
+    def __init__(self, window: int = 200, history: int = 20):
+        """
+        Args:
+            window (int): Échantillons conservés par étape
+            history (int): Nombre d'énoncés conservés
+        """
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+        self._history: Deque[Utterance] = deque(maxlen=history)
+
+        # Incrémenté à chaque mesure : l'interface ne redessine qu'en cas de changement
+        self.version = 0
+
+    def record(self, stage: str, start: float, end: float):
+        """
+        Enregistre une durée d'étape (horodatages time.perf_counter).
+
+        Args:
+            stage (str): Nom de l'étape
+            start (float): Début
+            end (float): Fin
+        """
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+            samples.append((end - start) * 1000)
+
+            utterance = _current_utterance.get()
+            if utterance is not None and utterance.total_ms is None:
+                utterance.stages.append((stage, start, end))
+            self.version += 1
+
+    @contextmanager
+    def measure(self, stage: str):
+        """Mesure la durée du bloc comme une étape."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, start, time.perf_counter())
+
+    # Énoncés
+
+    def begin(self, label: str = "") -> Utterance:
+        """Ouvre un énoncé : les étapes suivantes du même contexte s'y rattachent."""
+        utterance = Utterance(label)
+        _current_utterance.set(utterance)
+        return utterance
+
+    def attach(self, utterance: Optional[Utterance]):
+        """Rattache le contexte courant (autre thread, autre tâche) à un énoncé."""
+        _current_utterance.set(utterance)
+
+    @staticmethod
+    def current() -> Optional[Utterance]:
+        """Énoncé ouvert dans le contexte courant, ou None."""
+        utterance = _current_utterance.get()
+        return utterance if utterance is not None and utterance.total_ms is None else None
+
+    def finish(self, utterance: Optional[Utterance] = None):
+        """Clôt un énoncé (par défaut celui du contexte) et l'ajoute à l'historique."""
+        utterance = utterance or self.current()
+        if utterance is None or utterance.total_ms is not None:
+            return
+        with self._lock:
+            utterance.total_ms = (time.perf_counter() - utterance.start) * 1000
+            self._history.append(utterance)
+            self.version += 1
+        if _current_utterance.get() is utterance:
+            _current_utterance.set(None)
+
+    # Lecture
+
+    def percentiles(self) -> Dict[str, Dict[str, float]]:
+        """
+        Percentiles glissants par étape.
+
+        Returns:
+            Dict[str, Dict[str, float]]: étape -> {'count', 'p50', 'p95', 'p99'} (ms)
+        """
+        with self._lock:
+            snapshot = {stage: np.fromiter(samples, dtype=np.float64)
+                        for stage, samples in self._samples.items() if samples}
+
+        stats = {}
+        for stage, values in snapshot.items():
+            p50, p95, p99 = np.percentile(values, (50, 95, 99))
+            stats[stage] = {
+                'count': int(values.size),
+                'p50': round(float(p50), 1),
+                'p95': round(float(p95), 1),
+                'p99': round(float(p99), 1)
+            }
+        return stats
+
+    def waterfalls(self) -> List[Dict[str, Any]]:
+        """Cascades des derniers énoncés, du plus ancien au plus récent."""
+        with self._lock:
+            return [utterance.to_dict() for utterance in self._history]
+
+    def last_waterfall(self) -> Optional[Dict[str, Any]]:
+        """Cascade du dernier énoncé terminé, ou None."""
+        with self._lock:
+            return self._history[-1].to_dict() if self._history else None
+
+    def reset(self):
+        """Efface toutes les mesures."""
+        with self._lock:
+            self._samples.clear()
+            self._history.clear()
+            self.version += 1
+
+
+# Suivi partagé par tous les modules du processus
+latency_tracker = LatencyTracker()
@@ -3,14 +3,19 @@ Contrôleur vocal pour VoxThymio permettant d'ajouter dynamiquement des commande
 """
 
 import asyncio
-import json
-from typing import Dict, Any, List
-from pathlib import Path
+import contextvars
+import re
+import time
+from typing import Dict, Any, List, Optional, Callable
 
 from embedding_generator import EmbeddingGenerator
 from embedding_manager import EmbeddingManager
 from speech_recognizer import SpeechRecognizer
+from intent_client import IntentClient
+from latency import latency_tracker
 from controller.thymio_controller import ThymioController
+from controller.macros import compile_macro
+from controller.command_store import CommandStore
 
 
 class SmartVoiceController:
@@ -18,36 +23,153 @@ class SmartVoiceController:
     Contrôleur vocal pour la compréhension et l'exécution de commandes.
     """
     
-    def __init__(self, thymio_controller: ThymioController):
+    # Étapes d'initialisation, dans l'ordre d'exécution
+    INIT_STAGES = ("model", "index", "commands", "speech", "warmup")
+    
+    # Étapes dont dépend le mode vocal (le préchauffage n'en fait pas partie)
+    VOICE_STAGES = {"model", "index", "commands", "speech"}
+    
+    def __init__(self, thymio_controller: ThymioController, defer_init: bool = False,
+                 intent_server_url: Optional[str] = None):
         """
         Initialise le contrôleur vocal.
         
         Args:
             thymio_controller (ThymioController): Contrôleur de communication avec Thymio
+            defer_init (bool): Ne pas charger les modèles ; appeler initialize()
+                plus tard, par exemple depuis un thread d'arrière-plan
+            intent_server_url (Optional[str]): Client léger : les commandes sont
+                résolues par le serveur d'intentions partagé (intent_server.py)
+                au lieu de charger le modèle et la base dans ce processus
         """
         self.thymio_controller = thymio_controller
+        self.intent_server_url = intent_server_url
         
-        # Gestionnaires
-        print("🔧 Initialisation du système...")
-        self.embedding_generator = EmbeddingGenerator()
-        self.vector_db = EmbeddingManager()
-        
-        # Reconnaissance vocale
-        self.speech_recognizer = SpeechRecognizer(language="fr-FR")
+        # Gestionnaires, créés par les étapes d'initialisation
+        self.embedding_generator: Optional[EmbeddingGenerator] = None
+        self.vector_db: Optional[EmbeddingManager] = None
+        self.intent_client: Optional[IntentClient] = None
+        self.speech_recognizer: Optional[SpeechRecognizer] = None
         self.is_voice_active = False
         
+        # Étapes terminées et leur durée (ms)
+        self.ready_stages = set()
+        self.init_timings: Dict[str, float] = {}
+        
         # Configuration des seuils
         self.EXECUTION_THRESHOLD = 0.5   # Seuil pour exécuter une commande
         self.LEARNING_THRESHOLD = 0.85   # Seuil pour apprendre automatiquement
+        self.SUGGESTION_THRESHOLD = 0.4  # Seuil des suggestions pour une commande inconnue
         
         # État du système
         self.is_learning_mode = False
         self.pending_command = None
         
-        # Initialisation avec les commandes en mémoire
-        self._load_commands()
+        # Voie prioritaire : commandes de sécurité (id -> commande) et mots-clés
+        # qui les déclenchent sans passer par les embeddings
+        self.priority_commands: Dict[str, Dict[str, Any]] = {}
+        self.priority_keywords: Dict[str, str] = {}
+        self.priority_latencies: List[float] = []
+        
+        # Lecture de commands.json : les commandes prioritaires sont
+        # utilisables avant même le chargement des modèles
+        self.default_commands = self._read_commands()
+        
+        if not defer_init:
+            self.initialize()
+
+    def initialize(self, progress: Optional[Callable[[str, str, float], None]] = None,
+                   stages: Optional[List[str]] = None) -> Dict[str, float]:
+        """
+        Exécute les étapes d'initialisation (bloquant).
+        
+        Args:
+            progress (Optional[Callable[[str, str, float], None]]): Appelé avec
+                (étape, statut, durée en ms) ; statut vaut 'start', 'done' ou 'error'
+            stages (Optional[List[str]]): Étapes à exécuter (défaut : toutes,
+                par exemple sans 'speech' pour des commandes textuelles)
+            
+        Returns:
+            Dict[str, float]: Durée de chaque étape en millisecondes
+        
+        Raises:
+            Exception: Erreur de l'étape en échec (les étapes suivantes ne sont pas exécutées)
+        """
+        steps = {
+            "model": self._init_model,
+            "index": self._init_index,
+            "commands": self._load_commands,
+            "speech": self._init_speech,
+            "warmup": self._warm_up,
+        }
+        
+        def notify(stage, status, elapsed_ms=0.0):
+            if progress is not None:
+                try:
+                    progress(stage, status, elapsed_ms)
+                except Exception as e:
+                    print(f"⚠️ Erreur dans le suivi d'initialisation: {e}")
+        
+        print("🔧 Initialisation du système...")
+        for stage in self.INIT_STAGES:
+            if stage in self.ready_stages or (stages is not None and stage not in stages):
+                continue
+            
+            notify(stage, "start")
+            start = time.perf_counter()
+            try:
+                steps[stage]()
+            except Exception as e:
+                print(f"❌ Échec de l'étape d'initialisation '{stage}': {e}")
+                notify(stage, "error", (time.perf_counter() - start) * 1000)
+                raise
+            
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.init_timings[stage] = round(elapsed_ms, 1)
+            self.ready_stages.add(stage)
+            notify(stage, "done", elapsed_ms)
+
+        print(f"✅ Système initialisé ({sum(self.init_timings.values()):.0f} ms).")
+        return dict(self.init_timings)
+
+    @property
+    def is_voice_ready(self) -> bool:
+        """Indique si le mode vocal peut être activé."""
+        return self.VOICE_STAGES <= self.ready_stages
 
-        print("✅ Système initialisé.")
+    def _init_model(self):
+        """Étape 'model' : chargement du modèle d'embeddings (ou connexion au serveur)."""
+        if self.intent_server_url:
+            self.intent_client = IntentClient(self.intent_server_url)
+            self.intent_client.health()
+            print(f"✅ Serveur d'intentions joignable ({self.intent_server_url}).")
+            return
+        self.embedding_generator = EmbeddingGenerator()
+
+    def _init_index(self):
+        """Étape 'index' : ouverture de la base vectorielle (hébergée par le serveur en client léger)."""
+        if self.intent_client is not None:
+            return
+        self.vector_db = EmbeddingManager()
+
+    def _init_speech(self):
+        """Étape 'speech' : moteur de reconnaissance vocale chargé d'avance."""
+        self.speech_recognizer = SpeechRecognizer(language="fr-FR")
+        self.speech_recognizer.load()
+
+    def _warm_up(self):
+        """
+        Étape 'warmup' : une inférence et une recherche sur un lot factice,
+        pour que la première vraie commande ne paie pas l'initialisation
+        paresseuse de PyTorch et de l'index.
+        """
+        samples = [info['description'] for info in self.default_commands.values()][:4]
+        if self.intent_client is not None:
+            # Connexion persistante ouverte d'avance
+            self.intent_client.resolve(samples[0] if samples else "avance")
+            return
+        embeddings = self.embedding_generator.generate_embeddings_batch(samples or ["avance"])
+        self.vector_db.search_similar_commands(embeddings[0], n_results=1)
 
     async def process_command(self, user_input: str) -> Dict[str, Any]:
         """
@@ -59,7 +181,16 @@ class SmartVoiceController:
         Returns:
             Dict[str, Any]: Résultat du traitement
         """
+        # Cascade de latence : énoncé ouvert par l'écoute, sinon nouvel énoncé
+        utterance = latency_tracker.current() or latency_tracker.begin()
+        utterance.label = (user_input or "").strip()
+        try:
+            return await self._process_command(user_input)
+        finally:
+            latency_tracker.finish(utterance)
 
+    async def _process_command(self, user_input: str) -> Dict[str, Any]:
+        """Traitement d'une commande (voir process_command)."""
         # Vérification de la validité de la commande
         if not user_input or not user_input.strip():
             return {
@@ -72,14 +203,26 @@ class SmartVoiceController:
         user_input = user_input.lower().strip()
         print(f"Traitement de: '{user_input}'")
         
+        # Commande de sécurité reconnue par mot-clé : ni embedding ni recherche
+        priority_id = self._match_priority_keyword(user_input)
+        if priority_id:
+            return await self._execute_priority(priority_id, time.perf_counter())
+        
+        if not {"model", "index", "commands"} <= self.ready_stages:
+            return {
+                'status': 'error',
+                'message': "Système en cours d'initialisation.",
+                'action': 'none'
+            }
+        
+        # Les calculs bloquants (modèle, base vectorielle) tournent hors de la boucle
+        loop = asyncio.get_running_loop()
+        
         try:
-            # Génération de l'embedding de la requête
-            query_embedding = self.embedding_generator.generate_embedding(user_input)
-            
-            # Recherche de similarité
-            best_match = self.vector_db.get_best_match(
-                query_embedding, 
-                threshold=self.EXECUTION_THRESHOLD
+            # Génération de l'embedding et recherche de similarité
+            # Le contexte est copié pour rattacher les mesures à l'énoncé
+            best_match, candidates = await loop.run_in_executor(
+                None, contextvars.copy_context().run, self._resolve_command, user_input
             )
             
             if best_match:
@@ -90,11 +233,11 @@ class SmartVoiceController:
                     print(f"🔍 Apprentissage de la commande: '{user_input}' (similarité: {similarity:.2f})")
                     
                     # Ajout de la nouvelle commande
-                    self.add_new_command(
-                        command_id=f"custom_{len(self.vector_db.get_all_commands()) + 1}",
+                    await loop.run_in_executor(None, lambda: self.add_new_command(
+                        command_id=f"custom_{len(self.get_all_commands()) + 1}",
                         description=user_input,
                         code=self.pending_command or "motor.left.target = 0\nmotor.right.target = 0"
-                    )
+                    ))
 
                 # Exécution directe si seuil atteint
                 if similarity >= self.EXECUTION_THRESHOLD:
@@ -102,7 +245,7 @@ class SmartVoiceController:
                     
             else:
                 # Aucune commande correspondante trouvée
-                return self._handle_unknown_command(user_input, query_embedding)
+                return self._handle_unknown_command(user_input, candidates)
                 
         except Exception as e:
             print(f"❌ Erreur lors du traitement: {e}")
@@ -112,6 +255,93 @@ class SmartVoiceController:
                 'action': 'none'
             }
 
+    def _match_priority_keyword(self, user_input: str) -> Optional[str]:
+        """
+        Cherche un mot-clé de commande prioritaire dans l'entrée.
+        
+        Args:
+            user_input (str): Commande normalisée
+            
+        Returns:
+            Optional[str]: Identifiant de la commande prioritaire ou None
+        """
+        for word in re.findall(r"[\w']+", user_input):
+            command_id = self.priority_keywords.get(word)
+            if command_id:
+                return command_id
+        return None
+
+    async def _execute_priority(self, command_id: str, start: float) -> Dict[str, Any]:
+        """
+        Exécute une commande de sécurité par la voie prioritaire du robot.
+        
+        Args:
+            command_id (str): Identifiant de la commande prioritaire
+            start (float): Instant de réception de la commande (perf_counter)
+            
+        Returns:
+            Dict[str, Any]: Résultat de l'exécution
+        """
+        command = self.priority_commands[command_id]
+        print(f"🛑 Commande prioritaire '{command_id}'")
+        
+        success = await self.thymio_controller.execute_code(command['code'], priority=True)
+        self.priority_latencies = (self.priority_latencies + [time.perf_counter() - start])[-100:]
+        
+        if not success:
+            return {
+                'status': 'error',
+                'message': f'Échec de l\'exécution de la commande "{command_id}".',
+                'action': 'failed',
+                'command_id': command_id
+            }
+        return {
+            'status': 'success',
+            'message': f'Commande "{command_id}" exécutée avec succès.',
+            'action': 'executed',
+            'command_id': command_id,
+            'similarity': 1.0,
+            'description': command['description'],
+            'priority': True
+        }
+
+    def _resolve_command(self, user_input: str):
+        """
+        Cherche les commandes les plus proches d'une requête, localement ou
+        par le serveur d'intentions. Une seule recherche fournit la commande
+        à exécuter et les suggestions.
+        
+        Args:
+            user_input (str): Commande normalisée
+            
+        Returns:
+            Tuple: (meilleure correspondance ou None, candidats par similarité décroissante)
+        """
+        min_similarity = min(self.EXECUTION_THRESHOLD, self.SUGGESTION_THRESHOLD)
+        
+        if self.intent_client is not None:
+            result = self.intent_client.resolve(user_input, n_results=3,
+                                                min_similarity=min_similarity)
+            candidates = result['candidates']
+            
+            # Durées mesurées par le serveur, placées à la fin de la requête
+            end = time.perf_counter()
+            search_s = result['timings']['search_ms'] / 1000
+            embedding_s = result['timings']['embedding_ms'] / 1000
+            latency_tracker.record("embedding", end - search_s - embedding_s, end - search_s)
+            latency_tracker.record("search", end - search_s, end)
+        else:
+            query_embedding = self.embedding_generator.generate_embedding(user_input)
+            candidates = self.vector_db.search_similar_commands(
+                query_embedding,
+                n_results=3,
+                min_similarity=min_similarity
+            )
+        
+        if candidates and candidates[0]['similarity'] >= self.EXECUTION_THRESHOLD:
+            return candidates[0], candidates
+        return None, candidates
+
     async def _execute_command(self, command_match: Dict[str, Any], 
                              similarity: float) -> Dict[str, Any]:
         """
@@ -127,13 +357,14 @@ class SmartVoiceController:
         command_id = command_match['command_id']
         code = command_match['code']
         description = command_match['description']
+        priority = command_match.get('priority', False) or command_id in self.priority_commands
         
         print(f"🚀 Exécution de '{command_id}' (similarité: {similarity:.2f})")
         print(f"📝 Description: {description}")
         
         try:
             # Exécution du code sur Thymio
-            await self.thymio_controller.execute_code(code)
+            await self.thymio_controller.execute_code(code, priority=priority)
             return {
                 'status': 'success',
                 'message': f'Commande "{command_id}" exécutée avec succès.',
@@ -151,23 +382,20 @@ class SmartVoiceController:
             }
    
     def _handle_unknown_command(self, user_input: str, 
-                                    query_embedding) -> Dict[str, Any]:
+                                    candidates: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Gère une commande inconnue.
         
         Args:
             user_input (str): Commande de l'utilisateur
-            query_embedding: Embedding de la requête
+            candidates (List[Dict[str, Any]]): Commandes proches trouvées par la recherche
             
         Returns:
             Dict[str, Any]: Résultat du traitement
         """
-        # Recherche de commandes similaires pour suggestions avec un seuil bas
-        similar_commands = self.vector_db.search_similar_commands(
-            query_embedding, 
-            n_results=3, 
-            min_similarity=0.4  # Seuil bas pour obtenir des suggestions pertinentes
-        )
+        # Suggestions : commandes au-dessus d'un seuil bas
+        similar_commands = [cmd for cmd in candidates
+                            if cmd['similarity'] >= self.SUGGESTION_THRESHOLD]
         
         suggestions = [
             f"'{cmd['description']}' (similarité: {cmd['similarity']:.2f})"
@@ -197,8 +425,22 @@ class SmartVoiceController:
             code (str): Code Thymio associé
             
         Returns:
-            Dict[str, Any]: Résultat de l'ajout
+            Dict[str, Any]: Résultat de l'ajout ('success', 'warning' si une
+                commande très proche existe déjà, 'error')
         """
+        if self.intent_client is not None:
+            try:
+                result = self.intent_client.add_command(command_id, description, code)
+                print(f"{'✅' if result['status'] == 'success' else '⚠️'} {result['message']}")
+                return result
+            except Exception as e:
+                print(f"❌ Erreur lors de l'ajout de la commande '{command_id}': {e}")
+                return {
+                    'status': 'error',
+                    'message': f'Échec de l\'ajout de "{command_id}": {e}',
+                    'action': 'failed'
+                }
+        
         try:
             # Génération de l'embedding
             embedding = self.embedding_generator.generate_embedding(description)
@@ -215,16 +457,38 @@ class SmartVoiceController:
             )
             
             if similar_commands and similar_commands[0]['similarity'] > 0.9:
-                print(f"⚠️ Commande similaire trouvée: {similar_commands[0]['description']} (ID: {similar_commands[0]['command_id']})")
-                return
+                similar = similar_commands[0]
+                print(f"⚠️ Commande similaire trouvée: {similar['description']} (ID: {similar['command_id']})")
+                return {
+                    'status': 'warning',
+                    'message': f'Commande similaire déjà présente: "{similar["description"]}" '
+                               f'(ID: {similar["command_id"]}).',
+                    'action': 'skipped',
+                    'command_id': similar['command_id']
+                }
             
             # Ajout à la base vectorielle
             if self.vector_db.add_command(command_id, description, code, embedding):
-               print(f"✅ Commande '{command_id}' ajoutée avec succès.")
-            else:
-                print(f"❌ Échec de l'ajout de la commande '{command_id}'.")    
+                print(f"✅ Commande '{command_id}' ajoutée avec succès.")
+                return {
+                    'status': 'success',
+                    'message': f'Commande "{command_id}" ajoutée.',
+                    'action': 'added',
+                    'command_id': command_id
+                }
+            print(f"❌ Échec de l'ajout de la commande '{command_id}'.")
+            return {
+                'status': 'error',
+                'message': f'Échec de l\'ajout de "{command_id}".',
+                'action': 'failed'
+            }
         except Exception as e:
             print(f"❌ Erreur lors de l'ajout de la commande '{command_id}': {e}")
+            return {
+                'status': 'error',
+                'message': f'Erreur lors de l\'ajout de "{command_id}": {e}',
+                'action': 'failed'
+            }
 
     def get_all_commands(self) -> List[Dict[str, Any]]:
         """
@@ -233,6 +497,8 @@ class SmartVoiceController:
         Returns:
             List[Dict[str, Any]]: Liste des commandes
         """
+        if self.intent_client is not None:
+            return self.intent_client.list_commands()
         return self.vector_db.get_all_commands()
     
     def delete_command(self, command_id: str) -> Dict[str, Any]:
@@ -245,6 +511,16 @@ class SmartVoiceController:
         Returns:
             Dict[str, Any]: Résultat de la suppression
         """
+        if self.intent_client is not None:
+            try:
+                return self.intent_client.delete_command(command_id)
+            except Exception as e:
+                return {
+                    'status': 'error',
+                    'message': f'Échec de la suppression de "{command_id}": {e}',
+                    'action': 'failed'
+                }
+        
         if self.vector_db.delete_command(command_id):
             return {
                 'status': 'success',
@@ -265,8 +541,23 @@ class SmartVoiceController:
         Returns:
             Dict[str, Any]: Statistiques du système
         """
-        db_stats = self.vector_db.get_stats()
-        embedding_info = self.embedding_generator.get_model_info()
+        if self.intent_client is not None:
+            remote = self.intent_client.stats()
+            db_stats = remote['database']
+            embedding_info = dict(remote['embedding_model'], server=remote['server'])
+        else:
+            db_stats = self.vector_db.get_stats()
+            embedding_info = self.embedding_generator.get_model_info()
+        
+        # Latence des arrêts, de la réception du texte à l'écriture sur le robot
+        latencies = [value * 1000 for value in self.priority_latencies]
+        priority_stats = {'count': len(latencies)}
+        if latencies:
+            priority_stats.update({
+                'mean_ms': round(sum(latencies) / len(latencies), 2),
+                'max_ms': round(max(latencies), 2),
+                'robot': self.thymio_controller.get_priority_stats()
+            })
         
         return {
             'database': db_stats,
@@ -274,33 +565,83 @@ class SmartVoiceController:
             'thresholds': {
                 'execution': self.EXECUTION_THRESHOLD,
                 'learning': self.LEARNING_THRESHOLD
-            }
+            },
+            'priority': priority_stats,
+            'latency': latency_tracker.percentiles(),
+            'init_ms': dict(self.init_timings)
         }
     
-    def _load_commands(self):
+    def _read_commands(self) -> Dict[str, Dict[str, Any]]:
         """
-        Charge les commandes depuis commands.json.
+        Lit commands.json et enregistre les commandes prioritaires.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: id -> {'description', 'code', 'priority'}
         """
-        commands_file = Path(__file__).parent / "commands.json"
+        store = CommandStore()
         
-        if not commands_file.exists():
-            print(f"⚠️ Fichier commands.json non trouvé à {commands_file}. Aucune commande chargée.")
-            return
+        if not store.path.exists() and not store.journal_path.exists():
+            print(f"⚠️ Fichier commands.json non trouvé à {store.path}. Aucune commande chargée.")
+            return {}
 
+        loaded = {}
         try:
-            with open(commands_file, 'r', encoding='utf-8') as f:
-                commands = json.load(f)
+            commands = store.load()
+
+            # Code des commandes simples, référencées par les macros
+            command_codes = {
+                cmd_id: cmd_info["code"] for cmd_id, cmd_info in commands.items() if "code" in cmd_info
+            }
 
-            added_count = 0
             for cmd_id, cmd_info in commands.items():
                 description = cmd_info["description"]
-                code = cmd_info["code"]
+                if "macro" in cmd_info:
+                    # Séquence temporisée compilée en un seul programme Aseba
+                    code = compile_macro(cmd_info["macro"], command_codes)
+                else:
+                    code = cmd_info["code"]
+                priority = cmd_info.get("priority", False)
 
-                # Vérifier si la commande existe déjà
-                if not self.vector_db.command_exists(cmd_id):
-                    embedding = self.embedding_generator.generate_embedding(description)
-                    if self.vector_db.add_command(cmd_id, description, code, embedding):
-                        added_count += 1
+                if priority:
+                    self.priority_commands[cmd_id] = {'code': code, 'description': description}
+                    for keyword in cmd_info.get("keywords", []):
+                        self.priority_keywords[keyword.lower()] = cmd_id
+
+                loaded[cmd_id] = {'description': description, 'code': code, 'priority': priority}
+                        
+        except Exception as e:
+            print(f"❌ Erreur lors du chargement des commandes par défaut: {e}")
+        
+        return loaded
+
+    def _load_commands(self):
+        """
+        Ajoute à la base vectorielle les commandes de commands.json absentes,
+        encodées en un seul lot.
+        """
+        if self.intent_client is not None:
+            # Le serveur indexe les commandes enregistrées depuis son démarrage
+            result = self.intent_client.reload_commands()
+            print(f"📚 {result['total_commands']} commande(s) sur le serveur d'intentions")
+            return
+        
+        missing = [cmd_id for cmd_id in self.default_commands
+                   if not self.vector_db.command_exists(cmd_id)]
+        if not missing:
+            return
+
+        try:
+            embeddings = self.embedding_generator.generate_embeddings_batch(
+                [self.default_commands[cmd_id]['description'] for cmd_id in missing]
+            )
+            
+            added_count = 0
+            for cmd_id, embedding in zip(missing, embeddings):
+                info = self.default_commands[cmd_id]
+                if self.vector_db.add_command(cmd_id, info['description'], info['code'],
+                                              embedding, info['priority']):
+                    added_count += 1
+            print(f"📚 {added_count} commande(s) ajoutée(s) à la base")
                         
         except Exception as e:
             print(f"❌ Erreur lors du chargement des commandes par défaut: {e}")
@@ -358,19 +699,25 @@ class SmartVoiceController:
                 'message': 'La reconnaissance vocale est déjà active'
             }
         
+        self.is_voice_active = True
         try:
-            while True:
-                # Lance la reconnaissance vocale
-                text = self.speech_recognizer.listen()
-                if text:
-                    print(f"🎤 Commande vocale reconnue: '{text}'")
-                    await self._on_voice_command_recognized(text)    
+            # Flux asynchrone : la capture ne bloque jamais la boucle ; chaque
+            # texte arrive rattaché à son énoncé (étapes micro et reconnaissance)
+            async for text in self.speech_recognizer.stream():
+                await self._on_voice_command_recognized(text)
+            
+            return {
+                'status': 'success',
+                'message': 'Source audio épuisée, reconnaissance vocale terminée'
+            }
         except Exception as e:
             return {
                 'status': 'error',
                 'message': f'Erreur lors de l\'activation: {str(e)}',
                 'action': 'voice_error'
             }
+        finally:
+            self.is_voice_active = False
     
     async def _on_voice_command_recognized(self, text: str):
         """
@@ -403,7 +750,6 @@ class SmartVoiceController:
 
 if __name__ == "__main__":
     import asyncio
-    from pathlib import Path
     from controller.thymio_controller import ThymioController
 
     async def run_test():
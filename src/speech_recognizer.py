@@ -3,42 +3,493 @@ Module de reconnaissance vocale.
 """
 
 import time
+import json
+import importlib.util
+import asyncio
 import logging
+import threading
 import numpy as np
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Union, Tuple, Callable, AsyncIterator
 from pathlib import Path
 
+from audio_sources import DirectorySource, open_source, read_audio_file
+from latency import latency_tracker
+
 USE_FASTER_WHISPER = False
 
+# Seule la présence des moteurs est vérifiée ici : ils sont importés au
+# premier besoin (_import_backend) pour que l'import du module reste rapide
 if USE_FASTER_WHISPER:
-    try:
-        from faster_whisper import WhisperModel
-        import sounddevice as sd
-        FASTER_WHISPER_AVAILABLE = True
-    except ImportError:
+    FASTER_WHISPER_AVAILABLE = (importlib.util.find_spec("faster_whisper") is not None
+                                and importlib.util.find_spec("sounddevice") is not None)
+    if not FASTER_WHISPER_AVAILABLE:
         print("⚠️ faster-whisper non disponible, fallback vers speech_recognition")
-        import speech_recognition as sr
-        FASTER_WHISPER_AVAILABLE = False
 else : 
-    import speech_recognition as sr
     FASTER_WHISPER_AVAILABLE = False
 
+WhisperModel = None
+sd = None
+sr = None
+
+
+def _import_backend(speech_recognition_only: bool = False):
+    """Importe le moteur de reconnaissance (une seule fois)."""
+    global WhisperModel, sd, sr
+    if FASTER_WHISPER_AVAILABLE and not speech_recognition_only:
+        if WhisperModel is None:
+            from faster_whisper import WhisperModel
+            import sounddevice as sd
+    elif sr is None:
+        import speech_recognition as sr
+
+class SpeechModelRegistry:
+    """
+    Registre des modèles de transcription partagés par le processus.
+
+    Les modèles sont indexés par (moteur, taille, type de calcul) et comptés
+    par référence : plusieurs SpeechRecognizer identiques partagent un seul
+    modèle, libéré quand le dernier utilisateur le rend.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._models: Dict[Tuple[str, str, str], List[Any]] = {}
+
+    def acquire(self, key: Tuple[str, str, str], loader: Callable[[], Any]) -> Any:
+        """
+        Retourne le modèle associé à la clé, en le chargeant au premier accès.
+
+        Args:
+            key (Tuple[str, str, str]): (moteur, taille, type de calcul)
+            loader (Callable[[], Any]): Fonction de chargement du modèle
+
+        Returns:
+            Any: Modèle partagé
+        """
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is None:
+                entry = [loader(), 0]
+                self._models[key] = entry
+            entry[1] += 1
+            return entry[0]
+
+    def release(self, key: Tuple[str, str, str]):
+        """
+        Rend une référence sur un modèle et le libère s'il n'est plus utilisé.
+
+        Args:
+            key (Tuple[str, str, str]): Clé utilisée lors de acquire()
+        """
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del self._models[key]
+                print(f"🧹 Modèle {key[0]} '{key[1]}' libéré")
+
+    def stats(self) -> Dict[str, int]:
+        """Nombre de références par modèle chargé."""
+        with self._lock:
+            return {"/".join(key): entry[1] for key, entry in self._models.items()}
+
+
+# Registre unique pour tout le processus
+model_registry = SpeechModelRegistry()
+
+
+class SpeechGate:
+    """
+    Étage de filtrage placé avant la transcription.
+
+    Seuls les segments acceptés par la porte sont envoyés au moteur de
+    reconnaissance, ce qui évite de transcrire le bruit ambiant de la classe.
+
+    Modes disponibles :
+        - "none" : aucun filtrage (comportement historique)
+        - "energy" : classifieur énergie + spectre sur trames courtes
+        - "push_to_talk" : l'écoute n'a lieu que pendant l'appui sur le bouton
+    """
+
+    MODES = ("none", "energy", "push_to_talk")
+
+    def __init__(self, mode: str = "none", sample_rate: int = 16000,
+                 frame_ms: float = 30.0, energy_threshold: float = 0.005,
+                 min_speech_duration: float = 0.25):
+        """
+        Initialise la porte vocale.
+
+        Args:
+            mode (str): Mode de filtrage ('none', 'energy', 'push_to_talk')
+            sample_rate (int): Fréquence d'échantillonnage attendue (Hz)
+            frame_ms (float): Durée d'une trame d'analyse (ms)
+            energy_threshold (float): Seuil RMS minimal d'une trame parlée
+            min_speech_duration (float): Durée minimale de parole (secondes)
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Mode de filtrage inconnu: {mode}")
+
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self.frame_length = int(sample_rate * frame_ms / 1000)
+        self.energy_threshold = energy_threshold
+        self.min_speech_duration = min_speech_duration
+
+        # Critères spectraux : la parole concentre son énergie entre 80 et
+        # 4000 Hz et a un spectre peu plat, contrairement au bruit large bande
+        self.speech_band = (80.0, 4000.0)
+        self.band_ratio_threshold = 0.6
+        self.flatness_threshold = 0.45
+
+        self._window = np.hanning(self.frame_length).astype(np.float32)
+        freqs = np.fft.rfftfreq(self.frame_length, d=1.0 / sample_rate)
+        self._band_mask = (freqs >= self.speech_band[0]) & (freqs <= self.speech_band[1])
+
+        # Push-to-talk
+        self._talk_event = threading.Event()
+
+        self.stats = {'segments': 0, 'accepted': 0, 'rejected': 0}
+
+    # --- Push-to-talk --- #
+    def press(self):
+        """Début d'appui sur le bouton push-to-talk."""
+        self._talk_event.set()
+
+    def release(self):
+        """Fin d'appui sur le bouton push-to-talk."""
+        self._talk_event.clear()
+
+    def is_pressed(self) -> bool:
+        """Indique si le bouton push-to-talk est maintenu."""
+        return self._talk_event.is_set()
+
+    def wait_for_press(self, timeout: float,
+                       stop_event: Optional[threading.Event] = None) -> bool:
+        """
+        Attend l'appui sur le bouton push-to-talk.
+
+        Args:
+            timeout (float): Durée maximale d'attente en secondes
+            stop_event (Optional[threading.Event]): Abandon de l'attente (fin du flux)
+
+        Returns:
+            bool: True si le bouton est maintenu
+        """
+        if stop_event is None:
+            return self._talk_event.wait(timeout)
+        
+        deadline = time.time() + timeout
+        while not stop_event.is_set():
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            if self._talk_event.wait(min(remaining, 0.05)):
+                return True
+        return False
+
+    def clone(self) -> "SpeechGate":
+        """
+        Copie des réglages avec des statistiques propres (une porte par thread).
+
+        Returns:
+            SpeechGate: Nouvelle porte, sans état push-to-talk
+        """
+        gate = SpeechGate(mode=self.mode, sample_rate=self.sample_rate,
+                          energy_threshold=self.energy_threshold,
+                          min_speech_duration=self.min_speech_duration)
+        gate.frame_length = self.frame_length
+        gate._window = self._window
+        gate._band_mask = self._band_mask
+        gate.speech_band = self.speech_band
+        gate.band_ratio_threshold = self.band_ratio_threshold
+        gate.flatness_threshold = self.flatness_threshold
+        return gate
+
+    # --- Classification --- #
+    def is_speech(self, audio: np.ndarray) -> bool:
+        """
+        Classifie un segment audio comme parole ou bruit.
+
+        Le segment est découpé en trames sans recouvrement et toutes les
+        trames sont analysées en une seule passe vectorisée.
+
+        Args:
+            audio (np.ndarray): Signal mono float32 à sample_rate
+
+        Returns:
+            bool: True si le segment contient assez de trames parlées
+        """
+        samples = np.asarray(audio, dtype=np.float32).reshape(-1)
+        n_frames = samples.size // self.frame_length
+        if n_frames == 0:
+            return False
+
+        frames = samples[:n_frames * self.frame_length].reshape(n_frames, self.frame_length)
+        frames = frames - frames.mean(axis=1, keepdims=True)
+
+        # Énergie par trame
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+
+        # Spectre de puissance par trame
+        power = np.abs(np.fft.rfft(frames * self._window, axis=1)) ** 2 + 1e-12
+        band_ratio = power[:, self._band_mask].sum(axis=1) / power[:, 1:].sum(axis=1)
+        flatness = np.exp(np.mean(np.log(power[:, 1:]), axis=1)) / np.mean(power[:, 1:], axis=1)
+
+        voiced = (rms > self.energy_threshold) & \
+                 (band_ratio > self.band_ratio_threshold) & \
+                 (flatness < self.flatness_threshold)
+
+        speech_duration = np.count_nonzero(voiced) * self.frame_length / self.sample_rate
+        return speech_duration >= self.min_speech_duration
+
+    def accept(self, audio: np.ndarray) -> bool:
+        """
+        Décide si un segment capturé doit être transcrit.
+
+        Args:
+            audio (np.ndarray): Signal mono float32
+
+        Returns:
+            bool: True si le segment doit atteindre le moteur de reconnaissance
+        """
+        self.stats['segments'] += 1
+
+        # En push-to-talk la sélection a déjà eu lieu à la capture
+        accepted = self.mode != "energy" or self.is_speech(audio)
+
+        self.stats['accepted' if accepted else 'rejected'] += 1
+        return accepted
+
+
+class AudioPreprocessor:
+    """
+    Chaîne de prétraitement audio vectorisée.
+
+    Étapes : rééchantillonnage vers 16 kHz, suppression de la composante
+    continue, réduction de bruit par porte spectrale et normalisation du gain.
+    Les tampons de travail sont préalloués et réutilisés d'un appel à l'autre ;
+    une instance ne doit donc pas être partagée entre plusieurs threads.
+    """
+
+    def __init__(self, target_rate: int = 16000, frame_length: int = 512,
+                 noise_reduction: bool = True, target_peak: float = 0.9,
+                 max_gain: float = 20.0):
+        """
+        Initialise le prétraitement.
+
+        Args:
+            target_rate (int): Fréquence de sortie (Hz)
+            frame_length (int): Taille des trames STFT (paire)
+            noise_reduction (bool): Active la réduction de bruit spectrale
+            target_peak (float): Crête visée après normalisation
+            max_gain (float): Gain maximal appliqué lors de la normalisation
+        """
+        self.target_rate = target_rate
+        self.frame_length = frame_length
+        self.hop = frame_length // 2
+        self.noise_reduction = noise_reduction
+        self.target_peak = target_peak
+        self.max_gain = max_gain
+
+        # Paramètres de la porte spectrale
+        self.noise_std_factor = 1.5   # Seuil = moyenne + k * écart-type du bruit
+        self.attenuation = 0.1        # Gain appliqué aux composantes de bruit
+        self.noise_percentile = 10    # Part des trames les plus calmes (profil auto)
+
+        # Fenêtre racine de Hann périodique : analyse + synthèse à 50 %
+        # de recouvrement reconstruisent exactement le signal
+        self._window = np.sqrt(np.hanning(frame_length + 1)[:-1]).astype(np.float32)
+
+        # Profil de bruit (moyenne, écart-type par bande) issu de la calibration
+        self.noise_profile = None
+
+        # Tampons préalloués
+        self._work = np.zeros(0, dtype=np.float32)
+        self._padded = np.zeros(0, dtype=np.float32)
+        self._output = np.zeros(0, dtype=np.float32)
+
+    def _ensure_capacity(self, n: int):
+        """Agrandit les tampons de travail si nécessaire."""
+        if self._work.size >= n:
+            return
+        capacity = 1 << int(np.ceil(np.log2(max(n, self.frame_length))))
+        self._work = np.zeros(capacity, dtype=np.float32)
+        self._padded = np.zeros(capacity + 2 * self.frame_length, dtype=np.float32)
+        self._output = np.zeros(capacity + 2 * self.frame_length, dtype=np.float32)
+
+    def resample(self, audio: np.ndarray, rate: int) -> np.ndarray:
+        """
+        Rééchantillonne un signal vers target_rate (méthode spectrale).
+
+        Args:
+            audio (np.ndarray): Signal mono
+            rate (int): Fréquence d'origine (Hz)
+
+        Returns:
+            np.ndarray: Signal à target_rate
+        """
+        audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+        if rate == self.target_rate or audio.size == 0:
+            return audio
+
+        n_out = int(round(audio.size * self.target_rate / rate))
+        spectrum = np.fft.rfft(audio)
+        resampled = np.fft.irfft(spectrum[:n_out // 2 + 1], n=n_out)
+        return (resampled * (n_out / audio.size)).astype(np.float32)
+
+    def prepare(self, audio: np.ndarray, rate: int) -> np.ndarray:
+        """
+        Rééchantillonne et retire la composante continue.
+
+        Args:
+            audio (np.ndarray): Signal capturé
+            rate (int): Fréquence de capture (Hz)
+
+        Returns:
+            np.ndarray: Vue sur le tampon de travail (valide jusqu'au prochain appel)
+        """
+        audio = self.resample(audio, rate)
+        n = audio.size
+        self._ensure_capacity(n)
+
+        work = self._work[:n]
+        np.subtract(audio, audio.mean() if n else 0.0, out=work)
+        return work
+
+    def estimate_noise(self, audio: np.ndarray, rate: int):
+        """
+        Mémorise le profil spectral du bruit ambiant (calibration).
+
+        Args:
+            audio (np.ndarray): Enregistrement du bruit ambiant
+            rate (int): Fréquence de capture (Hz)
+        """
+        magnitude = np.abs(np.fft.rfft(self._frames(self.prepare(audio, rate)), axis=1))
+        if magnitude.shape[0] > 0:
+            self.noise_profile = (magnitude.mean(axis=0), magnitude.std(axis=0))
+
+    def _frames(self, signal: np.ndarray) -> np.ndarray:
+        """Découpe le signal en trames fenêtrées recouvrantes à 50 %."""
+        n = signal.size
+        n_frames = max(1, int(np.ceil(n / self.hop)) + 1)
+        padded_length = (n_frames + 1) * self.hop
+        self._ensure_capacity(n)
+
+        padded = self._padded[:padded_length]
+        padded[:self.hop] = 0.0
+        padded[self.hop:self.hop + n] = signal
+        padded[self.hop + n:] = 0.0
+
+        frames = np.lib.stride_tricks.sliding_window_view(padded, self.frame_length)[::self.hop]
+        return frames * self._window
+
+    def suppress_noise(self, signal: np.ndarray) -> np.ndarray:
+        """
+        Réduction de bruit par porte spectrale (STFT / ISTFT vectorisées).
+
+        Args:
+            signal (np.ndarray): Signal à target_rate
+
+        Returns:
+            np.ndarray: Signal débruité (vue sur le tampon de sortie)
+        """
+        n = signal.size
+        if n < self.frame_length:
+            return signal
+
+        spectrum = np.fft.rfft(self._frames(signal), axis=1)
+        magnitude = np.abs(spectrum)
+
+        if self.noise_profile is not None and self.noise_profile[0].size == magnitude.shape[1]:
+            noise_mean, noise_std = self.noise_profile
+        else:
+            # Profil estimé sur les trames les plus calmes du segment
+            energy = magnitude.sum(axis=1)
+            quiet = magnitude[energy <= np.percentile(energy, self.noise_percentile)]
+            noise_mean, noise_std = quiet.mean(axis=0), quiet.std(axis=0)
+
+        threshold = noise_mean + self.noise_std_factor * noise_std
+        gains = np.where(magnitude > threshold, 1.0, self.attenuation).astype(np.float32)
+        frames = np.fft.irfft(spectrum * gains, n=self.frame_length, axis=1).astype(np.float32)
+        frames *= self._window
+
+        # Recouvrement-addition : les trames paires (resp. impaires) sont
+        # contiguës, deux additions vectorisées suffisent
+        out = self._output[:frames.shape[0] * self.hop + self.hop]
+        out[:] = 0.0
+        even = frames[0::2].reshape(-1)
+        odd = frames[1::2].reshape(-1)
+        out[:even.size] += even
+        out[self.hop:self.hop + odd.size] += odd
+
+        return out[self.hop:self.hop + n]
+
+    def normalize(self, signal: np.ndarray) -> np.ndarray:
+        """
+        Normalise le gain crête du signal (en place).
+
+        Args:
+            signal (np.ndarray): Signal à normaliser
+
+        Returns:
+            np.ndarray: Signal normalisé
+        """
+        peak = float(np.max(np.abs(signal))) if signal.size else 0.0
+        if peak > 1e-6:
+            np.multiply(signal, min(self.target_peak / peak, self.max_gain), out=signal)
+        return signal
+
+    def enhance(self, signal: np.ndarray) -> np.ndarray:
+        """
+        Réduction de bruit puis normalisation d'un signal préparé.
+
+        Args:
+            signal (np.ndarray): Signal issu de prepare()
+
+        Returns:
+            np.ndarray: Signal prêt pour la transcription
+        """
+        if self.noise_reduction:
+            signal = self.suppress_noise(signal)
+        return self.normalize(signal)
+
+    def process(self, audio: np.ndarray, rate: int) -> np.ndarray:
+        """
+        Chaîne complète : rééchantillonnage, DC, débruitage, normalisation.
+
+        Args:
+            audio (np.ndarray): Signal capturé
+            rate (int): Fréquence de capture (Hz)
+
+        Returns:
+            np.ndarray: Signal prêt pour la transcription
+        """
+        return self.enhance(self.prepare(audio, rate))
+
+
 class SpeechRecognizer:
     """
     Reconnaissance vocale temps réel.
     """
     
-    def __init__(self, language: str = "fr", model_size: str = "small"):
+    def __init__(self, language: str = "fr", model_size: str = "small",
+                 gate_mode: str = "none", source=None):
         """
         Initialise le reconnaisseur vocal.
 
         Args:
             language (str): Code de langue ('fr', 'en', etc.)
             model_size (str): Taille du modèle ('tiny', 'small', 'base', 'large')
+            gate_mode (str): Filtrage avant transcription ('none', 'energy', 'push_to_talk')
+            source: Source audio (None = microphone, chemin, tableau ou AudioSource)
         """
         self.language = language
         self.model_size = model_size
         self.is_listening = False
+        self.source = open_source(source)
         
         # Configuration audio temps réel
         self.sample_rate = 16000
@@ -46,29 +497,69 @@ class SpeechRecognizer:
         self.min_audio_length = 0.5  # Durée minimum pour traitement
         self.silence_threshold = 0.01  # Seuil de silence
         
-        # Initialisation du modèle
-        self._initialize_model()
+        self.capture_rate = self.sample_rate  # Fréquence native du micro
+        
+        # Prétraitement audio et filtrage avant transcription
+        self.preprocessor = AudioPreprocessor(target_rate=self.sample_rate)
+        self.gate = SpeechGate(mode=gate_mode, sample_rate=self.sample_rate)
+        
+        # Statistiques du flux asynchrone
+        self.stream_stats = {'utterances': 0, 'dropped': 0}
+        
+        # Le modèle est chargé paresseusement à la première écoute
+        self.model = None
+        self.recognition_engine = None
+        self._model_key = None
+        self._model_lock = threading.Lock()
+        
+        # Début de la capture en cours (mesure de l'étape 'microphone')
+        self._capture_start: Optional[float] = None
 
         logging.info(f"🎤 Reconnaissance vocale initialisée (modèle: {model_size})")
 
+    def _ensure_model(self):
+        """Charge le moteur de reconnaissance au premier besoin."""
+        if self.recognition_engine is not None:
+            return
+        with self._model_lock:
+            if self.recognition_engine is None:
+                self._initialize_model()
+
+    def load(self):
+        """Charge le moteur de reconnaissance sans attendre la première écoute."""
+        self._ensure_model()
+
     def _initialize_model(self):
         """Initialise le modèle de reconnaissance selon la disponibilité."""
         if FASTER_WHISPER_AVAILABLE:
             try:
+                _import_backend()
                 # Configuration optimisée pour faster-whisper
                 import torch
                 device = "cuda" if torch.cuda.is_available() else "cpu"
                 compute_type = "float16" if device == "cuda" else "int8"
                 
-                print(f"🔧 Chargement du modèle faster-whisper '{self.model_size}' sur {device}")
+                def load_model():
+                    print(f"🔧 Chargement du modèle faster-whisper '{self.model_size}' sur {device}")
+                    return WhisperModel(
+                        self.model_size,
+                        device=device,
+                        compute_type=compute_type,
+                        cpu_threads=4,
+                        download_root=str(Path.home() / ".cache" / "whisper")
+                    )
                 
-                self.model = WhisperModel(
-                    self.model_size,
-                    device=device,
-                    compute_type=compute_type,
-                    cpu_threads=4,
-                    download_root=str(Path.home() / ".cache" / "whisper")
-                )
+                # Modèle partagé avec les autres instances du processus
+                key = ("faster-whisper", self.model_size, compute_type)
+                self.model = model_registry.acquire(key, load_model)
+                self._model_key = key
+                
+                # Capture à la fréquence native du périphérique, le
+                # prétraitement se charge du rééchantillonnage vers 16 kHz
+                try:
+                    self.capture_rate = int(sd.query_devices(kind='input')['default_samplerate'])
+                except Exception:
+                    self.capture_rate = self.sample_rate
                 
                 self.recognition_engine = "faster-whisper"
                 print("✅ faster-whisper initialisé avec succès")
@@ -81,6 +572,7 @@ class SpeechRecognizer:
     
     def _fallback_to_speech_recognition(self):
         """Fallback vers speech_recognition classique."""
+        _import_backend(speech_recognition_only=True)
         self.recognizer = sr.Recognizer()
         self.recognition_engine = "speech_recognition"
         
@@ -91,55 +583,267 @@ class SpeechRecognizer:
         
         print("✅ speech_recognition initialisé comme fallback")
     
+    def set_gate_mode(self, mode: str):
+        """
+        Change le mode de filtrage avant transcription.
+
+        Args:
+            mode (str): 'none', 'energy' ou 'push_to_talk'
+        """
+        if mode not in SpeechGate.MODES:
+            raise ValueError(f"Mode de filtrage inconnu: {mode}")
+        self.gate.mode = mode
+        self.gate.release()
+        print(f"🚪 Filtrage vocal: {mode}")
+
+    @staticmethod
+    def probe_devices() -> List[str]:
+        """
+        Liste les périphériques d'entrée audio sans charger de modèle.
+
+        Returns:
+            List[str]: Noms des microphones détectés
+        """
+        try:
+            # Bibliothèques audio seules : faster_whisper (et ctranslate2)
+            # n'est importé qu'au chargement du modèle (_ensure_model)
+            if FASTER_WHISPER_AVAILABLE:
+                import sounddevice
+                return [device['name'] for device in sounddevice.query_devices()
+                        if device['max_input_channels'] > 0]
+            _import_backend(speech_recognition_only=True)
+            return list(sr.Microphone.list_microphone_names())
+        except Exception as e:
+            print(f"⚠️ Impossible de lister les microphones: {e}")
+            return []
+
+    def close(self):
+        """Rend le modèle partagé au registre."""
+        if self._model_key is not None:
+            model_registry.release(self._model_key)
+            self._model_key = None
+        self.model = None
+        self.recognition_engine = None
+
+    def push_to_talk_pressed(self):
+        """Hook GUI : début d'appui sur le bouton push-to-talk."""
+        self.gate.press()
+
+    def push_to_talk_released(self):
+        """Hook GUI : fin d'appui sur le bouton push-to-talk."""
+        self.gate.release()
+
     # ========================================
     # MÉTHODES D'ÉCOUTE PRINCIPALES
     # ========================================
-    def listen(self, timeout: float = 5.0) -> Optional[str]:
+    def set_source(self, source):
+        """
+        Change la source audio (microphone, fichier, répertoire, tableau).
+
+        Args:
+            source: AudioSource ou description acceptée par open_source()
+        """
+        self.source = open_source(source)
+        print(f"🎚 Source audio: {self.source!r}")
+
+    def listen(self, timeout: float = 5.0,
+               stop_event: Optional[threading.Event] = None) -> Optional[str]:
         """
         Écoute une seule commande vocale.
         
         Args:
             timeout (float): Timeout d'écoute en secondes
+            stop_event (Optional[threading.Event]): Interrompt l'enregistrement
+                en cours (fin du flux)
             
         Returns:
             Optional[str]: Texte reconnu ou None
         """
         start_time = time.time()
+        self._ensure_model()
+        self._capture_start = time.perf_counter()
+        
+        # Sources rejouées (fichier, répertoire, tableau)
+        if not self.source.is_live:
+            segment = self.source.read(timeout)
+            if segment is None:
+                return None
+            return self.transcribe(*segment)
         
+        # En push-to-talk, aucune capture tant que le bouton n'est pas maintenu
+        if self.gate.mode == "push_to_talk" and not self.gate.wait_for_press(timeout, stop_event):
+            return None
+        
+        stop_event = stop_event or threading.Event()
         try:
             if self.recognition_engine == "faster-whisper":
-                return self._listen_once_whisper(timeout)
+                return self._listen_once_whisper(timeout, stop_event)
             else:
-                return self._listen_once_sr(timeout)
+                return self._listen_once_sr(timeout, stop_event)
                 
         except Exception as e:
             print(f"❌ Erreur lors de l'écoute: {e}")
             return None
 
+    async def stream(self, max_queue: int = 4, timeout: float = 5.0) -> AsyncIterator[str]:
+        """
+        Flux asynchrone des énoncés reconnus.
+
+        La capture et la transcription tournent dans un thread dédié ; les
+        textes reconnus sont remis à la boucle asyncio via une file bornée.
+        Si le consommateur prend du retard, les énoncés les plus anciens sont
+        abandonnés. Annuler ou fermer le flux arrête la capture.
+
+        Chaque texte est remis avec son énoncé de latence (étapes microphone
+        et reconnaissance, mesurées dans le thread de capture), rattaché au
+        contexte du consommateur avant le yield : process_command le complète.
+
+            async for text in recognizer.stream():
+                ...
+
+        Args:
+            max_queue (int): Nombre maximal d'énoncés en attente
+            timeout (float): Timeout de chaque écoute en secondes
+
+        Yields:
+            str: Texte reconnu
+        """
+        loop = asyncio.get_running_loop()
+        # Non bornée : la limite max_queue ne s'applique qu'aux énoncés, pour
+        # que le marqueur de fin n'en évince jamais un
+        queue: asyncio.Queue = asyncio.Queue()
+        stop_event = threading.Event()
+        end_of_stream = object()
+        
+        def enqueue(text: str, utterance):
+            # Exécuté dans la boucle : politique « drop-oldest »
+            if queue.qsize() >= max_queue:
+                queue.get_nowait()
+                self.stream_stats['dropped'] += 1
+            queue.put_nowait((text, utterance))
+        
+        def capture():
+            while not stop_event.is_set():
+                # Nouvel énoncé : les étapes micro et reconnaissance s'y rattachent
+                utterance = latency_tracker.begin()
+                text = self.listen(timeout, stop_event)
+                finished = not self.source.is_live and self.source.exhausted
+                
+                if stop_event.is_set():
+                    break
+                try:
+                    if text:
+                        loop.call_soon_threadsafe(enqueue, text, utterance)
+                    if finished:
+                        # Fin de flux pour les sources rejouées : le marqueur suit
+                        # le dernier énoncé par le même canal, donc rien n'est perdu
+                        loop.call_soon_threadsafe(queue.put_nowait, end_of_stream)
+                        break
+                except RuntimeError:
+                    break  # Boucle fermée
+        
+        thread = threading.Thread(target=capture, name="speech-capture", daemon=True)
+        self.is_listening = True
+        thread.start()
+        
+        try:
+            while True:
+                item = await queue.get()
+                if item is end_of_stream:
+                    break
+                text, utterance = item
+                self.stream_stats['utterances'] += 1
+                latency_tracker.attach(utterance)
+                yield text
+        finally:
+            # L'enregistrement en cours est interrompu ; l'attente du thread
+            # est bornée et se fait hors de la boucle
+            stop_event.set()
+            self.is_listening = False
+            await loop.run_in_executor(None, thread.join, 1.0)
+
+    def transcribe(self, audio: np.ndarray, sample_rate: int,
+                   preprocessor: Optional[AudioPreprocessor] = None) -> Optional[str]:
+        """
+        Transcrit un segment audio déjà capturé.
+
+        Args:
+            audio (np.ndarray): Signal mono
+            sample_rate (int): Fréquence du signal (Hz)
+            preprocessor (Optional[AudioPreprocessor]): Prétraitement à utiliser
+                (une instance par thread en traitement parallèle)
+
+        Returns:
+            Optional[str]: Texte reconnu ou None
+        """
+        self._ensure_model()
+        preprocessor = preprocessor or self.preprocessor
+        
+        start = time.perf_counter()
+        if self._capture_start is not None:
+            latency_tracker.record("microphone", self._capture_start, start)
+            self._capture_start = None
+        
+        with latency_tracker.measure("asr"):
+            return self._transcribe_prepared(audio, sample_rate, preprocessor)
+    
+    def _transcribe_prepared(self, audio: np.ndarray, sample_rate: int,
+                             preprocessor: AudioPreprocessor,
+                             gate: Optional[SpeechGate] = None) -> Optional[str]:
+        """Prétraitement, filtrage (porte du thread, par défaut self.gate) puis transcription."""
+        # Rééchantillonnage 16 kHz + suppression de la composante continue
+        audio = preprocessor.prepare(audio, sample_rate)
+        
+        # Filtrage avant transcription
+        if not (gate or self.gate).accept(audio):
+            print("🔇 Segment rejeté par le filtre vocal")
+            return None
+        
+        # Réduction de bruit et normalisation
+        audio = preprocessor.enhance(audio)
+        
+        if self.recognition_engine == "faster-whisper":
+            return self._transcribe_whisper(audio)
+        return self._transcribe_google(audio)
     
-    def _listen_once_whisper(self, timeout: float) -> Optional[str]:
+    def _listen_once_whisper(self, timeout: float, stop_event: threading.Event) -> Optional[str]:
         """Écoute avec faster-whisper."""
         print("🎤 Écoute en cours...")
         
         # Enregistrement audio
         duration = min(timeout, 8.0)  # Max 8 secondes
         audio_data = sd.rec(
-            int(duration * self.sample_rate),
-            samplerate=self.sample_rate,
+            int(duration * self.capture_rate),
+            samplerate=self.capture_rate,
             channels=1,
             dtype=np.float32
         )
-        sd.wait()  # Attendre la fin de l'enregistrement
+        
+        # Enregistrement interrompu à la fin du flux ou, en push-to-talk,
+        # au relâchement du bouton
+        push_to_talk = self.gate.mode == "push_to_talk"
+        record_start = time.time()
+        while time.time() - record_start < duration and not stop_event.is_set():
+            if push_to_talk and not self.gate.is_pressed():
+                break
+            time.sleep(0.05)
+        sd.stop()
+        if stop_event.is_set():
+            return None
+        audio_data = audio_data[:int((time.time() - record_start) * self.capture_rate)]
         
         # Vérification du niveau audio
-        if np.max(np.abs(audio_data)) < self.silence_threshold:
+        if audio_data.size == 0 or np.max(np.abs(audio_data)) < self.silence_threshold:
             print("🔇 Aucun son détecté")
             return None
         
-        # Transcription
+        return self.transcribe(audio_data, self.capture_rate)
+    
+    def _transcribe_whisper(self, audio: np.ndarray) -> Optional[str]:
+        """Transcription d'un signal 16 kHz avec faster-whisper."""
         try:
             segments, info = self.model.transcribe(
-                audio_data.flatten(),
+                audio,
                 language=self.language,
                 beam_size=1,  # Plus rapide
                 best_of=1,
@@ -170,34 +874,38 @@ class SpeechRecognizer:
             print(f"❌ Erreur de transcription: {e}")
             return None
     
-    def _listen_once_sr(self, timeout: float) -> Optional[str]:
+    def _listen_once_sr(self, timeout: float, stop_event: threading.Event) -> Optional[str]:
         """Écoute avec speech_recognition."""
         print("🎤 Écoute en cours (speech_recognition)...")
         
         try:
             with sr.Microphone() as source:
-                # Ajustement au bruit ambiant rapide
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
-                
-                # Écoute
-                audio = self.recognizer.listen(
-                    source,
-                    timeout=timeout,
-                    phrase_time_limit=8.0
-                )
-            
-            # Transcription avec Google si disponible
-            try:
-                text = self.recognizer.recognize_google(audio, language=f"{self.language}-FR")
-                if text:
-                    result = text.strip()
-                    print(f"✅ Reconnu (Google): '{result}'")
-                    return result
-            except:
-                    pass
+                if self.gate.mode == "push_to_talk":
+                    # Enregistrement interrompu au relâchement du bouton
+                    frames = []
+                    record_start = time.time()
+                    while self.gate.is_pressed() and time.time() - record_start < 8.0:
+                        if stop_event.is_set():
+                            return None
+                        frames.append(source.stream.read(source.CHUNK))
+                    if not frames:
+                        print("🔇 Aucun son détecté")
+                        return None
+                    audio = sr.AudioData(b"".join(frames), source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+                else:
+                    # Ajustement au bruit ambiant rapide
+                    self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
+                    
+                    # Écoute
+                    audio = self.recognizer.listen(
+                        source,
+                        timeout=timeout,
+                        phrase_time_limit=8.0
+                    )
             
-            print("🔇 Aucune parole détectée")
-            return None
+            raw = audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2)
+            samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+            return self.transcribe(samples, self.sample_rate)
             
         except sr.WaitTimeoutError:
             print("⏱️ Timeout d'écoute")
@@ -206,6 +914,101 @@ class SpeechRecognizer:
         except Exception as e:
             print(f"❌ Erreur: {e}")
             return None
+    
+    def _transcribe_google(self, audio: np.ndarray) -> Optional[str]:
+        """Transcription d'un signal 16 kHz avec l'API Google."""
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+        audio_data = sr.AudioData(pcm.tobytes(), self.sample_rate, 2)
+        
+        try:
+            text = self.recognizer.recognize_google(audio_data, language=f"{self.language}-FR")
+            if text:
+                result = text.strip()
+                print(f"✅ Reconnu (Google): '{result}'")
+                return result
+        except:
+                pass
+        
+        print("🔇 Aucune parole détectée")
+        return None
+
+    def transcribe_batch(self, directory: Union[str, Path],
+                         output_path: Optional[Union[str, Path]] = None,
+                         workers: int = 2) -> List[Dict[str, Any]]:
+        """
+        Transcrit tous les enregistrements d'un répertoire en parallèle.
+
+        Chaque résultat (fichier, texte, latence, durée audio, facteur temps
+        réel) est écrit sous forme d'une ligne JSON dès qu'il est disponible.
+
+        Args:
+            directory (Union[str, Path]): Répertoire de fichiers WAV/FLAC
+            output_path (Optional[Union[str, Path]]): Fichier JSONL de sortie
+            workers (int): Nombre de transcriptions simultanées
+
+        Returns:
+            List[Dict[str, Any]]: Résultats par fichier, dans l'ordre des fichiers
+        """
+        files = DirectorySource(directory).files
+        if not files:
+            print(f"⚠️ Aucun fichier audio dans {directory}")
+            return []
+        
+        print(f"📂 Transcription de {len(files)} fichier(s) avec {workers} worker(s)...")
+        self._ensure_model()
+        
+        # Un prétraitement et une porte par thread : tampons et statistiques
+        # ne sont pas partagés ; les compteurs des portes sont cumulés à la fin
+        local = threading.local()
+        gates: List[SpeechGate] = []
+        gates_lock = threading.Lock()
+        
+        def transcribe_file(path: Path) -> Dict[str, Any]:
+            if not hasattr(local, 'preprocessor'):
+                local.preprocessor = AudioPreprocessor(target_rate=self.sample_rate)
+                local.gate = self.gate.clone()
+                with gates_lock:
+                    gates.append(local.gate)
+            
+            result = {'file': str(path), 'text': None}
+            start = time.perf_counter()
+            try:
+                audio, rate = read_audio_file(path)
+                result['audio_s'] = round(audio.size / rate, 3)
+                # Pas d'étape 'microphone' ici : la capture en cours n'est pas concernée
+                with latency_tracker.measure("asr"):
+                    result['text'] = self._transcribe_prepared(
+                        audio, rate, local.preprocessor, local.gate)
+            except Exception as e:
+                result['error'] = str(e)
+            
+            result['latency_s'] = round(time.perf_counter() - start, 4)
+            if result.get('audio_s'):
+                result['rtf'] = round(result['latency_s'] / result['audio_s'], 4)
+            return result
+        
+        results = []
+        batch_start = time.perf_counter()
+        output = open(output_path, 'w', encoding='utf-8') if output_path else None
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+                for result in pool.map(transcribe_file, files):
+                    results.append(result)
+                    if output:
+                        output.write(json.dumps(result, ensure_ascii=False) + "\n")
+                        output.flush()
+        finally:
+            if output:
+                output.close()
+            for gate in gates:
+                for key, value in gate.stats.items():
+                    self.gate.stats[key] += value
+        
+        elapsed = time.perf_counter() - batch_start
+        audio_total = sum(r.get('audio_s', 0.0) for r in results)
+        print(f"✅ {len(results)} fichier(s) en {elapsed:.2f}s "
+              f"({audio_total / elapsed if elapsed else 0.0:.1f}x temps réel)")
+        return results
    
     def calibrate_microphone(self, duration: float = 2.0) -> Dict[str, Any]:
         """
@@ -218,13 +1021,14 @@ class SpeechRecognizer:
             None
         """
         print(f"🔧 Calibration du microphone ({duration}s)...")
+        self._ensure_model()
         
         try:
             if self.recognition_engine == "faster-whisper":
                 # Test audio avec sounddevice
                 test_audio = sd.rec(
-                    int(duration * self.sample_rate),
-                    samplerate=self.sample_rate,
+                    int(duration * self.capture_rate),
+                    samplerate=self.capture_rate,
                     channels=1,
                     dtype=np.float32
                 )
@@ -234,6 +1038,13 @@ class SpeechRecognizer:
                 noise_level = np.mean(np.abs(test_audio))
                 self.silence_threshold = max(noise_level * 3, 0.01)
                 
+                # Le seuil du filtre vocal suit le bruit ambiant
+                noise_rms = float(np.sqrt(np.mean(test_audio ** 2)))
+                self.gate.energy_threshold = max(noise_rms * 2, 0.005)
+                
+                # Profil de bruit pour la réduction spectrale
+                self.preprocessor.estimate_noise(test_audio, self.capture_rate)
+                
                 print(f"✅ Calibration terminée: niveau de bruit {noise_level}, seuil de silence {self.silence_threshold}")
             else:
                 # Calibration speech_recognition
@@ -274,13 +1085,27 @@ def test_recognition():
 
 
 if __name__ == "__main__":    
+    import argparse
+    
     # Configuration du logging
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(levelname)s - %(message)s'
     )
     
+    parser = argparse.ArgumentParser(description="Reconnaissance vocale VoxThymio")
+    parser.add_argument("--batch", help="Répertoire d'enregistrements à transcrire")
+    parser.add_argument("--output", help="Fichier JSONL des résultats (mode --batch)")
+    parser.add_argument("--workers", type=int, default=2, help="Transcriptions simultanées")
+    parser.add_argument("--language", default="fr", help="Code de langue")
+    parser.add_argument("--model-size", default="small", help="Taille du modèle Whisper")
+    args = parser.parse_args()
+    
     print("Module de reconnaissance vocale - VoxThymio")
     print("=" * 56)
 
-    test_recognition()
\ No newline at end of file
+    if args.batch:
+        recognizer = SpeechRecognizer(language=args.language, model_size=args.model_size)
+        recognizer.transcribe_batch(args.batch, output_path=args.output, workers=args.workers)
+    else:
+        test_recognition()
\ No newline at end of file
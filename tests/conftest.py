@@ -0,0 +1,6 @@
+"""Configuration pytest : les modules de src/ sont importés sans préfixe, comme dans l'application."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
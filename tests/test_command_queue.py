@@ -0,0 +1,124 @@
+"""
+Tests de la file d'envoi à fusion (src/controller/command_queue.py).
+
+Couvrent la fusion des consignes de mouvement, l'abandon des commandes en
+excès et la reprise du vidage quand l'appelant qui vide la file est annulé.
+"""
+
+import asyncio
+
+from controller.command_queue import CommandQueue
+
+FORWARD = "motor.left.target = 200\nmotor.right.target = 200"
+BACKWARD = "motor.left.target = -200\nmotor.right.target = -200"
+STOP = "motor.left.target = 0\nmotor.right.target = 0"
+LEDS = "call leds.top(32, 0, 0)"
+
+
+class SlowNode:
+    """Nœud factice : chaque transmission attend que le test la libère."""
+
+    def __init__(self):
+        self.sent = []
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def execute(self, code):
+        self.sent.append(code)
+        self.started.set()
+        await self.release.wait()
+        return True
+
+
+async def _start_first(queue, node, code=LEDS):
+    """Soumet une commande et attend que sa transmission ait commencé."""
+    first = asyncio.ensure_future(queue.submit(code))
+    await node.started.wait()
+    return first
+
+
+def test_motion_commands_are_merged():
+    async def scenario():
+        node = SlowNode()
+        queue = CommandQueue(node.execute)
+        first = await _start_first(queue, node)
+
+        forward = asyncio.ensure_future(queue.submit(FORWARD))
+        backward = asyncio.ensure_future(queue.submit(BACKWARD))
+        await asyncio.sleep(0)
+        node.release.set()
+
+        results = await asyncio.gather(first, forward, backward)
+        return node.sent, results, queue.get_stats()
+
+    sent, results, stats = asyncio.run(scenario())
+    assert sent == [LEDS, BACKWARD]
+    # L'appelant remplacé reçoit le résultat de la commande qui l'a remplacé
+    assert results == [True, True, True]
+    assert stats["merged"] == 1
+    assert stats["executed"] == 2
+
+
+def test_identical_commands_are_sent_once():
+    async def scenario():
+        node = SlowNode()
+        queue = CommandQueue(node.execute)
+        first = await _start_first(queue, node, FORWARD)
+
+        duplicates = [asyncio.ensure_future(queue.submit(LEDS)) for _ in range(3)]
+        await asyncio.sleep(0)
+        node.release.set()
+
+        results = await asyncio.gather(first, *duplicates)
+        return node.sent, results
+
+    sent, results = asyncio.run(scenario())
+    assert sent == [FORWARD, LEDS]
+    assert all(results)
+
+
+def test_oldest_command_dropped_when_full():
+    async def scenario():
+        node = SlowNode()
+        queue = CommandQueue(node.execute, max_depth=2)
+        first = await _start_first(queue, node, FORWARD)
+
+        waiting = [asyncio.ensure_future(queue.submit(f"call leds.top({i}, 0, 0)"))
+                   for i in range(3)]
+        await asyncio.sleep(0)
+        node.release.set()
+
+        results = await asyncio.gather(first, *waiting)
+        return results, queue.get_stats()
+
+    results, stats = asyncio.run(scenario())
+    assert results == [True, False, True, True]
+    assert stats["dropped"] == 1
+
+
+def test_cancelled_drainer_hands_off_pending_commands():
+    async def scenario():
+        node = SlowNode()
+        queue = CommandQueue(node.execute)
+
+        # L'appelant qui vide la file abandonne (délai dépassé de la flotte)
+        drainer = asyncio.ensure_future(asyncio.wait_for(queue.submit(LEDS), 0.05))
+        await node.started.wait()
+        other = asyncio.ensure_future(queue.submit(STOP))
+        await asyncio.sleep(0)
+
+        try:
+            await drainer
+        except asyncio.TimeoutError:
+            pass
+        node.release.set()
+
+        result = await asyncio.wait_for(other, 1.0)
+        return result, node.sent, queue.get_stats()
+
+    result, sent, stats = asyncio.run(scenario())
+    # La commande d'un autre appelant est encore transmise
+    assert result is True
+    assert sent == [LEDS, STOP]
+    assert stats["dropped"] == 0
+    assert stats["pending"] == 0
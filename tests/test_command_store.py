@@ -0,0 +1,90 @@
+"""
+Tests du stockage journalisé des commandes (src/controller/command_store.py).
+
+Couvrent les cas sensibles aux arrêts brutaux : dernière ligne de journal
+tronquée et compaction de l'instantané.
+"""
+
+import json
+
+import pytest
+
+from controller.command_store import CommandStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CommandStore(tmp_path / "commands.json")
+
+
+def command(description, code="motor.left.target = 0"):
+    return {"description": description, "code": code}
+
+
+def test_replay_ignores_truncated_last_line(store):
+    store.put("avancer", command("avance"))
+    store.put("reculer", command("recule"))
+
+    # Arrêt brutal pendant l'écriture de la ligne suivante
+    with open(store.journal_path, "a", encoding="utf-8") as f:
+        f.write('{"op": "put", "id": "tourner", "val')
+
+    reloaded = CommandStore(store.path)
+    assert reloaded.load() == {"avancer": command("avance"), "reculer": command("recule")}
+    assert reloaded.stats["skipped_lines"] == 1
+
+
+def test_append_after_truncated_line_is_kept(store):
+    store.put("avancer", command("avance"))
+    with open(store.journal_path, "a", encoding="utf-8") as f:
+        f.write('{"op": "delete", "id": "ava')
+
+    # La ligne tronquée ne doit pas absorber la modification suivante
+    store.put("reculer", command("recule"))
+
+    assert CommandStore(store.path).load() == {"avancer": command("avance"),
+                                               "reculer": command("recule")}
+
+
+def test_compact_then_reload_keeps_contents(store):
+    store.put("avancer", command("avance"))
+    store.put("reculer", command("recule"))
+    store.put("avancer", command("avance vite", "motor.left.target = 500"))
+    store.delete("reculer")
+    store.put("tourner", command("tourne"))
+    before = store.load()
+
+    store.compact()
+
+    assert store.journal_path.stat().st_size == 0
+    with open(store.path, encoding="utf-8") as f:
+        assert json.load(f) == before
+    assert CommandStore(store.path).load() == before
+    assert store.get_stats()["compactions"] == 1
+
+
+def test_automatic_compaction_keeps_contents(tmp_path):
+    store = CommandStore(tmp_path / "commands.json", compact_bytes=200)
+    expected = {}
+    for index in range(20):
+        store.put(f"cmd_{index}", command(f"commande {index}"))
+        expected[f"cmd_{index}"] = command(f"commande {index}")
+    store.delete("cmd_3")
+    del expected["cmd_3"]
+
+    assert store.get_stats()["compactions"] > 0
+    assert CommandStore(store.path).load() == expected
+
+
+def test_replay_after_interrupted_compaction_is_idempotent(store):
+    store.put("avancer", command("avance"))
+    store.delete("avancer")
+    store.put("reculer", command("recule"))
+    before = store.load()
+    journal = store.journal_path.read_bytes()
+
+    # Arrêt entre le remplacement de l'instantané et la remise à zéro du journal
+    store.compact()
+    store.journal_path.write_bytes(journal)
+
+    assert CommandStore(store.path).load() == before